@@ -56,4 +56,6 @@ class Settings(BaseSettings):
 settings = Settings()
 
 MEDIA_ROOT = os.getenv("MEDIA_ROOT", "media")
+# Yüklenen görsellerin orijinalleri: /static (MEDIA_ROOT) DIŞINDA, sadece yetkili /api/images ile sunulur
+IMAGE_ROOT = os.getenv("IMAGE_ROOT", "image_store")
 
@@ -5,6 +5,7 @@ from email.message import EmailMessage
 from email.utils import formataddr
 from typing import Iterable
 from app.core.settings import settings
+from app.services import metrics
 
 def brand_subject(subject_core: str) -> str:
     """Konu satırını 'X - {BRAND_NAME}' formatında üretir."""
@@ -26,18 +27,19 @@ def send_email(to: str | Iterable[str], subject: str, html: str):
 
     context = ssl.create_default_context()
 
-    # SSL (465) mi yoksa STARTTLS (587) mi?
-    if getattr(settings, "SMTP_USE_SSL", False):
-        server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, context=context)
-    else:
-        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-        if getattr(settings, "SMTP_STARTTLS", True):
-            server.starttls(context=context)
+    with metrics.track_email():
+        # SSL (465) mi yoksa STARTTLS (587) mi?
+        if getattr(settings, "SMTP_USE_SSL", False):
+            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, context=context)
+        else:
+            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+            if getattr(settings, "SMTP_STARTTLS", True):
+                server.starttls(context=context)
 
-    try:
-        # Kullanıcı adı verilmişse login; yoksa doğrudan gönder
-        if getattr(settings, "SMTP_USER", ""):
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)  # ✅ düzeltildi
-        server.send_message(msg)
-    finally:
-        server.quit()
+        try:
+            # Kullanıcı adı verilmişse login; yoksa doğrudan gönder
+            if getattr(settings, "SMTP_USER", ""):
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)  # ✅ düzeltildi
+            server.send_message(msg)
+        finally:
+            server.quit()
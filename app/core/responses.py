@@ -0,0 +1,135 @@
+# app/core/responses.py
+"""
+Büyük cevaplar için hızlı JSON yolu.
+
+FastAPI normalde dönen değeri response_model ile tekrar doğrular, sonra jsonable_encoder
+ile dolaşır; büyük projelerde bu, sorgulardan daha çok CPU yer. Burada:
+
+- dump(Schema, obj): şemanın alanlarına bakarak ORM nesnesinden / dict'ten düz dict üretir.
+  Doğrulama yapılmaz (veri DB'den geliyor); yalnızca response_model'in üreteceği JSON ile
+  aynı sonucu verecek tip dönüşümleri (float/int/bool, iç içe şema, liste) uygulanır.
+  Şema başına alan planı bir kez çıkarılıp önbelleğe alınır.
+- FastJSONResponse: orjson ile kodlar (kurulu değilse json); Decimal → float.
+
+Route'ta response_model aynen kalır → OpenAPI şeması değişmez. Endpoint doğrudan
+FastJSONResponse döndürdüğü için FastAPI ikinci doğrulamayı ve encoder'ı atlar.
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_SINGLETON, SHAPE_TUPLE_ELLIPSIS
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    orjson = None
+
+_MISSING = object()
+_LIST_SHAPES = (SHAPE_LIST, SHAPE_SEQUENCE, SHAPE_TUPLE_ELLIPSIS)
+
+# (anahtar = alias, dönüştürücü, varsayılan üretici); FastAPI de çıktıyı by_alias üretir
+_Plan = List[Tuple[str, Optional[Callable[[Any], Any]], Callable[[], Any]]]
+_plans: Dict[Type[BaseModel], _Plan] = {}
+
+
+# -----------------------------------------------------------------------------
+# Şema → düz dict
+# -----------------------------------------------------------------------------
+
+def _scalar(type_) -> Optional[Callable[[Any], Any]]:
+    if not isinstance(type_, type):
+        return None
+    if issubclass(type_, BaseModel):
+        return lambda v, schema=type_: dump(schema, v)
+    if issubclass(type_, bool):
+        return bool
+    if issubclass(type_, int):
+        return int
+    if issubclass(type_, float):
+        return float
+    return None
+
+
+def _converter(field) -> Optional[Callable[[Any], Any]]:
+    if field.shape == SHAPE_SINGLETON:
+        return _scalar(field.type_)
+    if field.shape in _LIST_SHAPES:
+        inner = _scalar(field.type_)
+        if inner is None:
+            return list
+        return lambda values, fn=inner: [fn(v) for v in values]
+    return None
+
+
+def _plan(schema: Type[BaseModel]) -> _Plan:
+    plan = _plans.get(schema)
+    if plan is None:
+        plan = [
+            (field.alias, _converter(field), field.get_default)
+            for field in schema.__fields__.values()
+        ]
+        _plans[schema] = plan
+    return plan
+
+
+def dump(schema: Type[BaseModel], obj: Any) -> Optional[dict]:
+    """obj (ORM nesnesi, dict ya da model) → schema alanlarıyla düz dict; doğrulama yok."""
+    if obj is None:
+        return None
+    out = {}
+    if isinstance(obj, dict):
+        for key, convert, default in _plan(schema):
+            value = obj.get(key, _MISSING)
+            if value is _MISSING:
+                value = default()
+            out[key] = value if value is None or convert is None else convert(value)
+    else:
+        for key, convert, default in _plan(schema):
+            value = getattr(obj, key, _MISSING)
+            if value is _MISSING:
+                value = default()
+            out[key] = value if value is None or convert is None else convert(value)
+    return out
+
+
+def dump_list(schema: Type[BaseModel], items) -> list:
+    return [dump(schema, item) for item in items]
+
+
+# -----------------------------------------------------------------------------
+# Cevap sınıfı
+# -----------------------------------------------------------------------------
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    return jsonable_encoder(value)
+
+
+def _json_default(value):
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return _default(value)
+
+
+def render(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return render(content)
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.crud.user import get_user_by_id
 from app.db.session import get_db
+from app.services import metrics
 
 # Şifre hash'leme
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -19,10 +20,12 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    with metrics.track_bcrypt("hash"):
+        return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    with metrics.track_bcrypt("verify"):
+        return pwd_context.verify(plain_password, hashed_password)
 
 def create_access_token(
     data: dict,
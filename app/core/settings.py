@@ -29,6 +29,32 @@ class Settings(BaseSettings):
     refresh_cookie_samesite: str = Field("lax", env="REFRESH_COOKIE_SAMESITE")  # "lax" | "strict" | "none"
     refresh_cookie_domain: str | None = Field(None, env="REFRESH_COOKIE_DOMAIN")
 
+    # ---- İstek / SQL ölçümü ----
+    REQUEST_STATS_HEADERS: bool = Field(False, env="REQUEST_STATS_HEADERS")  # Server-Timing + X-DB-* başlıkları (DEBUG'da hep açık)
+    SLOW_REQUEST_MS: float = Field(1000, env="SLOW_REQUEST_MS")
+    SLOW_QUERY_MS: float = Field(200, env="SLOW_QUERY_MS")
+    MAX_QUERIES_PER_REQUEST: int = Field(50, env="MAX_QUERIES_PER_REQUEST")
+    REPEATED_QUERY_LIMIT: int = Field(10, env="REPEATED_QUERY_LIMIT")  # aynı SQL bu kadar tekrar → N+1 şüphesi
+
+    # ---- Metrikler ----
+    METRICS_TOKEN: str | None = Field(None, env="METRICS_TOKEN")  # verilirse /metrics "Authorization: Bearer <token>" ister
+
+    # ---- Profil (admin, istek bazında) ----
+    PROFILING_ENABLED: bool = Field(True, env="PROFILING_ENABLED")      # False → middleware hiç eklenmez
+    PROFILE_DIR: str = Field("profiles", env="PROFILE_DIR")
+    PROFILE_INTERVAL_MS: float = Field(5, env="PROFILE_INTERVAL_MS")     # örnekleme aralığı
+    PROFILE_KEEP: int = Field(50, env="PROFILE_KEEP")                   # en fazla bu kadar rapor saklanır
+
+    # ---- Cevap sıkıştırma ----
+    COMPRESSION_MIN_BYTES: int = Field(1024, env="COMPRESSION_MIN_BYTES")  # bunun altındaki cevaplar sıkıştırılmaz
+    GZIP_LEVEL: int = Field(6, env="GZIP_LEVEL")
+    BROTLI_QUALITY: int = Field(4, env="BROTLI_QUALITY")                   # brotli kuruluysa (0-11)
+
+    # ---- Periyodik bakım ----
+    MAINTENANCE_INTERVAL_S: float = Field(300, env="MAINTENANCE_INTERVAL_S")  # 0 → thread başlatılmaz
+    SYNC_LOG_RETENTION_DAYS: int = Field(30, env="SYNC_LOG_RETENTION_DAYS")  # daha eski imleçler tam senkrona düşer
+    CATALOG_LOG_RETENTION_DAYS: int = Field(90, env="CATALOG_LOG_RETENTION_DAYS")  # daha eski katalog sürümleri tam snapshot alır
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -15,6 +15,7 @@ from app.schemas.catalog import (
     OtherMaterialCreate,
 )
 from app.crud.active import set_active_state  # ✅ is_active toggle helper
+from app.services import images
 
 from app.models.remote import Remote
 from app.schemas.catalog import RemoteCreate
@@ -68,6 +69,7 @@ def update_profile(db: Session, profile_id: UUID, payload: ProfileUpdate) -> Opt
         old_photo_path
         and new_code
         and old_code != new_code
+        and not images.is_content_addressed(old_photo_path)  # hash adlı dosyalar koddan bağımsız
     ):
         directory = os.path.dirname(old_photo_path) or "."
         _, ext = os.path.splitext(old_photo_path)
@@ -0,0 +1,352 @@
+# app/crud/catalog_io.py
+"""
+Katalog toplu içe/dışa aktarma (CSV / XLSX).
+
+İçe aktarma akışı (tek transaction):
+  1) Dosya satırları metin olarak geçici tabloya COPY edilir (satır no ile).
+  2) Doğrulama SQL'de, set bazlı yapılır → her satır için ilk hata `error` kolonuna yazılır.
+  3) Hatasız satırlar anahtar kolon üzerinden eşleşip tek UPDATE ... FROM ile güncellenir,
+     eşleşmeyenler tek INSERT ... SELECT ile eklenir.
+dry_run=True iken sadece doğrulama/özet yapılır, hiçbir şey yazılmaz.
+
+Dışa aktarma: aynı kolonlarla CSV (satır satır akış) veya XLSX.
+"""
+import csv
+import io
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+MAX_REPORTED_ERRORS = 500
+EXPORT_BATCH = 1000
+
+# entity → tablo, anahtar kolon, kolonlar: (ad, tür, zorunlu, max uzunluk)
+IMPORT_SPECS = OrderedDict([
+    ("profiles", {
+        "table": "profile",
+        "key": "profil_kodu",
+        "columns": [
+            ("profil_kodu", "text", True, 50),
+            ("profil_isim", "text", True, 100),
+            ("birim_agirlik", "numeric", True, None),
+            ("boy_uzunluk", "numeric", True, None),
+            ("unit_price", "numeric", False, None),
+            ("is_active", "bool", False, None),
+        ],
+    }),
+    ("glass-types", {
+        "table": "glass_type",
+        "key": "cam_isim",
+        "columns": [
+            ("cam_isim", "text", True, 100),
+            ("thickness_mm", "numeric", True, None),
+            ("belirtec_1", "int", False, None),
+            ("belirtec_2", "int", False, None),
+            ("is_active", "bool", False, None),
+        ],
+    }),
+    ("other-materials", {
+        "table": "other_material",
+        "key": "diger_malzeme_isim",
+        "columns": [
+            ("diger_malzeme_isim", "text", True, 100),
+            ("birim", "text", True, 20),
+            ("birim_agirlik", "numeric", True, None),
+            ("hesaplama_turu", "text", False, 20),
+            ("unit_price", "numeric", False, None),
+            ("is_active", "bool", False, None),
+        ],
+    }),
+])
+
+_TRUE = ("true", "1", "evet", "yes", "e")
+_FALSE = ("false", "0", "hayir", "hayır", "no", "h")
+
+
+class CatalogImportError(ValueError):
+    """Dosya bütünü okunamıyorsa (başlık eksik, biçim bozuk) fırlatılır."""
+
+
+# ----- Dosya okuma -----
+
+def _decode(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Türkçe Excel'in "CSV" çıktısı genelde cp1254
+        return raw.decode("cp1254")
+
+
+def _read_csv(raw: bytes) -> Iterator[List[Optional[str]]]:
+    content = _decode(raw)
+    try:
+        dialect = csv.Sniffer().sniff(content[:4096], delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    for row in csv.reader(io.StringIO(content), dialect):
+        yield row
+
+
+def _read_xlsx(raw: bytes) -> Iterator[List[Optional[str]]]:
+    from openpyxl import load_workbook  # opsiyonel bağımlılık: sadece XLSX'te gerekir
+
+    wb = load_workbook(io.BytesIO(raw), read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        for row in ws.iter_rows(values_only=True):
+            yield [None if v is None else str(v) for v in row]
+    finally:
+        wb.close()
+
+
+def read_rows(filename: str, raw: bytes) -> Iterator[List[Optional[str]]]:
+    if (filename or "").lower().endswith(".xlsx"):
+        return _read_xlsx(raw)
+    return _read_csv(raw)
+
+
+# ----- SQL parçaları -----
+
+def _num(col: str) -> str:
+    return f"replace(btrim({col}), ',', '.')"
+
+
+def _cast(col: str, kind: str) -> str:
+    if kind == "numeric":
+        return f"NULLIF({_num(col)}, '')::numeric"
+    if kind == "int":
+        return f"NULLIF(btrim({col}), '')::integer"
+    if kind == "bool":
+        # boş hücre → varsayılan (true)
+        return f"(COALESCE(btrim({col}), '') = '' OR lower(btrim({col})) IN ({', '.join(repr(v) for v in _TRUE)}))"
+    return f"NULLIF(btrim({col}), '')"
+
+
+def _checks(col: str, kind: str, required: bool, max_len: Optional[int]) -> List[Tuple[str, str]]:
+    """(koşul, hata mesajı) listesi; sırayla değerlendirilir, ilk tutan yazılır."""
+    checks = []
+    blank = f"({col} IS NULL OR btrim({col}) = '')"
+    if required:
+        checks.append((blank, f"{col} boş olamaz"))
+    not_blank = f"NOT {blank}"
+    if kind == "text" and max_len:
+        checks.append((f"{not_blank} AND length(btrim({col})) > {max_len}", f"{col} en fazla {max_len} karakter olabilir"))
+    elif kind == "numeric":
+        checks.append((f"{not_blank} AND {_num(col)} !~ '^[-+]?[0-9]+(\\.[0-9]+)?$'", f"{col} sayı olmalı"))
+        checks.append((f"{not_blank} AND {_num(col)} ~ '^-'", f"{col} negatif olamaz"))
+    elif kind == "int":
+        checks.append((f"{not_blank} AND btrim({col}) !~ '^[-+]?[0-9]{{1,9}}$'", f"{col} tam sayı olmalı"))
+    elif kind == "bool":
+        allowed = ", ".join(repr(v) for v in _TRUE + _FALSE)
+        checks.append((f"{not_blank} AND lower(btrim({col})) NOT IN ({allowed})", f"{col} evet/hayır olmalı"))
+    return checks
+
+
+# ----- İçe aktarma -----
+
+def import_catalog(db: Session, entity: str, filename: str, raw: bytes, dry_run: bool = False) -> dict:
+    spec = IMPORT_SPECS[entity]
+    table, key = spec["table"], spec["key"]
+
+    rows = read_rows(filename, raw)
+    try:
+        header = next(rows, None)
+    except Exception as e:
+        raise CatalogImportError(f"Dosya okunamadı: {e}")
+    if not header:
+        raise CatalogImportError("Dosya boş")
+    header = [(h or "").strip().lower() for h in header]
+
+    # Sadece bilinen kolonlar; dosyadaki sıraları
+    known = {c[0]: c for c in spec["columns"]}
+    present = [known[h] for h in OrderedDict.fromkeys(header) if h in known]
+    positions = [header.index(c[0]) for c in present]
+    missing = [c[0] for c in spec["columns"] if c[2] and c[0] not in {p[0] for p in present}]
+    if missing:
+        raise CatalogImportError(f"Eksik kolon(lar): {', '.join(missing)}")
+
+    # 1) Geçici tablo + COPY
+    names = [c[0] for c in present]
+    db.execute(text(
+        "CREATE TEMP TABLE catalog_import_stage ("
+        "line_no integer NOT NULL, "
+        + "".join(f"{n} text, " for n in names)
+        + "error text) ON COMMIT DROP"
+    ))
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    total = 0
+    try:
+        for line_no, row in enumerate(rows, start=2):
+            cells = [row[i] if i < len(row) else None for i in positions]
+            if all(v is None or str(v).strip() == "" for v in cells):
+                continue
+            writer.writerow([line_no] + ["" if v is None else v for v in cells])
+            total += 1
+    except Exception as e:
+        db.rollback()
+        raise CatalogImportError(f"Dosya okunamadı: {e}")
+    buf.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY catalog_import_stage (line_no, {', '.join(names)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+    finally:
+        cursor.close()
+
+    # 2) Doğrulama (satır başına ilk hata)
+    whens = [
+        f"WHEN {cond} THEN '{msg}'"
+        for c in present
+        for cond, msg in _checks(*c)
+    ]
+    if whens:
+        db.execute(text(f"UPDATE catalog_import_stage SET error = CASE {' '.join(whens)} END"))
+    # Dosyada tekrar eden anahtar: ilk satır geçerli, sonrakiler hata
+    db.execute(text(
+        f"""
+        UPDATE catalog_import_stage s SET error = 'Dosyada tekrar eden {key} (ilk: satır ' || d.first_line || ')'
+        FROM (
+            SELECT line_no, min(line_no) OVER (PARTITION BY btrim({key})) AS first_line
+            FROM catalog_import_stage WHERE error IS NULL
+        ) d
+        WHERE s.line_no = d.line_no AND d.line_no <> d.first_line
+        """
+    ))
+
+    errors = [
+        {"line": r.line_no, "key": r.key, "error": r.error}
+        for r in db.execute(text(
+            f"SELECT line_no, btrim({key}) AS key, error FROM catalog_import_stage "
+            f"WHERE error IS NOT NULL ORDER BY line_no LIMIT {MAX_REPORTED_ERRORS}"
+        ))
+    ]
+    error_count = db.execute(text("SELECT count(*) FROM catalog_import_stage WHERE error IS NOT NULL")).scalar()
+
+    valid = f"""
+        SELECT {', '.join(f'{_cast(n, k)} AS {n}' for n, k, _, _ in present)}
+        FROM catalog_import_stage WHERE error IS NULL
+    """
+    matched = db.execute(text(
+        f"""
+        SELECT count(*) FROM ({valid}) s
+        WHERE EXISTS (SELECT 1 FROM "{table}" t WHERE t.{key} = s.{key} AND t.is_deleted = false)
+        """
+    )).scalar()
+    valid_count = total - error_count
+
+    updated = inserted = 0
+    if not dry_run:
+        # Aynı anahtara aynı anda iki import yazmasın (tabloda unique kısıt yok)
+        db.execute(text(f'LOCK TABLE "{table}" IN SHARE ROW EXCLUSIVE MODE'))
+        # 3a) Güncelle: sadece gerçekten değişen satırlar (gereksiz updated_at / change log olmasın)
+        set_cols = [n for n in names if n != key]
+        if set_cols:
+            updated = db.execute(text(
+                f"""
+                UPDATE "{table}" t SET {', '.join(f'{n} = s.{n}' for n in set_cols)}, updated_at = now()
+                FROM ({valid}) s
+                WHERE t.{key} = s.{key} AND t.is_deleted = false
+                  AND ({', '.join(f't.{n}' for n in set_cols)}) IS DISTINCT FROM ({', '.join(f's.{n}' for n in set_cols)})
+                """
+            )).rowcount
+        # 3b) Ekle
+        inserted = db.execute(text(
+            f"""
+            INSERT INTO "{table}" (id, {', '.join(names)})
+            SELECT gen_random_uuid(), {', '.join(f's.{n}' for n in names)}
+            FROM ({valid}) s
+            WHERE NOT EXISTS (SELECT 1 FROM "{table}" t WHERE t.{key} = s.{key} AND t.is_deleted = false)
+            """
+        )).rowcount
+        db.commit()
+    else:
+        db.rollback()
+
+    return {
+        "entity": entity,
+        "dry_run": dry_run,
+        "total_rows": total,
+        "valid_rows": valid_count,
+        "matched": matched,
+        "updated": updated,
+        "inserted": inserted if not dry_run else valid_count - matched,
+        "unchanged": max(matched - updated, 0) if not dry_run else 0,
+        "error_count": error_count,
+        "errors": errors,
+    }
+
+
+# ----- Dışa aktarma -----
+
+def export_header(entity: str) -> List[str]:
+    return [c[0] for c in IMPORT_SPECS[entity]["columns"]]
+
+
+def _export_query(entity: str) -> str:
+    spec = IMPORT_SPECS[entity]
+    return (
+        f'SELECT {", ".join(export_header(entity))} FROM "{spec["table"]}" '
+        f'WHERE is_deleted = false ORDER BY {spec["key"]}'
+    )
+
+
+def iter_export_rows(db: Session, entity: str) -> Iterator[tuple]:
+    """Sunucu tarafı cursor ile parça parça okur (tüm tablo belleğe alınmaz)."""
+    result = db.execute(
+        text(_export_query(entity)).execution_options(stream_results=True, yield_per=EXPORT_BATCH)
+    )
+    for row in result:
+        yield tuple(row)
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "evet" if value else "hayır"
+    return str(value)
+
+
+def iter_export_csv(db: Session, entity: str) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(export_header(entity))
+    yield ("\ufeff" + buf.getvalue()).encode("utf-8")   # Excel için BOM
+    n = 0
+    buf.seek(0)
+    buf.truncate()
+    for row in iter_export_rows(db, entity):
+        writer.writerow([_fmt(v) for v in row])
+        n += 1
+        if n % EXPORT_BATCH == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def _xlsx_cell(value):
+    if isinstance(value, bool):
+        return _fmt(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def write_export_xlsx(db: Session, entity: str, fileobj) -> None:
+    from openpyxl import Workbook  # opsiyonel bağımlılık: sadece XLSX'te gerekir
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(entity)
+    ws.append(export_header(entity))
+    for row in iter_export_rows(db, entity):
+        ws.append([_xlsx_cell(v) for v in row])
+    wb.save(fileobj)
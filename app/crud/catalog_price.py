@@ -0,0 +1,212 @@
+# app/crud/catalog_price.py
+"""
+Tarih etkili katalog fiyatları.
+
+- price_as_of     : tek kalem için "X anındaki fiyat" (index üzerinde tek arama)
+- resolve_prices  : çok kalemi tek sorguda çözer (VALUES + LATERAL ... LIMIT 1)
+- schedule_price  : geçmişe/ileri tarihe fiyat kaydı (admin)
+- apply_due_prices: vadesi gelen ileri tarihli fiyatları katalog kolonuna yazar (maintenance)
+Geçmişte kaydı olmayan kalemlerde katalogdaki güncel fiyat kullanılır. Katalog kolonu
+(unit_price / price) her zaman şu an geçerli fiyattır; sayfalar, toplu fiyatlama ve snapshot onu okur.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import String, column, func, select, true, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.catalog_price import CatalogPriceHistory
+from app.models.other_material import OtherMaterial
+from app.models.profile import Profile
+from app.models.remote import Remote
+from app.services import maintenance
+
+# item_type → (model, fiyat kolonu)
+PRICE_SOURCES = OrderedDict([
+    ("profile", (Profile, "unit_price")),
+    ("other_material", (OtherMaterial, "unit_price")),
+    ("remote", (Remote, "price")),
+])
+
+PriceKey = Tuple[str, UUID]
+
+
+def _as_float(v) -> Optional[float]:
+    return float(v) if v is not None else None
+
+
+def price_as_of(
+    db: Session, item_type: str, item_id: UUID, as_of: Optional[datetime] = None
+) -> Optional[CatalogPriceHistory]:
+    h = CatalogPriceHistory
+    return (
+        db.query(h)
+        .filter(
+            h.item_type == item_type,
+            h.item_id == item_id,
+            h.effective_from <= (as_of or func.now()),
+        )
+        .order_by(h.effective_from.desc())
+        .first()
+    )
+
+
+def list_price_history(db: Session, item_type: str, item_id: UUID, limit: int = 200) -> List[CatalogPriceHistory]:
+    h = CatalogPriceHistory
+    return (
+        db.query(h)
+        .filter(h.item_type == item_type, h.item_id == item_id)
+        .order_by(h.effective_from.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _current_prices(db: Session, item_type: str, ids: List[UUID]) -> Dict[UUID, Optional[float]]:
+    model, col = PRICE_SOURCES[item_type]
+    rows = db.query(model.id, getattr(model, col)).filter(model.id.in_(ids)).all()
+    return {rid: _as_float(price) for rid, price in rows}
+
+
+def resolve_prices(
+    db: Session, items: Iterable[PriceKey], as_of: Optional[datetime] = None
+) -> Dict[PriceKey, Optional[float]]:
+    """
+    [(item_type, item_id), ...] → {(item_type, item_id): fiyat}
+    Tüm kalemler tek sorguda; her kalem için (item_type, item_id, effective_from DESC)
+    index'inde tek arama yapılır.
+    """
+    keys = list(OrderedDict.fromkeys((t, i) for t, i in items if i is not None))
+    if not keys:
+        return {}
+
+    h = CatalogPriceHistory
+    req = values(
+        column("item_type", String),
+        column("item_id", PGUUID(as_uuid=True)),
+        name="req",
+    ).data(keys)
+    latest = (
+        select(h.price, h.effective_from)
+        .where(
+            h.item_type == req.c.item_type,
+            h.item_id == req.c.item_id,
+            h.effective_from <= (as_of or func.now()),
+        )
+        .order_by(h.effective_from.desc())
+        .limit(1)
+        .lateral("latest")
+    )
+    stmt = (
+        select(req.c.item_type, req.c.item_id, latest.c.price, latest.c.effective_from)
+        .select_from(req.outerjoin(latest, true()))
+    )
+
+    out: Dict[PriceKey, Optional[float]] = {}
+    missing: Dict[str, List[UUID]] = {}
+    for item_type, item_id, price, effective_from in db.execute(stmt).all():
+        if effective_from is None:
+            missing.setdefault(item_type, []).append(item_id)
+        else:
+            out[(item_type, item_id)] = _as_float(price)
+
+    # Geçmişi olmayanlar (trigger öncesi eklenmiş vb.) → katalogdaki güncel fiyat
+    for item_type, ids in missing.items():
+        current = _current_prices(db, item_type, ids)
+        for item_id in ids:
+            out[(item_type, item_id)] = current.get(item_id)
+    return out
+
+
+def resolve_catalog_prices(
+    db: Session,
+    material_ids: Iterable[UUID] = (),
+    remote_ids: Iterable[UUID] = (),
+    as_of: Optional[datetime] = None,
+) -> Tuple[Dict[UUID, Optional[float]], Dict[UUID, Optional[float]]]:
+    """Proje snapshot'ları için kısayol: (malzeme fiyatları, kumanda fiyatları)."""
+    items = [("other_material", i) for i in material_ids] + [("remote", i) for i in remote_ids]
+    resolved = resolve_prices(db, items, as_of=as_of)
+    materials = {i: p for (t, i), p in resolved.items() if t == "other_material"}
+    remotes = {i: p for (t, i), p in resolved.items() if t == "remote"}
+    return materials, remotes
+
+
+def schedule_price(
+    db: Session,
+    item_type: str,
+    item_id: UUID,
+    price: Optional[float],
+    effective_from: Optional[datetime] = None,
+    user_id: Optional[UUID] = None,
+) -> Optional[CatalogPriceHistory]:
+    """
+    Fiyat kaydı ekler (aynı an için varsa üzerine yazar). Kalem yoksa None.
+    Kayıt şu an itibarıyla geçerli fiyatı değiştiriyorsa katalogdaki kolon da güncellenir;
+    ileri tarihli kayıt vadesi gelince apply_due_prices ile yazılır.
+    """
+    model, col = PRICE_SOURCES[item_type]
+    if not db.query(model.id).filter(model.id == item_id).first():
+        return None
+    if effective_from is not None and effective_from.tzinfo is None:
+        effective_from = effective_from.replace(tzinfo=timezone.utc)
+
+    h = CatalogPriceHistory.__table__
+    stmt = pg_insert(h).values(
+        item_type=item_type,
+        item_id=item_id,
+        price=price,
+        effective_from=effective_from or func.now(),
+        created_by=user_id,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_catalog_price_effective",
+        set_={"price": stmt.excluded.price, "created_by": stmt.excluded.created_by},
+    ).returning(h.c.id)
+    row_id = db.execute(stmt).scalar()
+
+    if effective_from is None or effective_from <= datetime.now(timezone.utc):
+        current = price_as_of(db, item_type, item_id)
+        if current is not None:
+            db.execute(
+                update(model)
+                .where(model.id == item_id, getattr(model, col).is_distinct_from(current.price))
+                .values({col: current.price})
+            )
+    db.commit()
+    return db.get(CatalogPriceHistory, row_id)
+
+
+def apply_due_prices(db: Session) -> int:
+    """
+    Vadesi gelmiş ileri tarihli kayıtları (created_at < effective_from <= now) olan kalemlerde
+    katalog kolonunu şu an geçerli fiyata çeker. Commit çağırana aittir; değişen satır sayısı döner.
+    """
+    h = CatalogPriceHistory
+    changed = 0
+    for item_type, (model, col) in PRICE_SOURCES.items():
+        due = (
+            select(h.item_id)
+            .where(h.item_type == item_type, h.effective_from <= func.now(), h.effective_from > h.created_at)
+        )
+        latest = (
+            select(h.item_id, h.price)
+            .where(h.item_type == item_type, h.effective_from <= func.now(), h.item_id.in_(due))
+            .distinct(h.item_id)
+            .order_by(h.item_id, h.effective_from.desc())
+            .subquery()
+        )
+        result = db.execute(
+            update(model)
+            .where(model.id == latest.c.item_id, getattr(model, col).is_distinct_from(latest.c.price))
+            .values({col: latest.c.price})
+            .execution_options(synchronize_session=False)
+        )
+        changed += result.rowcount or 0
+    return changed
+
+
+maintenance.register("catalog_price_promote", apply_due_prices)
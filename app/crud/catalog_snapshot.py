@@ -0,0 +1,182 @@
+# app/crud/catalog_snapshot.py
+"""
+Yayındaki kataloğun tek dokümanlık (snapshot) hali ve sürüm bazlı farkı (delta).
+
+- Sürüm: catalog_change_log.txid üzerinden commit sırasına uyan imleç (katalog tablolarındaki
+  trigger'lar yazar) → crud/change_log.py. Log periyodik olarak temizlenir (maintenance).
+- Doküman kompakt: her varlık için {"fields": [...], "rows": [[...], ...]} (gzip dostu).
+- Delta: since'ten sonra değişen varlıkların güncel satırları + artık görünmeyenlerin id'leri.
+"""
+import json
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.crud import change_log
+from app.models.catalog_change_log import CatalogChangeLog
+from app.models.color import Color
+from app.models.glass_type import GlassType
+from app.models.other_material import OtherMaterial
+from app.models.profile import Profile
+from app.models.remote import Remote
+from app.models.system import System, SystemVariant
+from app.services import maintenance
+
+
+def _visible_system():
+    return and_(
+        System.is_deleted == False,    # noqa: E712
+        System.is_published == True,  # noqa: E712
+        System.is_active == True,     # noqa: E712
+    )
+
+
+def _visible_variant():
+    return and_(
+        SystemVariant.is_deleted == False,    # noqa: E712
+        SystemVariant.is_published == True,  # noqa: E712
+        SystemVariant.is_active == True,     # noqa: E712
+    )
+
+
+def _active(model):
+    return and_(model.is_deleted == False, model.is_active == True)  # noqa: E712
+
+
+# entity → (model, alanlar, görünürlük koşulu, sıralama)
+ENTITIES = OrderedDict([
+    ("profiles", (
+        Profile,
+        ["id", "profil_kodu", "profil_isim", "birim_agirlik", "boy_uzunluk", "unit_price", "profil_kesit_fotograf"],
+        lambda: _active(Profile),
+        lambda: [Profile.profil_isim.asc()],
+    )),
+    ("glass_types", (
+        GlassType,
+        ["id", "cam_isim", "thickness_mm", "belirtec_1", "belirtec_2"],
+        lambda: _active(GlassType),
+        lambda: [GlassType.cam_isim.asc()],
+    )),
+    ("other_materials", (
+        OtherMaterial,
+        ["id", "diger_malzeme_isim", "birim", "birim_agirlik", "hesaplama_turu", "unit_price"],
+        lambda: _active(OtherMaterial),
+        lambda: [OtherMaterial.diger_malzeme_isim.asc()],
+    )),
+    ("remotes", (
+        Remote,
+        ["id", "kumanda_isim", "price", "kapasite"],
+        lambda: _active(Remote),
+        lambda: [Remote.kumanda_isim.asc()],
+    )),
+    ("colors", (
+        Color,
+        ["id", "name", "type", "unit_cost", "is_default", "is_default_2"],
+        lambda: _active(Color),
+        lambda: [Color.type.asc(), Color.name.asc()],
+    )),
+    ("systems", (
+        System,
+        ["id", "name", "description", "photo_url", "sort_index"],
+        _visible_system,
+        lambda: [System.sort_index.asc(), System.name.asc()],
+    )),
+    ("system_variants", (
+        SystemVariant,
+        ["id", "system_id", "name", "photo_url", "pdf_foto_cikti", "sort_index"],
+        lambda: and_(_visible_variant(), _visible_system()),
+        lambda: [SystemVariant.system_id.asc(), SystemVariant.sort_index.asc(), SystemVariant.name.asc()],
+    )),
+])
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def dumps(doc: dict) -> bytes:
+    return json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def current_version(db: Session) -> Tuple[int, bool]:
+    """(sürüm, settled) — settled=False ise sürüm açık bir transaction yüzünden geride tutuldu."""
+    return change_log.commit_cursor(db, CatalogChangeLog)
+
+
+def purge_log(db: Session) -> int:
+    return change_log.purge(db, CatalogChangeLog, settings.CATALOG_LOG_RETENTION_DAYS)
+
+
+maintenance.register("catalog_change_log_purge", purge_log)
+
+
+def _select_rows(db: Session, entity: str, ids: Optional[Set[UUID]] = None) -> List[list]:
+    model, fields, visible, order_by = ENTITIES[entity]
+    stmt = select(*[getattr(model, f) for f in fields]).where(visible())
+    if entity == "system_variants":
+        stmt = stmt.join(System, System.id == SystemVariant.system_id)
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(list(ids)))
+    stmt = stmt.order_by(*order_by())
+    return [[_encode(v) for v in row] for row in db.execute(stmt).all()]
+
+
+def build_full(db: Session, version: int) -> dict:
+    entities = OrderedDict()
+    for entity, (_, fields, _, _) in ENTITIES.items():
+        entities[entity] = {"fields": fields, "rows": _select_rows(db, entity)}
+    return {"version": version, "full": True, "entities": entities}
+
+
+def build_delta(db: Session, since: int, version: int) -> dict:
+    """
+    since <= txid < version aralığında log'a düşen varlıklar yeniden okunur:
+      - hâlâ görünür olanlar → rows
+      - silinmiş / pasif / yayından kalkmış olanlar → deleted (id listesi)
+    Log'un başı since'ten yeniyse (temizlenmişse) tam snapshot döner.
+    """
+    oldest = change_log.oldest_txid(db, CatalogChangeLog)
+    if since > version or (oldest is not None and oldest > since):
+        return build_full(db, version)
+
+    changed: Dict[str, Set[UUID]] = {entity: set() for entity in ENTITIES}
+    rows = (
+        db.query(CatalogChangeLog.entity, CatalogChangeLog.entity_id)
+        .filter(CatalogChangeLog.txid >= since, CatalogChangeLog.txid < version)
+        .distinct()
+        .all()
+    )
+    for entity, entity_id in rows:
+        if entity in changed:
+            changed[entity].add(entity_id)
+
+    # Sistemin görünürlüğü değişince varyantlarının görünürlüğü de değişir
+    if changed["systems"]:
+        changed["system_variants"].update(
+            vid for (vid,) in db.query(SystemVariant.id)
+            .filter(SystemVariant.system_id.in_(list(changed["systems"])))
+            .all()
+        )
+
+    entities = OrderedDict()
+    for entity, ids in changed.items():
+        if not ids:
+            continue
+        fields = ENTITIES[entity][1]
+        current = _select_rows(db, entity, ids)
+        visible_ids = {row[0] for row in current}
+        entities[entity] = {
+            "fields": fields,
+            "rows": current,
+            "deleted": sorted(str(i) for i in ids if str(i) not in visible_ids),
+        }
+    return {"version": version, "since": since, "full": False, "entities": entities}
@@ -0,0 +1,53 @@
+# app/crud/change_log.py
+"""
+Trigger'ların yazdığı değişiklik log'ları (sync_change_log, catalog_change_log) için ortak
+imleç (cursor) ve temizlik.
+
+- Sıra numarası (version) commit sırasını yansıtmaz: N'yi alan transaction, N+1 görünür
+  olduktan sonra commit olabilir. Bu yüzden her satır yazan transaction'ın id'si tutulur
+  (txid = pg_current_xact_id()).
+- İmleç = min(xmin, max(txid) + 1); xmin: hâlâ açık en eski transaction'ın id'si.
+  İmleçten küçük txid'li transaction'ların hepsi bitmiştir → "since <= txid < imleç" aralığı
+  bir daha değişmez; geç commit olan satırın txid'i imlecin üstünde kalır, sonraki delta'da gelir.
+- Açık yazma transaction'ı yoksa imleç max(txid) + 1'de sabit durur (ETag / önbellek için).
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+_XMIN = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+
+def commit_cursor(db: Session, model) -> Tuple[int, bool]:
+    """
+    (imleç, settled). settled=False → imleç hâlâ açık bir transaction yüzünden geride tutuldu;
+    sonradan ilerleyebilir, bellekte sabit sürüm olarak saklanmamalı.
+    """
+    top, xmin = db.execute(select(func.max(model.__table__.c.txid), _XMIN)).one()
+    upper = int(top or 0) + 1
+    return min(upper, int(xmin)), upper <= int(xmin)
+
+
+def oldest_txid(db: Session, model):
+    return db.execute(select(func.min(model.__table__.c.txid))).scalar()
+
+
+def purge(db: Session, model, keep_days: int) -> int:
+    """
+    changed_at'i keep_days'ten eski satırları siler. Sınır kalan bir satırın txid'i olur (log hiç
+    boşalmaz), açık transaction'ların da altında kalır → since < min(txid) olan istemci tam
+    senkrona düşer, daha yeni imleçler etkilenmez. Commit çağırana aittir.
+    """
+    table = model.__table__
+    cutoff = datetime.now(timezone.utc) - timedelta(days=keep_days)
+    horizon, xmin = db.execute(
+        select(func.min(table.c.txid), _XMIN).where(table.c.changed_at >= cutoff)
+    ).one()
+    if horizon is None:
+        horizon = db.execute(select(func.max(table.c.txid))).scalar()
+    if horizon is None:
+        return 0
+    horizon = min(int(horizon), int(xmin))
+    return db.execute(table.delete().where(table.c.txid < horizon)).rowcount or 0
@@ -0,0 +1,153 @@
+# app/crud/ordering.py
+"""
+System / SystemVariant sıralaması (sort_index) için ortak yardımcılar.
+
+- Aralıklı (gapped) indeks: kayıtlar arasında SORT_GAP kadar boşluk bırakılır; bir kaydı
+  taşımak = iki komşunun ortasına yazmak → tek satırlık UPDATE.
+- Boşluk biterse kapsam (tüm sistemler / bir sistemin varyantları) tek UPDATE ile yeniden
+  numaralanır; boşluklar daralınca aynı işlem arka planda planlanır.
+- Toplu sıralama: tek UPDATE ... FROM (VALUES ...).
+- Sırayı okuyup yazan her yol (taşıma, toplu sıralama, arka plan yeniden numaralama) önce
+  lock_scope() ile kapsamın advisory kilidini alır → biri diğerinin eski okumasıyla
+  yazıp yeni taşımayı geri alamaz.
+"""
+import zlib
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Integer, asc, column, func, select, text, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Session
+
+from app.models.system import System, SystemVariant
+
+SORT_GAP = 1024
+# Komşuyla arası bundan küçük kalırsa arka planda yeniden numaralama planlanır
+MIN_GAP = 4
+
+# kapsam adı → (model, kapsam kolonu)
+ORDER_SCOPES = {
+    "system": (System, None),
+    "system_variant": (SystemVariant, "system_id"),
+}
+
+
+def lock_scope(db: Session, scope: str, scope_id: Optional[UUID] = None) -> None:
+    """Kapsamın sıralama kilidi; transaction bitince (commit/rollback) kendiliğinden düşer."""
+    key = zlib.crc32(f"ordering:{scope}:{scope_id or ''}".encode()) & 0x7FFFFFFF
+    db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": key})
+
+
+def _scope_filters(model, scope_col: Optional[str], scope_id: Optional[UUID]) -> list:
+    conds = [model.is_deleted == False]  # noqa: E712
+    if scope_col is not None:
+        conds.append(getattr(model, scope_col) == scope_id)
+    return conds
+
+
+def _ordered(db: Session, model, conds: list) -> List[Tuple[UUID, int]]:
+    # Liste uçlarıyla aynı sıra: sort_index, name, created_at
+    return [
+        (r[0], r[1])
+        for r in db.execute(
+            select(model.id, model.sort_index)
+            .where(*conds)
+            .order_by(asc(model.sort_index), asc(model.name), asc(model.created_at))
+        ).all()
+    ]
+
+
+def bulk_set_sort_index(db: Session, model, pairs: Sequence[Tuple[UUID, int]]) -> int:
+    """[(id, sort_index), ...] → tek UPDATE ... FROM (VALUES ...). Etkilenen satır sayısı döner."""
+    if not pairs:
+        return 0
+    v = values(
+        column("id", PGUUID(as_uuid=True)),
+        column("sort_index", Integer),
+        name="v",
+    ).data([(i, int(s)) for i, s in pairs])
+    table = model.__table__
+    return db.execute(
+        update(table)
+        .where(table.c.id == v.c.id, table.c.sort_index.is_distinct_from(v.c.sort_index))
+        .values(sort_index=v.c.sort_index, updated_at=func.now())
+    ).rowcount
+
+
+def rebalance(db: Session, scope: str, scope_id: Optional[UUID] = None) -> int:
+    """Kapsamı mevcut sırasını koruyarak SORT_GAP aralıklarla yeniden numaralar (tek UPDATE)."""
+    model, scope_col = ORDER_SCOPES[scope]
+    lock_scope(db, scope, scope_id)
+    ordered = _ordered(db, model, _scope_filters(model, scope_col, scope_id))
+    return bulk_set_sort_index(db, model, [(i, (n + 1) * SORT_GAP) for n, (i, _) in enumerate(ordered)])
+
+
+def _rebalance_job(db: Session, scope: str, scope_id: Optional[UUID]) -> None:
+    rebalance(db, scope, scope_id)
+    db.commit()
+
+
+def schedule_rebalance(scope: str, scope_id: Optional[UUID] = None) -> None:
+    from app.services import jobs  # döngüsel import olmasın
+
+    jobs.submit_with_session(_rebalance_job, scope, scope_id)
+
+
+def move_item(db: Session, scope: str, item_id: UUID, direction: str, steps: int = 1) -> Optional[int]:
+    """
+    Kaydı kapsam içinde `steps` adım yukarı/aşağı taşır ve commit eder. Yeni sort_index
+    döner (kayıt yoksa None). Genelde tek satır güncellenir; komşular arasında yer yoksa
+    kapsam tek UPDATE ile yeniden numaralanır.
+    """
+    model, scope_col = ORDER_SCOPES[scope]
+    obj = db.get(model, item_id)
+    if obj is None or obj.is_deleted:
+        return None
+    scope_id = getattr(obj, scope_col) if scope_col else None
+
+    # Kilitten sonra okunan sıra günceldir (obj.sort_index kilitten önce yüklenmiş olabilir)
+    lock_scope(db, scope, scope_id)
+    ordered = _ordered(db, model, _scope_filters(model, scope_col, scope_id))
+    pos = next((n for n, (i, _) in enumerate(ordered) if i == item_id), None)
+    if pos is None:
+        db.rollback()
+        return None
+    current_idx = ordered[pos][1]
+    rest = ordered[:pos] + ordered[pos + 1:]
+    target = max(pos - steps, 0) if direction == "up" else min(pos + steps, len(rest))
+    if target == pos:
+        db.rollback()
+        return current_idx
+
+    prev_idx = rest[target - 1][1] if target > 0 else None
+    next_idx = rest[target][1] if target < len(rest) else None
+
+    if prev_idx is None and next_idx is None:
+        new_idx = current_idx
+    elif prev_idx is None:
+        new_idx = next_idx - SORT_GAP
+    elif next_idx is None:
+        new_idx = prev_idx + SORT_GAP
+    elif next_idx - prev_idx >= 2:
+        new_idx = (prev_idx + next_idx) // 2
+    else:
+        # Komşular arasında yer yok → kapsamı yeni sırayla yeniden numarala
+        rest.insert(target, (item_id, current_idx))
+        bulk_set_sort_index(db, model, [(i, (n + 1) * SORT_GAP) for n, (i, _) in enumerate(rest)])
+        db.commit()
+        return (target + 1) * SORT_GAP
+
+    db.execute(
+        update(model.__table__)
+        .where(model.__table__.c.id == item_id)
+        .values(sort_index=new_idx, updated_at=func.now())
+    )
+
+    tight = (prev_idx is not None and new_idx - prev_idx < MIN_GAP) or (
+        next_idx is not None and next_idx - new_idx < MIN_GAP
+    )
+    db.commit()
+    if tight:
+        # Bir sonraki taşıma yine tek satır olsun diye boşlukları arka planda aç
+        schedule_rebalance(scope, scope_id)
+    return new_idx
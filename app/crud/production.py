@@ -0,0 +1,445 @@
+# app/crud/production.py
+
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.crud import calculation_helper as calc_crud
+from app.models.color import Color
+from app.models.glass_type import GlassType
+from app.models.production_batch import ProductionBatch
+from app.models.profile import Profile
+from app.models.project import (
+    Project,
+    ProjectSystem,
+    ProjectSystemProfile,
+    ProjectExtraProfile,
+    ProjectSystemGlass,
+    ProjectExtraGlass,
+)
+from app.services.cutting import pack_cuts, summarize_bars
+from app.services.glass_nesting import nest_pieces, summarize_sheets
+
+
+# ----------------------------------------------------------------
+# Batch CRUD
+# ----------------------------------------------------------------
+def find_invalid_project_ids(
+    db: Session, owner_id: UUID, project_ids: Sequence[UUID], approved_only: bool = True
+) -> List[UUID]:
+    """Sahibine ait olmayan (approved_only ise onaylanmamış/teklif) projelerin id'lerini döner."""
+    q = db.query(Project.id).filter(
+        Project.id.in_(list(project_ids)),
+        Project.created_by == owner_id,
+    )
+    if approved_only:
+        q = q.filter(Project.is_teklif == False)  # noqa: E712
+    ok = {pid for (pid,) in q.all()}
+    return [pid for pid in project_ids if pid not in ok]
+
+
+def create_batch(
+    db: Session,
+    *,
+    owner_id: UUID,
+    project_ids: Sequence[UUID],
+    name: Optional[str] = None,
+    params: Optional[dict] = None,
+) -> ProductionBatch:
+    # Sıra korunarak tekilleştir
+    unique_ids = list(dict.fromkeys(project_ids))
+    batch = ProductionBatch(
+        owner_id=owner_id,
+        name=name,
+        kind="profile_cutting",
+        status="queued",
+        project_ids=[str(pid) for pid in unique_ids],
+        params=params or {},
+    )
+    db.add(batch)
+    db.commit()
+    db.refresh(batch)
+    return batch
+
+
+def get_batch(db: Session, batch_id: UUID) -> Optional[ProductionBatch]:
+    return db.query(ProductionBatch).filter(ProductionBatch.id == batch_id).first()
+
+
+def list_batches(db: Session, owner_id: UUID, limit: int = 50, offset: int = 0) -> Tuple[List[ProductionBatch], int]:
+    q = db.query(ProductionBatch).filter(ProductionBatch.owner_id == owner_id)
+    total = q.count()
+    items = (
+        q.order_by(ProductionBatch.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+    return items, total
+
+
+def delete_batch(db: Session, batch: ProductionBatch) -> None:
+    db.delete(batch)
+    db.commit()
+
+
+# ----------------------------------------------------------------
+# Kesim listesi toplama (set-based, proje başına sorgu yok)
+# ----------------------------------------------------------------
+def _stock_length_mm(boy_uzunluk) -> float:
+    """
+    Profil boyu katalogda mm olarak tutulur; eski kayıtlarda metre (ör. 6.5) görülebildiği
+    için 100'den küçük değerler metre kabul edilir.
+    """
+    value = float(boy_uzunluk or 0)
+    if 0 < value < 100:
+        return value * 1000.0
+    return value
+
+
+def collect_profile_cuts(
+    db: Session, owner_id: UUID, project_ids: Sequence[UUID]
+) -> Tuple[Dict[Tuple[UUID, Optional[UUID]], List[Tuple[float, int, UUID]]], Dict[UUID, str]]:
+    """
+    Seçili projelerin tüm profil kesimlerini (sistem + ekstra) tek seferde toplar.
+
+    Döner:
+      - groups: {(profile_id, color_id | None): [(cut_length_mm, count, project_id), ...]}
+        Boyalı kesimler projenin profil rengi ile, boyasızlar color_id=None ile havuzlanır.
+      - project_codes: {project_id: project_kodu}
+
+    cut_count satırda kayıtlı toplam adettir (sipariş/optimizasyon çıktılarıyla aynı).
+    """
+    ids = list(project_ids)
+    projects = (
+        db.query(Project.id, Project.project_kodu, Project.profile_color_id)
+        .filter(
+            Project.id.in_(ids),
+            Project.created_by == owner_id,
+            Project.is_teklif == False,  # noqa: E712
+        )
+        .all()
+    )
+    project_codes = {p.id: p.project_kodu for p in projects}
+    project_colors = {p.id: p.profile_color_id for p in projects}
+    valid_ids = list(project_codes.keys())
+    if not valid_ids:
+        return {}, {}
+
+    sys_rows = (
+        db.query(
+            ProjectSystem.project_id,
+            ProjectSystemProfile.profile_id,
+            ProjectSystemProfile.cut_length_mm,
+            ProjectSystemProfile.cut_count,
+            ProjectSystemProfile.is_painted,
+        )
+        .join(ProjectSystem, ProjectSystem.id == ProjectSystemProfile.project_system_id)
+        .filter(ProjectSystem.project_id.in_(valid_ids))
+        .all()
+    )
+    extra_rows = (
+        db.query(
+            ProjectExtraProfile.project_id,
+            ProjectExtraProfile.profile_id,
+            ProjectExtraProfile.cut_length_mm,
+            ProjectExtraProfile.cut_count,
+            ProjectExtraProfile.is_painted,
+        )
+        .filter(ProjectExtraProfile.project_id.in_(valid_ids))
+        .all()
+    )
+
+    groups: Dict[Tuple[UUID, Optional[UUID]], List[Tuple[float, int, UUID]]] = defaultdict(list)
+    for project_id, profile_id, length, count, is_painted in list(sys_rows) + list(extra_rows):
+        if not count or length is None:
+            continue
+        color_id = project_colors.get(project_id) if is_painted else None
+        groups[(profile_id, color_id)].append((float(length), int(count), project_id))
+
+    return groups, project_codes
+
+
+def optimize_profile_cutting(
+    db: Session,
+    *,
+    owner_id: UUID,
+    project_ids: Sequence[UUID],
+    time_budget_s: float = 20.0,
+    kerf_mm: Optional[float] = None,
+    stock_length_mm: Optional[float] = None,
+) -> dict:
+    """
+    Seçili onaylı projeleri (profil, renk) bazında havuzlayıp birlikte keser.
+    Zaman bütçesi gruplara parça sayısıyla orantılı paylaştırılır.
+    """
+    started = time.monotonic()
+    deadline = started + max(float(time_budget_s), 0.0)
+
+    if kerf_mm is None:
+        helper, _, _ = calc_crud.resolve_for_owner(db, owner_id)
+        kerf_mm = float(helper.bicak_payi) if helper and helper.bicak_payi is not None else 0.0
+
+    groups, project_codes = collect_profile_cuts(db, owner_id, project_ids)
+
+    profile_ids = {pid for (pid, _) in groups.keys()}
+    color_ids = {cid for (_, cid) in groups.keys() if cid is not None}
+    profiles = {
+        p.id: p for p in db.query(Profile).filter(Profile.id.in_(profile_ids)).all()
+    } if profile_ids else {}
+    colors = {
+        c.id: c.name for c in db.query(Color.id, Color.name).filter(Color.id.in_(color_ids)).all()
+    } if color_ids else {}
+
+    remaining_pieces = sum(cnt for rows in groups.values() for (_, cnt, _) in rows)
+    out_groups = []
+    total_bars = 0
+    total_cut = 0.0
+    total_stock = 0.0
+
+    # Büyük gruplar önce: bütçenin büyük kısmını onlar kullansın
+    ordered = sorted(groups.items(), key=lambda kv: -sum(cnt for _, cnt, _ in kv[1]))
+    for (profile_id, color_id), rows in ordered:
+        prof = profiles.get(profile_id)
+        stock = float(stock_length_mm) if stock_length_mm else _stock_length_mm(prof.boy_uzunluk if prof else 0)
+        group_pieces = sum(cnt for _, cnt, _ in rows)
+
+        now = time.monotonic()
+        share = (deadline - now) * (group_pieces / remaining_pieces) if remaining_pieces else 0.0
+        group_deadline = now + max(share, 0.0)
+        remaining_pieces -= group_pieces
+
+        pieces = [
+            (length, str(project_id))
+            for length, cnt, project_id in rows
+            for _ in range(cnt)
+        ]
+        if stock <= 0:
+            bars, oversize = [], pieces
+        else:
+            bars, oversize = pack_cuts(pieces, stock, kerf_mm, deadline=group_deadline)
+
+        summary = summarize_bars(bars, stock, kerf_mm)
+        for bar in summary["bars"]:
+            for cut in bar["cuts"]:
+                pid = cut.pop("tag")
+                cut["project_id"] = pid
+                cut["project_kodu"] = project_codes.get(UUID(pid))
+
+        oversize_grouped: Dict[Tuple[float, str], int] = defaultdict(int)
+        for length, pid in oversize:
+            oversize_grouped[(length, pid)] += 1
+
+        total_bars += summary["bar_count"]
+        total_cut += summary["total_cut_mm"]
+        total_stock += summary["stock_length_mm"] * summary["bar_count"]
+
+        out_groups.append({
+            "profile_id": str(profile_id),
+            "profil_kodu": prof.profil_kodu if prof else None,
+            "profil_isim": prof.profil_isim if prof else None,
+            "color_id": str(color_id) if color_id else None,
+            "color_name": colors.get(color_id) if color_id else None,
+            "piece_count": group_pieces,
+            **summary,
+            "oversize": [
+                {"length_mm": length, "project_id": pid,
+                 "project_kodu": project_codes.get(UUID(pid)), "count": cnt}
+                for (length, pid), cnt in oversize_grouped.items()
+            ],
+        })
+
+    return {
+        "project_count": len(project_codes),
+        "kerf_mm": float(kerf_mm),
+        "total_bar_count": total_bars,
+        "yield_pct": round(100.0 * total_cut / total_stock, 2) if total_stock else 0.0,
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "groups": out_groups,
+    }
+
+
+def run_profile_cutting_batch(db: Session, batch_id: UUID) -> None:
+    """Arka plan işi: batch'i çalıştırır, sonucu/hata mesajını kaydeder."""
+    batch = get_batch(db, batch_id)
+    if batch is None:
+        return
+
+    batch.status = "running"
+    batch.started_at = datetime.now(timezone.utc)
+    db.commit()
+
+    params = dict(batch.params or {})
+    try:
+        result = optimize_profile_cutting(
+            db,
+            owner_id=batch.owner_id,
+            project_ids=[UUID(pid) for pid in batch.project_ids],
+            time_budget_s=params.get("time_budget_s", 20.0),
+            kerf_mm=params.get("kerf_mm"),
+            stock_length_mm=params.get("stock_length_mm"),
+        )
+        batch.result = result
+        batch.status = "done"
+        batch.error = None
+    except Exception as e:
+        db.rollback()
+        batch = get_batch(db, batch_id)
+        if batch is None:
+            return
+        batch.status = "failed"
+        batch.error = str(e)[:2000]
+
+    batch.finished_at = datetime.now(timezone.utc)
+    db.commit()
+
+
+# ----------------------------------------------------------------
+# Cam levha yerleşimi (senkron; sonuç kaydedilmez)
+# ----------------------------------------------------------------
+def collect_glass_pieces(
+    db: Session, owner_id: UUID, project_ids: Sequence[UUID]
+) -> Tuple[Dict[UUID, List[Tuple[float, float, int, UUID]]], Dict[UUID, str]]:
+    """
+    Seçili projelerin tüm camlarını (sistem + ekstra) cam tipine göre gruplar.
+
+    Döner:
+      - groups: {glass_type_id: [(width_mm, height_mm, count, project_id), ...]}
+      - project_codes: {project_id: project_kodu}
+    """
+    projects = (
+        db.query(Project.id, Project.project_kodu)
+        .filter(Project.id.in_(list(project_ids)), Project.created_by == owner_id)
+        .all()
+    )
+    project_codes = {p.id: p.project_kodu for p in projects}
+    valid_ids = list(project_codes.keys())
+    if not valid_ids:
+        return {}, {}
+
+    sys_rows = (
+        db.query(
+            ProjectSystem.project_id,
+            ProjectSystemGlass.glass_type_id,
+            ProjectSystemGlass.width_mm,
+            ProjectSystemGlass.height_mm,
+            ProjectSystemGlass.count,
+        )
+        .join(ProjectSystem, ProjectSystem.id == ProjectSystemGlass.project_system_id)
+        .filter(ProjectSystem.project_id.in_(valid_ids))
+        .all()
+    )
+    extra_rows = (
+        db.query(
+            ProjectExtraGlass.project_id,
+            ProjectExtraGlass.glass_type_id,
+            ProjectExtraGlass.width_mm,
+            ProjectExtraGlass.height_mm,
+            ProjectExtraGlass.count,
+        )
+        .filter(ProjectExtraGlass.project_id.in_(valid_ids))
+        .all()
+    )
+
+    groups: Dict[UUID, List[Tuple[float, float, int, UUID]]] = defaultdict(list)
+    for project_id, glass_type_id, width, height, count in list(sys_rows) + list(extra_rows):
+        if not count or width is None or height is None:
+            continue
+        groups[glass_type_id].append((float(width), float(height), int(count), project_id))
+
+    return groups, project_codes
+
+
+def optimize_glass_nesting(
+    db: Session,
+    *,
+    owner_id: UUID,
+    project_ids: Sequence[UUID],
+    sheet_width_mm: float,
+    sheet_height_mm: float,
+    sheet_sizes: Optional[Dict[UUID, Tuple[float, float]]] = None,
+    kerf_mm: float = 0.0,
+    allow_rotation: bool = True,
+    time_budget_s: float = 5.0,
+) -> dict:
+    """
+    Cam tipi (kalınlık) bazında tüm parçaları stok levhalara yerleştirir.
+    sheet_sizes: cam tipine özel levha ölçüsü {glass_type_id: (genişlik, yükseklik)}.
+    Zaman bütçesi gruplara parça sayısıyla orantılı paylaştırılır.
+    """
+    started = time.monotonic()
+    deadline = started + max(float(time_budget_s), 0.0)
+    sheet_sizes = sheet_sizes or {}
+
+    groups, project_codes = collect_glass_pieces(db, owner_id, project_ids)
+    types = {
+        t.id: t for t in db.query(GlassType).filter(GlassType.id.in_(list(groups.keys()))).all()
+    } if groups else {}
+
+    remaining_pieces = sum(cnt for rows in groups.values() for (_, _, cnt, _) in rows)
+    out_groups = []
+    total_used = 0.0
+    total_area = 0.0
+    total_sheets = 0
+
+    ordered = sorted(groups.items(), key=lambda kv: -sum(cnt for _, _, cnt, _ in kv[1]))
+    for glass_type_id, rows in ordered:
+        gt = types.get(glass_type_id)
+        sw, sh = sheet_sizes.get(glass_type_id, (sheet_width_mm, sheet_height_mm))
+        group_pieces = sum(cnt for _, _, cnt, _ in rows)
+
+        now = time.monotonic()
+        share = (deadline - now) * (group_pieces / remaining_pieces) if remaining_pieces else 0.0
+        remaining_pieces -= group_pieces
+
+        pieces = [
+            (width, height, str(project_id))
+            for width, height, cnt, project_id in rows
+            for _ in range(cnt)
+        ]
+        sheets, oversize = nest_pieces(
+            pieces, sw, sh, kerf_mm,
+            allow_rotation=allow_rotation,
+            deadline=now + max(share, 0.0),
+        )
+        summary = summarize_sheets(sheets, sw, sh)
+        for sheet in summary["sheets"]:
+            for pl in sheet["placements"]:
+                pid = pl.pop("tag")
+                pl["project_id"] = pid
+                pl["project_kodu"] = project_codes.get(UUID(pid))
+
+        oversize_grouped: Dict[Tuple[float, float, str], int] = defaultdict(int)
+        for width, height, pid in oversize:
+            oversize_grouped[(width, height, pid)] += 1
+
+        total_used += summary["used_area_m2"]
+        total_area += summary["total_area_m2"]
+        total_sheets += summary["sheet_count"]
+
+        out_groups.append({
+            "glass_type_id": str(glass_type_id),
+            "cam_isim": gt.cam_isim if gt else None,
+            "thickness_mm": float(gt.thickness_mm) if gt and gt.thickness_mm is not None else None,
+            "piece_count": group_pieces,
+            **summary,
+            "oversize": [
+                {"width_mm": width, "height_mm": height, "project_id": pid,
+                 "project_kodu": project_codes.get(UUID(pid)), "count": cnt}
+                for (width, height, pid), cnt in oversize_grouped.items()
+            ],
+        })
+
+    return {
+        "project_count": len(project_codes),
+        "kerf_mm": float(kerf_mm),
+        "allow_rotation": allow_rotation,
+        "total_sheet_count": total_sheets,
+        "yield_pct": round(100.0 * total_used / total_area, 2) if total_area else 0.0,
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "groups": out_groups,
+    }
@@ -4,7 +4,7 @@ from uuid import uuid4
 from datetime import datetime, date
 from uuid import UUID
 from typing import List, Optional, Tuple, Any
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.system import SystemVariant, System
 from app.models.profile import Profile
@@ -19,6 +19,17 @@ from sqlalchemy.exc import IntegrityError
 from app.models.color import Color
 from app.models.project_code_ledger import ProjectCodeLedger
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import (
+    insert as sa_insert,
+    select as sa_select,
+    values as sa_values,
+    column as sa_column,
+    literal as sa_literal,
+)
+from app.crud import project_revision as revision_crud
+from app.crud import catalog_price as catalog_price_crud
+from app.core.responses import dump
 
 
 from app.models.project import (
@@ -47,16 +58,8 @@ from app.schemas.project import (
     ExtraRequirement,
     ExtraProfileIn,
     ExtraGlassIn,
-    ExtraProfileDetailed,
-    ExtraGlassDetailed,
     ProjectRequirementsDetailedOut,
-    SystemInProjectOut,
-    ProfileInProjectOut,
-    GlassInProjectOut,
-    MaterialInProjectOut,
     ExtraRemoteIn,           # 🆕
-    ExtraRemoteDetailed,     # 🆕
-    RemoteInProjectOut,
 )
 
 # ------------------------------------------------------------
@@ -229,6 +232,137 @@ def create_project(db: Session, payload: ProjectCreate, created_by: UUID) -> Pro
 
 
 
+def clone_project(
+    db: Session,
+    project_id: UUID,
+    created_by: UUID,
+    project_name: Optional[str] = None,
+    is_teklif: bool = True,
+    _retry: bool = True,
+) -> Optional[Project]:
+    """
+    Projeyi (sistemler + 4 alt tablo + 4 ekstra tablo) veritabanı içinde kopyalar.
+    Satırlar Python'a çekilmez: her tablo için tek INSERT ... SELECT, yeni id'ler
+    gen_random_uuid() ile üretilir. Sadece sistem id eşlemesi (eski → yeni) VALUES
+    listesi olarak gönderilir. Yeni proje kodu ledger üzerinden alınır.
+    """
+    src = (
+        db.query(Project)
+          .filter(Project.id == project_id, Project.created_by == created_by)
+          .first()
+    )
+    if not src:
+        return None
+
+    get_or_create_default_rule(db, created_by)
+    next_n, code = issue_next_code_in_tx(db, created_by)
+
+    today = datetime.utcnow()
+    project = Project(
+        id=uuid4(),
+        customer_id=src.customer_id,
+        project_name=project_name or src.project_name,
+        created_by=created_by,
+        project_kodu=code,
+        created_at=today,
+        press_price=src.press_price,
+        painted_price=src.painted_price,
+        is_teklif=bool(is_teklif),
+        paint_status="durum belirtilmedi",
+        glass_status="durum belirtilmedi",
+        production_status="durum belirtilmedi",
+        approval_date=(today if is_teklif is False else None),
+        profile_color_id=src.profile_color_id,
+        glass_color_id=src.glass_color_id,
+    )
+    db.add(project)
+    db.flush()
+
+    db.execute(
+        pg_insert(ProjectCodeLedger).values(
+            owner_id=created_by,
+            number=next_n,
+            project_id=project.id,
+            project_kodu=code,
+        ).on_conflict_do_update(
+            index_elements=[ProjectCodeLedger.owner_id, ProjectCodeLedger.number],
+            set_={"project_id": project.id, "project_kodu": code},
+        )
+    )
+
+    # Sistem id eşlemesi: alt tabloların project_system_id'si bununla yeni sisteme bağlanır
+    old_sys_ids = [
+        sid for (sid,) in db.query(ProjectSystem.id).filter(ProjectSystem.project_id == project_id).all()
+    ]
+    if old_sys_ids:
+        id_map = sa_values(
+            sa_column("old_id", PGUUID(as_uuid=True)),
+            sa_column("new_id", PGUUID(as_uuid=True)),
+            name="id_map",
+        ).data([(old_id, uuid4()) for old_id in old_sys_ids])
+
+        ps_table = ProjectSystem.__table__
+        ps_cols = [c.name for c in revision_crud.data_columns(ps_table)]
+        db.execute(
+            sa_insert(ps_table).from_select(
+                ["id", "project_id"] + ps_cols,
+                sa_select(
+                    id_map.c.new_id,
+                    sa_literal(project.id, PGUUID(as_uuid=True)),
+                    *[ps_table.c[name] for name in ps_cols],
+                )
+                .select_from(ps_table.join(id_map, ps_table.c.id == id_map.c.old_id))
+                .order_by(ps_table.c.save_seq),
+            )
+        )
+
+        for table in revision_crud.SYSTEM_CHILDREN.values():
+            cols = [c.name for c in revision_crud.data_columns(table)]
+            db.execute(
+                sa_insert(table).from_select(
+                    ["id", "project_system_id"] + cols,
+                    sa_select(
+                        func.gen_random_uuid(),
+                        id_map.c.new_id,
+                        *[table.c[name] for name in cols],
+                    )
+                    .select_from(table.join(id_map, table.c.project_system_id == id_map.c.old_id))
+                    .order_by(table.c.save_seq),
+                )
+            )
+
+    for table in revision_crud.PROJECT_EXTRAS.values():
+        cols = [c.name for c in revision_crud.data_columns(table)]
+        db.execute(
+            sa_insert(table).from_select(
+                ["id", "project_id"] + cols,
+                sa_select(
+                    func.gen_random_uuid(),
+                    sa_literal(project.id, PGUUID(as_uuid=True)),
+                    *[table.c[name] for name in cols],
+                )
+                .where(table.c.project_id == project_id)
+                .order_by(table.c.save_seq),
+            )
+        )
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # Kod çakışması: tüm kopyayı yeni kodla bir kez daha dene
+        db.rollback()
+        if not _retry:
+            raise
+        return clone_project(
+            db, project_id, created_by,
+            project_name=project_name, is_teklif=is_teklif, _retry=False,
+        )
+
+    db.refresh(project)
+    return project
+
+
+
 
 def get_projects(
     db: Session,
@@ -668,19 +802,40 @@ def update_project_code(db: Session, project_id: UUID, new_code: str) -> Optiona
 # Gereksinimler (sistem + ekstra)
 # ------------------------------------------------------------
 
+def _resolve_snapshot_prices(db: Session, materials, remotes):
+    """
+    unit_price'ı payload'da gelmeyen malzeme/kumandalar için güncel (tarih etkili) katalog fiyatları.
+    Döner: ({material_id: fiyat}, {remote_id: fiyat})
+    """
+    return catalog_price_crud.resolve_catalog_prices(
+        db,
+        material_ids=[m.material_id for m in materials if getattr(m, "unit_price", None) is None],
+        remote_ids=[r.remote_id for r in remotes if getattr(r, "unit_price", None) is None],
+    )
+
+
 def add_systems_to_project(
     db: Session,
     project_id: UUID,
-    payload: ProjectSystemsUpdate
+    payload: ProjectSystemsUpdate,
+    commit: bool = True,
 ) -> Project:
     """
     Projeye sistemleri ve ekstra malzemeleri ekler.
     NOT: Extra requirements artık sistem döngüsünün DIŞINDA ekleniyor (bug fix).
+    commit=False → sadece flush (revizyon aynı transaction'da yazılsın diye).
     """
     project = db.query(Project).filter(Project.id == project_id).first()
     if not project:
         raise ValueError("Project not found")
 
+    # 💲 Fiyatı girilmemiş kalemlerin katalog fiyatları: tek sorguda, fiyat geçmişinden
+    mat_prices, remote_prices = _resolve_snapshot_prices(
+        db,
+        materials=[m for sys_req in payload.systems for m in sys_req.materials] + list(payload.extra_requirements),
+        remotes=[r for sys_req in payload.systems for r in (getattr(sys_req, "remotes", []) or [])],
+    )
+
     # --- Sistemler
     for sys_req in payload.systems:
         ps = ProjectSystem(
@@ -779,8 +934,7 @@ def add_systems_to_project(
                 if tpl is not None and tpl.unit_price is not None:
                     unit_price = float(tpl.unit_price)
                 else:
-                    mat = db.query(OtherMaterial).filter(OtherMaterial.id == m.material_id).first()
-                    unit_price = float(mat.unit_price) if mat and mat.unit_price is not None else None
+                    unit_price = mat_prices.get(m.material_id)
 
             obj = ProjectSystemMaterial(
                 id=uuid4(),
@@ -808,8 +962,7 @@ def add_systems_to_project(
             # unit_price girilmemişse katalogdaki fiyattan snapshot al
             unit_price = r.unit_price
             if unit_price is None:
-                rem = db.query(Remote).filter(Remote.id == r.remote_id).first()
-                unit_price = float(rem.price) if rem and rem.price is not None else None
+                unit_price = remote_prices.get(r.remote_id)
 
             obj = ProjectSystemRemote(
                 id=uuid4(),
@@ -827,8 +980,7 @@ def add_systems_to_project(
         # 💲 payload.unit_price → katalog fallback
         unit_price = getattr(extra, "unit_price", None)
         if unit_price is None:
-            mat = db.query(OtherMaterial).filter(OtherMaterial.id == extra.material_id).first()
-            unit_price = float(mat.unit_price) if mat and mat.unit_price is not None else None
+            unit_price = mat_prices.get(extra.material_id)
 
         obj = ProjectExtraMaterial(
             id=uuid4(),
@@ -841,6 +993,9 @@ def add_systems_to_project(
         _apply_pdf(obj, getattr(extra, "pdf", None))
         db.add(obj)
 
+    if not commit:
+        db.flush()
+        return project
     db.commit()
     db.refresh(project)
     return project
@@ -850,7 +1005,8 @@ def add_systems_to_project(
 def update_systems_for_project(
     db: Session,
     project_id: UUID,
-    payload: ProjectSystemsUpdate
+    payload: ProjectSystemsUpdate,
+    commit: bool = True,
 ) -> Optional[Project]:
     # mevcut tüm içerikleri sil
     db.query(ProjectSystemProfile).join(ProjectSystem).filter(ProjectSystem.project_id == project_id).delete(synchronize_session=False)
@@ -859,9 +1015,9 @@ def update_systems_for_project(
     db.query(ProjectSystemRemote).join(ProjectSystem).filter(ProjectSystem.project_id == project_id).delete(synchronize_session=False)  # 🆕
     db.query(ProjectSystem).filter(ProjectSystem.project_id == project_id).delete(synchronize_session=False)
     db.query(ProjectExtraMaterial).filter(ProjectExtraMaterial.project_id == project_id).delete(synchronize_session=False)
-    db.commit()
 
-    return add_systems_to_project(db, project_id, payload)
+    # Silme ve yeniden yazma tek transaction: arada hata olursa eski içerik kalır
+    return add_systems_to_project(db, project_id, payload, commit=commit)
 
 
 def get_project_requirements(
@@ -890,6 +1046,13 @@ def add_only_systems_to_project(
     if not project:
         raise ValueError("Project not found")
 
+    # 💲 Fiyatı girilmemiş kalemlerin katalog fiyatları: tek sorguda, fiyat geçmişinden
+    mat_prices, remote_prices = _resolve_snapshot_prices(
+        db,
+        materials=[m for sys_req in systems for m in sys_req.materials],
+        remotes=[r for sys_req in systems for r in (getattr(sys_req, "remotes", []) or [])],
+    )
+
     for sys_req in systems:
         ps = ProjectSystem(
             id=uuid4(),
@@ -973,8 +1136,7 @@ def add_only_systems_to_project(
                 if tpl is not None and tpl.unit_price is not None:
                     unit_price = float(tpl.unit_price)
                 else:
-                    mat = db.query(OtherMaterial).filter(OtherMaterial.id == m.material_id).first()
-                    unit_price = float(mat.unit_price) if mat and mat.unit_price is not None else None
+                    unit_price = mat_prices.get(m.material_id)
 
             obj = ProjectSystemMaterial(
                 id=uuid4(),
@@ -1001,8 +1163,7 @@ def add_only_systems_to_project(
         for r in getattr(sys_req, "remotes", []) or []:
             unit_price = r.unit_price
             if unit_price is None:
-                rem = db.query(Remote).filter(Remote.id == r.remote_id).first()
-                unit_price = float(rem.price) if rem and rem.price is not None else None
+                unit_price = remote_prices.get(r.remote_id)
 
             obj = ProjectSystemRemote(
                 id=uuid4(),
@@ -1032,12 +1193,14 @@ def add_only_extras_to_project(
     if not project:
         raise ValueError("Project not found")
 
+    # 💲 Fiyatı girilmemiş kalemlerin katalog fiyatları: tek sorguda, fiyat geçmişinden
+    mat_prices, remote_prices = _resolve_snapshot_prices(db, materials=extras, remotes=extra_remotes or [])
+
     # --- Extra Materials ---
     for extra in extras:
         unit_price = getattr(extra, "unit_price", None)
         if unit_price is None:
-            mat = db.query(OtherMaterial).filter(OtherMaterial.id == extra.material_id).first()
-            unit_price = float(mat.unit_price) if mat and mat.unit_price is not None else None
+            unit_price = mat_prices.get(extra.material_id)
 
         obj = ProjectExtraMaterial(
             id=uuid4(),
@@ -1091,8 +1254,7 @@ def add_only_extras_to_project(
     for r in (extra_remotes or []):
         unit_price = getattr(r, "unit_price", None)
         if unit_price is None:
-            rem = db.query(Remote).filter(Remote.id == r.remote_id).first()
-            unit_price = float(rem.price) if rem and rem.price is not None else None
+            unit_price = remote_prices.get(r.remote_id)
 
 
         obj = ProjectExtraRemote(
@@ -1113,255 +1275,215 @@ def add_only_extras_to_project(
 
 
 
-def get_project_requirements_detailed(
-    db: Session,
-    project_id: UUID
-) -> ProjectRequirementsDetailedOut:
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
-        raise ValueError("Project not found")
-
-    customer = db.query(Customer).filter(Customer.id == project.customer_id).first()
-    project_systems = (
-        db.query(ProjectSystem)
-        .options(
-            selectinload(ProjectSystem.glasses).selectinload(ProjectSystemGlass.glass_type),  # 👈 GlassType hazır gelsin
-            selectinload(ProjectSystem.profiles),
-            selectinload(ProjectSystem.materials),
-            selectinload(ProjectSystem.remotes),
-        )
-        .filter(ProjectSystem.project_id == project_id)
-        .all()
-    )
-
-    result_systems = []
-    for ps in project_systems:
-        variant = db.query(SystemVariant).filter(SystemVariant.id == ps.system_variant_id).first()
-        system = db.query(System).filter(System.id == variant.system_id).first()
+def _rows_by_id(db: Session, model, ids) -> dict:
+    """id kümesindeki satırları tek sorguda yükler → {id: satır}."""
+    ids = {i for i in ids if i is not None}
+    if not ids:
+        return {}
+    return {row.id: row for row in db.query(model).filter(model.id.in_(ids)).all()}
 
-        profiles_raw = (
-            db.query(ProjectSystemProfile)
-            .filter(ProjectSystemProfile.project_system_id == ps.id)
-            .all()
-        )
-        profiles = [
-            ProfileInProjectOut(
-                profile_id=p.profile_id,
-                cut_length_mm=p.cut_length_mm,
-                cut_count=p.cut_count,
-                total_weight_kg=p.total_weight_kg,
-                order_index=p.order_index,
-                is_painted=bool(getattr(p, "is_painted", False)),
-                profile=db.query(Profile).filter(Profile.id == p.profile_id).first(),
-                pdf=_pdf_from_obj(p),
-            )
-            for p in profiles_raw
-        ]
 
-        glasses_raw = (
-            db.query(ProjectSystemGlass)
-            .filter(ProjectSystemGlass.project_system_id == ps.id)
-            .all()
-        )
+def _rows_by_system(db: Session, model, project_system_ids: List[UUID]) -> dict:
+    """Sistem alt satırlarını tek sorguda yükler → {project_system_id: [satır, ...]}."""
+    grouped: dict = {}
+    if not project_system_ids:
+        return grouped
+    for row in db.query(model).filter(model.project_system_id.in_(project_system_ids)).all():
+        grouped.setdefault(row.project_system_id, []).append(row)
+    return grouped
 
-        glasses = []
-        for g in glasses_raw:
-            color_obj_1 = db.query(Color).filter(Color.id == g.glass_color_id_1).first() if getattr(g, "glass_color_id_1", None) else None
-            color_obj_2 = db.query(Color).filter(Color.id == g.glass_color_id_2).first() if getattr(g, "glass_color_id_2", None) else None
-            glass_type_obj = db.query(GlassType).filter(GlassType.id == g.glass_type_id).first()
-
-            # unit_price sütunu opsiyonel; yoksa None döner (modelde ekledik)
-            unit_price = float(g.unit_price) if getattr(g, "unit_price", None) is not None else None
-
-            # area_m2 yoksa mm’den m² hesapla
-            area_m2_val = float(g.area_m2) if g.area_m2 is not None else None
-
-            glasses.append(
-                GlassInProjectOut(
-                    id=g.id,
-                    glass_type_id=g.glass_type_id,
-                    width_mm=float(g.width_mm),
-                    height_mm=float(g.height_mm),
-                    count=g.count,
-                    area_m2=area_m2_val,
-                    order_index=g.order_index,
-                    glass_type=glass_type_obj,
-
-                    # 🔁 Çift cam rengi (id + metin + obje)
-                    glass_color_id_1=getattr(g, "glass_color_id_1", None),
-                    glass_color_1=getattr(g, "glass_color_text_1", None),
-                    glass_color_obj_1=color_obj_1,
-
-                    glass_color_id_2=getattr(g, "glass_color_id_2", None),
-                    glass_color_2=getattr(g, "glass_color_text_2", None),
-                    glass_color_obj_2=color_obj_2,
-
-                    # 🔎 GlassType üzerinden gelen read-only belirteçler
-                    belirtec_1_value=getattr(g, "belirtec_1_value", None),
-                    belirtec_2_value=getattr(g, "belirtec_2_value", None),
-
-                    pdf=_pdf_from_obj(g),
-                    # Not: Şemanın desteklemesi halinde unit_price alanını da ekleyebilirsin
-                    # unit_price=unit_price,
-                )
-            )
 
+def _float_or_none(value) -> Optional[float]:
+    return float(value) if value is not None else None
 
 
-        materials_raw = (
-            db.query(ProjectSystemMaterial)
-            .filter(ProjectSystemMaterial.project_system_id == ps.id)
-            .all()
-        )
-        materials = [
-            MaterialInProjectOut(
-                material_id=m.material_id,
-                cut_length_mm=m.cut_length_mm,
-                count=m.count,
-                unit_price=float(m.unit_price) if m.unit_price is not None else None,
-                type=m.type,
-                piece_length_mm=m.piece_length_mm,
-                order_index=m.order_index,
-                material=db.query(OtherMaterial).filter(OtherMaterial.id == m.material_id).first(),
-                pdf=_pdf_from_obj(m),
-            )
-            for m in materials_raw
-        ]
+def get_project_requirements_detailed_data(db: Session, project_id: UUID) -> dict:
+    """
+    ProjectRequirementsDetailedOut'un JSON'a hazır dict karşılığı.
+    Satır başına sorgu yerine tablo başına tek sorgu atılır (katalog objeleri id kümesiyle
+    toplu yüklenir); sonuç pydantic nesnesi kurulmadan responses.dump ile düzleştirilir.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        raise ValueError("Project not found")
 
-        remotes_raw = (
-            db.query(ProjectSystemRemote)
-            .filter(ProjectSystemRemote.project_system_id == ps.id)
-            .all()
-        )
-        remotes = []
-        for r in remotes_raw:
-            remote_obj = db.query(Remote).filter(Remote.id == r.remote_id).first()
-            remotes.append(
-                RemoteInProjectOut(
-                    remote_id=r.remote_id,
-                    count=r.count,
-                    order_index=r.order_index,
-                    unit_price=float(r.unit_price) if r.unit_price is not None else None,
-                    remote=remote_obj,
-                    pdf=_pdf_from_obj(r),
-                )
-            )
+    customer = db.query(Customer).filter(Customer.id == project.customer_id).first()
+    project_systems = db.query(ProjectSystem).filter(ProjectSystem.project_id == project_id).all()
+    ps_ids = [ps.id for ps in project_systems]
+
+    profiles_by_ps = _rows_by_system(db, ProjectSystemProfile, ps_ids)
+    glasses_by_ps = _rows_by_system(db, ProjectSystemGlass, ps_ids)
+    materials_by_ps = _rows_by_system(db, ProjectSystemMaterial, ps_ids)
+    remotes_by_ps = _rows_by_system(db, ProjectSystemRemote, ps_ids)
+
+    extra_materials = db.query(ProjectExtraMaterial).filter(ProjectExtraMaterial.project_id == project_id).all()
+    extra_profiles = db.query(ProjectExtraProfile).filter(ProjectExtraProfile.project_id == project_id).all()
+    extra_glasses = db.query(ProjectExtraGlass).filter(ProjectExtraGlass.project_id == project_id).all()
+    extra_remotes = db.query(ProjectExtraRemote).filter(ProjectExtraRemote.project_id == project_id).all()
+
+    all_profiles = [p for rows in profiles_by_ps.values() for p in rows] + extra_profiles
+    all_glasses = [g for rows in glasses_by_ps.values() for g in rows] + extra_glasses
+    all_materials = [m for rows in materials_by_ps.values() for m in rows] + extra_materials
+    all_remotes = [r for rows in remotes_by_ps.values() for r in rows] + extra_remotes
+
+    variants = _rows_by_id(db, SystemVariant, (ps.system_variant_id for ps in project_systems))
+    systems = _rows_by_id(db, System, (v.system_id for v in variants.values()))
+    profiles = _rows_by_id(db, Profile, (p.profile_id for p in all_profiles))
+    glass_types = _rows_by_id(db, GlassType, (g.glass_type_id for g in all_glasses))
+    materials = _rows_by_id(db, OtherMaterial, (m.material_id for m in all_materials))
+    remotes = _rows_by_id(db, Remote, (r.remote_id for r in all_remotes))
+    colors = _rows_by_id(
+        db, Color,
+        [g.glass_color_id_1 for g in all_glasses] + [g.glass_color_id_2 for g in all_glasses],
+    )
 
-        result_systems.append(
-            SystemInProjectOut(
-                project_system_id=ps.id,
-                system_variant_id=ps.system_variant_id,
-                name=variant.name,
-                system=system,
-                width_mm=ps.width_mm,
-                height_mm=ps.height_mm,
-                quantity=ps.quantity,
-                profiles=profiles,
-                glasses=glasses,
-                materials=materials,
-                remotes=remotes,
-            )
-        )
+    def glass_common(g) -> dict:
+        gt = glass_types.get(g.glass_type_id)
+        return {
+            "glass_type_id": g.glass_type_id,
+            "width_mm": float(g.width_mm),
+            "height_mm": float(g.height_mm),
+            "count": g.count,
+            "glass_type": gt,
+
+            # 🔁 Çift cam rengi (id + metin + obje)
+            "glass_color_id_1": g.glass_color_id_1,
+            "glass_color_1": g.glass_color_text_1,
+            "glass_color_obj_1": colors.get(g.glass_color_id_1),
+            "glass_color_id_2": g.glass_color_id_2,
+            "glass_color_2": g.glass_color_text_2,
+            "glass_color_obj_2": colors.get(g.glass_color_id_2),
+
+            # 🔎 GlassType üzerinden gelen read-only belirteçler
+            # (hybrid property her satırda glass_type'ı ayrıca yüklerdi)
+            "belirtec_1_value": gt.belirtec_1 if gt else None,
+            "belirtec_2_value": gt.belirtec_2 if gt else None,
+            "pdf": _pdf_from_obj(g),
+        }
 
-    # --- EXTRA'lar ---
-    # Extra Material (DETAY + id)
-    extra_materials_out = []
-    for e in db.query(ProjectExtraMaterial).filter(ProjectExtraMaterial.project_id == project_id).all():
-        mat = db.query(OtherMaterial).filter(OtherMaterial.id == e.material_id).first()
-        extra_materials_out.append({
-            "id": e.id,  # 🔴 id eklendi
-            "material_id": e.material_id,
-            "count": e.count,
-            "cut_length_mm": e.cut_length_mm,
-            "unit_price": float(e.unit_price) if e.unit_price is not None else None,
-            "material": mat,
-            "pdf": _pdf_from_obj(e),
+    result_systems = []
+    for ps in project_systems:
+        variant = variants[ps.system_variant_id]
+        result_systems.append({
+            "project_system_id": ps.id,
+            "system_variant_id": ps.system_variant_id,
+            "name": variant.name,
+            "system": systems.get(variant.system_id),
+            "width_mm": ps.width_mm,
+            "height_mm": ps.height_mm,
+            "quantity": ps.quantity,
+            "profiles": [
+                {
+                    "profile_id": p.profile_id,
+                    "cut_length_mm": p.cut_length_mm,
+                    "cut_count": p.cut_count,
+                    "total_weight_kg": p.total_weight_kg,
+                    "order_index": p.order_index,
+                    "is_painted": bool(getattr(p, "is_painted", False)),
+                    "profile": profiles.get(p.profile_id),
+                    "pdf": _pdf_from_obj(p),
+                }
+                for p in profiles_by_ps.get(ps.id, [])
+            ],
+            "glasses": [
+                {
+                    "id": g.id,
+                    "area_m2": _float_or_none(g.area_m2),
+                    "order_index": g.order_index,
+                    **glass_common(g),
+                }
+                for g in glasses_by_ps.get(ps.id, [])
+            ],
+            "materials": [
+                {
+                    "material_id": m.material_id,
+                    "cut_length_mm": m.cut_length_mm,
+                    "count": m.count,
+                    "unit_price": _float_or_none(m.unit_price),
+                    "type": m.type,
+                    "piece_length_mm": m.piece_length_mm,
+                    "order_index": m.order_index,
+                    "material": materials.get(m.material_id),
+                    "pdf": _pdf_from_obj(m),
+                }
+                for m in materials_by_ps.get(ps.id, [])
+            ],
+            "remotes": [
+                {
+                    "remote_id": r.remote_id,
+                    "count": r.count,
+                    "order_index": r.order_index,
+                    "unit_price": _float_or_none(r.unit_price),
+                    "remote": remotes.get(r.remote_id),
+                    "pdf": _pdf_from_obj(r),
+                }
+                for r in remotes_by_ps.get(ps.id, [])
+            ],
         })
 
-    # Extra Profile (DETAY + id)
-    extra_profiles = []
-    for p in db.query(ProjectExtraProfile).filter(ProjectExtraProfile.project_id == project_id).all():
-        prof = db.query(Profile).filter(Profile.id == p.profile_id).first()
-        extra_profiles.append(
-            ExtraProfileDetailed(
-                id=p.id,  # 🔴 id eklendi
-                profile_id=p.profile_id,
-                cut_length_mm=float(p.cut_length_mm),
-                cut_count=p.cut_count,
-                is_painted=bool(getattr(p, "is_painted", False)),
-                unit_price=float(p.unit_price) if p.unit_price is not None else None,
-                profile=prof,
-                pdf=_pdf_from_obj(p),
-            )
-        )
-
-    # Extra Glass (DETAY + id)
-    extra_glasses = []
-    for g in db.query(ProjectExtraGlass).filter(ProjectExtraGlass.project_id == project_id).all():
-        gt = db.query(GlassType).filter(GlassType.id == g.glass_type_id).first()
-        color_obj_1 = db.query(Color).filter(Color.id == g.glass_color_id_1).first() if getattr(g, "glass_color_id_1", None) else None
-        color_obj_2 = db.query(Color).filter(Color.id == g.glass_color_id_2).first() if getattr(g, "glass_color_id_2", None) else None
-
-        extra_glasses.append(
-            ExtraGlassDetailed(
-                id=g.id,
-                project_extra_glass_id=g.id,
-                glass_type_id=g.glass_type_id,
-                width_mm=float(g.width_mm),
-                height_mm=float(g.height_mm),
-                count=g.count,
-                unit_price=float(g.unit_price) if g.unit_price is not None else None,
-                glass_type=gt,
-
-                # 🔁 Çift cam rengi
-                glass_color_id_1=getattr(g, "glass_color_id_1", None),
-                glass_color_1=getattr(g, "glass_color_text_1", None),
-                glass_color_obj_1=color_obj_1,
-
-                glass_color_id_2=getattr(g, "glass_color_id_2", None),
-                glass_color_2=getattr(g, "glass_color_text_2", None),
-                glass_color_obj_2=color_obj_2,
-
-                # 🔎 GlassType üzerinden gelen read-only belirteçler
-                belirtec_1_value=getattr(g, "belirtec_1_value", None),
-                belirtec_2_value=getattr(g, "belirtec_2_value", None),
-
-                pdf=_pdf_from_obj(g),
-            )
-        )
-
-
+    data = {
+        "id": project.id,
+        "customer": customer,
+        "profile_color": project.profile_color,
+        "glass_color": project.glass_color,
+        "press_price": _float_or_none(project.press_price),
+        "painted_price": _float_or_none(project.painted_price),
+        "systems": result_systems,
+        # --- EXTRA'lar (DETAY + id) ---
+        "extra_requirements": [
+            {
+                "id": e.id,
+                "material_id": e.material_id,
+                "count": e.count,
+                "cut_length_mm": e.cut_length_mm,
+                "unit_price": _float_or_none(e.unit_price),
+                "material": materials.get(e.material_id),
+                "pdf": _pdf_from_obj(e),
+            }
+            for e in extra_materials
+        ],
+        "extra_profiles": [
+            {
+                "id": p.id,
+                "profile_id": p.profile_id,
+                "cut_length_mm": float(p.cut_length_mm),
+                "cut_count": p.cut_count,
+                "is_painted": bool(getattr(p, "is_painted", False)),
+                "unit_price": _float_or_none(p.unit_price),
+                "profile": profiles.get(p.profile_id),
+                "pdf": _pdf_from_obj(p),
+            }
+            for p in extra_profiles
+        ],
+        "extra_glasses": [
+            {
+                "id": g.id,
+                "project_extra_glass_id": g.id,
+                "unit_price": _float_or_none(g.unit_price),
+                **glass_common(g),
+            }
+            for g in extra_glasses
+        ],
+        "extra_remotes": [
+            {
+                "id": r.id,
+                "remote_id": r.remote_id,
+                "count": r.count,
+                "unit_price": _float_or_none(r.unit_price),
+                "remote": remotes.get(r.remote_id),
+                "pdf": _pdf_from_obj(r),
+            }
+            for r in extra_remotes
+        ],
+    }
+    return dump(ProjectRequirementsDetailedOut, data)
 
-    # Extra Remote (DETAY + id)
-    extra_remotes = []
-    for r in db.query(ProjectExtraRemote).filter(ProjectExtraRemote.project_id == project_id).all():
-        remote_obj = db.query(Remote).filter(Remote.id == r.remote_id).first()
-        extra_remotes.append(
-            ExtraRemoteDetailed(
-                id=r.id,  # 🔴 id eklendi
-                remote_id=r.remote_id,
-                count=r.count,
-                unit_price=float(r.unit_price) if r.unit_price is not None else None,
-                remote=remote_obj,
-                pdf=_pdf_from_obj(r),
-            )
-        )
 
-    return ProjectRequirementsDetailedOut(
-        id=project.id,
-        customer=customer,
-        profile_color=project.profile_color,
-        glass_color=project.glass_color,
-        press_price=float(project.press_price) if project.press_price is not None else None,
-        painted_price=float(project.painted_price) if project.painted_price is not None else None,
-        systems=result_systems,
-        # ⬇️ Şemanız ExtraMaterialDetailed bekliyorsa cast etmek yerine dict döndürdük;
-        # Pydantic modeliniz id + material alanlarını içeriyorsa birebir uyuşacak.
-        extra_requirements=extra_materials_out,
-        extra_profiles=extra_profiles,
-        extra_glasses=extra_glasses,
-        extra_remotes=extra_remotes,
-    )
+def get_project_requirements_detailed(
+    db: Session,
+    project_id: UUID
+) -> ProjectRequirementsDetailedOut:
+    return ProjectRequirementsDetailedOut.parse_obj(get_project_requirements_detailed_data(db, project_id))
 
 
 
@@ -2078,6 +2200,11 @@ def update_project_system(
 
 
 
+    # 💲 Fiyatı girilmemiş kalemlerin katalog fiyatları: tek sorguda, fiyat geçmişinden
+    mat_prices, remote_prices = _resolve_snapshot_prices(
+        db, materials=payload.materials, remotes=getattr(payload, "remotes", []) or []
+    )
+
     for m in payload.materials:
         tpl = tpl_materials.get(m.material_id)
         typ = m.type if m.type is not None else (tpl.type if tpl else None)
@@ -2089,8 +2216,7 @@ def update_project_system(
             if tpl is not None and tpl.unit_price is not None:
                 unit_price = float(tpl.unit_price)
             else:
-                mat = db.query(OtherMaterial).filter(OtherMaterial.id == m.material_id).first()
-                unit_price = float(mat.unit_price) if mat and mat.unit_price is not None else None
+                unit_price = mat_prices.get(m.material_id)
 
         obj = ProjectSystemMaterial(
             id=uuid4(),
@@ -2110,8 +2236,7 @@ def update_project_system(
     for r in getattr(payload, "remotes", []) or []:
         unit_price = r.unit_price
         if unit_price is None:
-            rem = db.query(Remote).filter(Remote.id == r.remote_id).first()
-            unit_price = float(rem.price) if rem and rem.price is not None else None
+            unit_price = remote_prices.get(r.remote_id)
 
         obj = ProjectSystemRemote(
             id=uuid4(),
@@ -0,0 +1,411 @@
+# app/crud/project_revision.py
+"""
+Proje revizyonları: her requirements kaydında sistem + ekstra içeriğin sıkıştırılmış snapshot'ı.
+
+- Snapshot, ORM ilişkileri yüklenmeden tablo başına tek SELECT ile (Core) alınır.
+- Saklama: her KEYFRAME_EVERY revizyonda bir tam snapshot, arada sadece bir önceki
+  revizyona göre liste farkı (delta). İkisi de zlib ile sıkıştırılmış JSON'dur.
+- Okuma: en yakın tam snapshot'tan hedefe kadar olan blob'lar tek sorguda çekilip çözülür.
+- Listeler kayıt sırasındadır (v2); geri yükleme aynı sırayla yazar.
+"""
+import json
+import uuid
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.project import (
+    Project,
+    ProjectSystem,
+    ProjectSystemProfile,
+    ProjectSystemGlass,
+    ProjectSystemMaterial,
+    ProjectSystemRemote,
+    ProjectExtraProfile,
+    ProjectExtraGlass,
+    ProjectExtraMaterial,
+    ProjectExtraRemote,
+)
+from app.models.project_revision import ProjectRevision
+
+SNAPSHOT_VERSION = 2  # v1: listeler içerik sırasına göre sıralıydı (kayıt sırası korunmazdı)
+KEYFRAME_EVERY = 10  # bu kadar revizyonda bir tam snapshot
+
+# snapshot anahtarı → sistem alt tablosu
+SYSTEM_CHILDREN = {
+    "profiles": ProjectSystemProfile.__table__,
+    "glasses": ProjectSystemGlass.__table__,
+    "materials": ProjectSystemMaterial.__table__,
+    "remotes": ProjectSystemRemote.__table__,
+}
+# snapshot anahtarı → proje ekstra tablosu
+PROJECT_EXTRAS = {
+    "extra_profiles": ProjectExtraProfile.__table__,
+    "extra_glasses": ProjectExtraGlass.__table__,
+    "extra_materials": ProjectExtraMaterial.__table__,
+    "extra_remotes": ProjectExtraRemote.__table__,
+}
+# Snapshot'a girmeyen (her kayıtta yeniden üretilen) kolonlar
+_SKIP_COLUMNS = {"id", "project_id", "project_system_id", "created_at", "updated_at", "save_seq"}
+
+
+class RevisionRestoreError(Exception):
+    """Revizyondaki bir kalem (varyant, katalog öğesi, renk...) artık yok → geri yüklenemez."""
+
+
+# ----------------------------------------------------------------
+# Kolon değerleri ↔ JSON
+# ----------------------------------------------------------------
+def data_columns(table) -> list:
+    return [c for c in table.columns if c.name not in _SKIP_COLUMNS]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        py_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if py_type is uuid.UUID:
+        return UUID(value)
+    if py_type is Decimal:
+        return Decimal(value)
+    if py_type is datetime:
+        return datetime.fromisoformat(value)
+    if py_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def _row_dict(table, row) -> dict:
+    return {c.name: _encode_value(row[c.name]) for c in data_columns(table)}
+
+
+def _canonical(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def _pack(obj: Any) -> Tuple[bytes, int]:
+    raw = _canonical(obj).encode("utf-8")
+    return zlib.compress(raw, 6), len(raw)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+# ----------------------------------------------------------------
+# Snapshot
+# ----------------------------------------------------------------
+def _saved_order(table) -> list:
+    # Kayıt sırası: save_seq INSERT anında verilir, UPDATE / VACUUM FULL / CLUSTER'da değişmez.
+    return [table.c.save_seq.asc(), table.c.id.asc()]
+
+
+def build_snapshot(db: Session, project_id: UUID) -> dict:
+    """
+    Projenin mevcut sistem + ekstra içeriğini JSON'a uygun dict olarak döner.
+    Listeler kayıt sırasındadır; kullanıcı aynı sırayla tekrar kaydettikçe ardışık
+    snapshot'lar arasındaki fark küçük kalır.
+    """
+    sys_table = ProjectSystem.__table__
+    sys_rows = db.execute(
+        select(sys_table).where(sys_table.c.project_id == project_id).order_by(*_saved_order(sys_table))
+    ).mappings().all()
+    sys_ids = [r["id"] for r in sys_rows]
+
+    children: Dict[str, Dict[UUID, list]] = {key: {} for key in SYSTEM_CHILDREN}
+    if sys_ids:
+        for key, table in SYSTEM_CHILDREN.items():
+            rows = db.execute(
+                select(table).where(table.c.project_system_id.in_(sys_ids)).order_by(*_saved_order(table))
+            ).mappings().all()
+            for r in rows:
+                children[key].setdefault(r["project_system_id"], []).append(_row_dict(table, r))
+
+    systems = []
+    for r in sys_rows:
+        item = _row_dict(sys_table, r)
+        for key in SYSTEM_CHILDREN:
+            item[key] = children[key].get(r["id"], [])
+        systems.append(item)
+
+    snapshot: Dict[str, Any] = {"v": SNAPSHOT_VERSION, "systems": systems}
+    for key, table in PROJECT_EXTRAS.items():
+        rows = db.execute(
+            select(table).where(table.c.project_id == project_id).order_by(*_saved_order(table))
+        ).mappings().all()
+        snapshot[key] = [_row_dict(table, r) for r in rows]
+    return snapshot
+
+
+def _summary(snapshot: dict) -> dict:
+    out = {"systems": len(snapshot.get("systems", []))}
+    for key in PROJECT_EXTRAS:
+        out[key] = len(snapshot.get(key, []))
+    return out
+
+
+# ----------------------------------------------------------------
+# Delta (liste bazlı: kopyala / ekle)
+# ----------------------------------------------------------------
+_LIST_KEYS = ("systems",) + tuple(PROJECT_EXTRAS.keys())
+
+
+def _list_delta(old: list, new: list) -> list:
+    """[["c", i1, i2], ["i", [items...]], ...] — c: eski listeden [i1:i2] kopyala, i: yeni öğeler."""
+    a = [_canonical(x) for x in old]
+    b = [_canonical(x) for x in new]
+    ops = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["c", i1, i2])
+        elif j2 > j1:
+            ops.append(["i", new[j1:j2]])
+    return ops
+
+
+def _apply_list_delta(old: list, ops: list) -> list:
+    out: list = []
+    for op in ops:
+        if op[0] == "c":
+            out.extend(old[op[1]:op[2]])
+        else:
+            out.extend(op[1])
+    return out
+
+
+def make_delta(old: dict, new: dict) -> dict:
+    return {"v": SNAPSHOT_VERSION, "lists": {k: _list_delta(old.get(k, []), new.get(k, [])) for k in _LIST_KEYS}}
+
+
+def apply_delta(old: dict, delta: dict) -> dict:
+    out: Dict[str, Any] = {"v": delta.get("v", SNAPSHOT_VERSION)}
+    for key in _LIST_KEYS:
+        ops = delta["lists"].get(key)
+        out[key] = _apply_list_delta(old.get(key, []), ops) if ops is not None else list(old.get(key, []))
+    return out
+
+
+# ----------------------------------------------------------------
+# Okuma
+# ----------------------------------------------------------------
+def list_revisions(db: Session, project_id: UUID) -> list:
+    """Payload yüklenmeden revizyon listesi (yeniden eskiye)."""
+    return (
+        db.query(
+            ProjectRevision.revision_no,
+            ProjectRevision.kind,
+            ProjectRevision.raw_size,
+            ProjectRevision.stored_size,
+            ProjectRevision.summary,
+            ProjectRevision.note,
+            ProjectRevision.created_by,
+            ProjectRevision.created_at,
+        )
+        .filter(ProjectRevision.project_id == project_id)
+        .order_by(ProjectRevision.revision_no.desc())
+        .all()
+    )
+
+
+def has_revisions(db: Session, project_id: UUID) -> bool:
+    return db.query(
+        db.query(ProjectRevision.id).filter(ProjectRevision.project_id == project_id).exists()
+    ).scalar()
+
+
+def load_snapshot(db: Session, project_id: UUID, revision_no: int) -> Optional[dict]:
+    """En yakın tam snapshot'tan başlayıp delta'ları uygulayarak revizyonu üretir."""
+    base_no = (
+        db.query(func.max(ProjectRevision.revision_no))
+        .filter(
+            ProjectRevision.project_id == project_id,
+            ProjectRevision.kind == "full",
+            ProjectRevision.revision_no <= revision_no,
+        )
+        .scalar()
+    )
+    if base_no is None:
+        return None
+
+    chain = (
+        db.query(ProjectRevision.revision_no, ProjectRevision.kind, ProjectRevision.payload)
+        .filter(
+            ProjectRevision.project_id == project_id,
+            ProjectRevision.revision_no >= base_no,
+            ProjectRevision.revision_no <= revision_no,
+        )
+        .order_by(ProjectRevision.revision_no.asc())
+        .all()
+    )
+    if not chain or chain[-1].revision_no != revision_no:
+        return None
+
+    snapshot: Optional[dict] = None
+    for rev in chain:
+        data = _unpack(rev.payload)
+        snapshot = data if rev.kind == "full" else apply_delta(snapshot, data)
+    return snapshot
+
+
+def _latest(db: Session, project_id: UUID):
+    return (
+        db.query(ProjectRevision.revision_no, ProjectRevision.kind)
+        .filter(ProjectRevision.project_id == project_id)
+        .order_by(ProjectRevision.revision_no.desc())
+        .first()
+    )
+
+
+def _last_full_no(db: Session, project_id: UUID) -> Optional[int]:
+    return (
+        db.query(func.max(ProjectRevision.revision_no))
+        .filter(ProjectRevision.project_id == project_id, ProjectRevision.kind == "full")
+        .scalar()
+    )
+
+
+# ----------------------------------------------------------------
+# Yazma
+# ----------------------------------------------------------------
+def record_revision(
+    db: Session,
+    project_id: UUID,
+    *,
+    user_id: Optional[UUID] = None,
+    note: Optional[str] = None,
+    commit: bool = True,
+    _retry: bool = True,
+) -> ProjectRevision:
+    """
+    Projenin güncel içeriğini yeni revizyon olarak kaydeder.
+    commit=False → sadece flush; kaydı yapan işlemle aynı transaction'da kalır.
+    """
+    snapshot = build_snapshot(db, project_id)
+    full_blob, raw_size = _pack(snapshot)
+
+    latest = _latest(db, project_id)
+    next_no = (latest.revision_no + 1) if latest else 1
+
+    kind, blob = "full", full_blob
+    if latest is not None:
+        last_full = _last_full_no(db, project_id)
+        if last_full is not None and next_no - last_full < KEYFRAME_EVERY:
+            prev = load_snapshot(db, project_id, latest.revision_no)
+            if prev is not None:
+                delta_blob, _ = _pack(make_delta(prev, snapshot))
+                # Fark tam snapshot'ın yarısından büyükse tam kaydet (zincir de sıfırlanır)
+                if len(delta_blob) * 2 < len(full_blob):
+                    kind, blob = "delta", delta_blob
+
+    rev = ProjectRevision(
+        project_id=project_id,
+        revision_no=next_no,
+        kind=kind,
+        payload=blob,
+        raw_size=raw_size,
+        stored_size=len(blob),
+        summary=_summary(snapshot),
+        note=note,
+        created_by=user_id,
+    )
+    try:
+        # Savepoint: numara çakışmasında sadece revizyon geri alınır, kaydedilen içerik kalır
+        with db.begin_nested():
+            db.add(rev)
+    except IntegrityError:
+        # Aynı anda başka bir kayıt aynı numarayı aldıysa bir kez daha dene
+        if not _retry:
+            raise
+        return record_revision(db, project_id, user_id=user_id, note=note, commit=commit, _retry=False)
+    if commit:
+        db.commit()
+    return rev
+
+
+# ----------------------------------------------------------------
+# Geri yükleme
+# ----------------------------------------------------------------
+def _insert_rows(
+    db: Session, table, rows: List[Tuple[UUID, dict]], parent_key: str, keep_id: bool = False
+) -> None:
+    """
+    rows: [(parent_id, snapshot_row), ...] → tek executemany INSERT.
+    keep_id=False ise her satıra yeni id verilir; True ise satırdaki "id" kullanılır.
+    """
+    if not rows:
+        return
+    cols = {c.name: c for c in data_columns(table)}
+    values = []
+    for parent_id, r in rows:
+        v = {name: _decode_value(col, r.get(name)) for name, col in cols.items() if name in r}
+        v["id"] = r["id"] if keep_id else uuid.uuid4()
+        v[parent_key] = parent_id
+        values.append(v)
+    db.execute(insert(table), values)
+
+
+def restore_revision(
+    db: Session, project_id: UUID, revision_no: int, *, user_id: Optional[UUID] = None
+) -> Optional[Project]:
+    """
+    Projenin sistem + ekstra içeriğini verilen revizyondaki haline döndürür.
+    Mevcut içerik silinir, snapshot toplu INSERT ile yeniden yazılır (kayıt sırasıyla); aynı
+    transaction'da yeni bir revizyon (note="restore:<no>") oluşur, geçmiş kaybolmaz.
+    Revizyondaki bir kalem artık yoksa (FK) hiçbir şey değişmez, RevisionRestoreError fırlar.
+    """
+    project = db.query(Project).filter(Project.id == project_id).first()
+    if not project:
+        return None
+    snapshot = load_snapshot(db, project_id, revision_no)
+    if snapshot is None:
+        raise ValueError("Revision not found")
+
+    sys_table = ProjectSystem.__table__
+    sys_ids = select(sys_table.c.id).where(sys_table.c.project_id == project_id).scalar_subquery()
+    for table in SYSTEM_CHILDREN.values():
+        db.execute(table.delete().where(table.c.project_system_id.in_(sys_ids)))
+    db.execute(sys_table.delete().where(sys_table.c.project_id == project_id))
+    for table in PROJECT_EXTRAS.values():
+        db.execute(table.delete().where(table.c.project_id == project_id))
+
+    sys_rows: List[Tuple[UUID, dict]] = []
+    child_rows: Dict[str, List[Tuple[UUID, dict]]] = {key: [] for key in SYSTEM_CHILDREN}
+    for item in snapshot.get("systems", []):
+        ps_id = uuid.uuid4()
+        sys_rows.append((project_id, {**item, "id": ps_id}))
+        for key in SYSTEM_CHILDREN:
+            child_rows[key].extend((ps_id, r) for r in item.get(key, []))
+
+    try:
+        _insert_rows(db, sys_table, sys_rows, "project_id", keep_id=True)
+        for key, table in SYSTEM_CHILDREN.items():
+            _insert_rows(db, table, child_rows[key], "project_system_id")
+        for key, table in PROJECT_EXTRAS.items():
+            _insert_rows(db, table, [(project_id, r) for r in snapshot.get(key, [])], "project_id")
+    except IntegrityError as e:
+        db.rollback()
+        raise RevisionRestoreError("Revision references items that no longer exist") from e
+
+    record_revision(db, project_id, user_id=user_id, note=f"restore:{revision_no}")
+    db.refresh(project)
+    return project
@@ -0,0 +1,225 @@
+# app/crud/repricing.py
+"""
+Açık tekliflerin (is_teklif=True) birim fiyatlarını güncel katalogdan yeniden hesaplar.
+
+Satırlar Python'a çekilmez: her kaynak tablo için tek bir UPDATE ... FROM (yeni fiyat alt sorgusu)
+çalışır, sonuç proje bazında SQL'de toplanır. dry_run=True iken aynı alt sorgu sadece özetlenir.
+
+Fiyat kaynakları (proje oluşturulurken snapshot alınan sırayla):
+  - system_materials : SystemMaterialTemplate.unit_price → OtherMaterial.unit_price
+  - extra_materials  : OtherMaterial.unit_price
+  - system_remotes   : Remote.price
+  - extra_remotes    : Remote.price
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.other_material import OtherMaterial
+from app.models.project import (
+    Project,
+    ProjectSystem,
+    ProjectSystemMaterial,
+    ProjectSystemRemote,
+    ProjectExtraMaterial,
+    ProjectExtraRemote,
+)
+from app.models.remote import Remote
+from app.models.system_material_template import SystemMaterialTemplate
+
+REPRICE_SOURCES = ("system_materials", "extra_materials", "system_remotes", "extra_remotes")
+
+
+def _project_filters(
+    p,
+    owner_id: Optional[UUID],
+    project_ids: Optional[Sequence[UUID]],
+    customer_id: Optional[UUID],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+) -> list:
+    conds = [p.c.is_teklif.is_(True)]
+    if owner_id is not None:
+        conds.append(p.c.created_by == owner_id)
+    if project_ids:
+        conds.append(p.c.id.in_(list(project_ids)))
+    if customer_id is not None:
+        conds.append(p.c.customer_id == customer_id)
+    if created_from is not None:
+        conds.append(p.c.created_at >= created_from)
+    if created_to is not None:
+        conds.append(p.c.created_at < created_to)
+    return conds
+
+
+def _changed_rows(source: str, project_conds: list):
+    """
+    (hedef tablo, alt sorgu) döner. Alt sorgu kolonları:
+      row_id, project_id, project_kodu, qty, old_price, new_price
+    Sadece fiyatı gerçekten değişecek satırlar gelir.
+    """
+    p = Project.__table__
+    ps = ProjectSystem.__table__
+    om = OtherMaterial.__table__
+    rm = Remote.__table__
+
+    if source == "system_materials":
+        t = ProjectSystemMaterial.__table__
+        smt = SystemMaterialTemplate.__table__
+        tpl_price = (
+            select(smt.c.unit_price)
+            .where(
+                smt.c.system_variant_id == ps.c.system_variant_id,
+                smt.c.material_id == t.c.material_id,
+                smt.c.unit_price.isnot(None),
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        new_price = func.coalesce(tpl_price, om.c.unit_price)
+        from_ = (
+            t.join(ps, ps.c.id == t.c.project_system_id)
+             .join(p, p.c.id == ps.c.project_id)
+             .join(om, om.c.id == t.c.material_id)
+        )
+    elif source == "system_remotes":
+        t = ProjectSystemRemote.__table__
+        new_price = rm.c.price
+        from_ = (
+            t.join(ps, ps.c.id == t.c.project_system_id)
+             .join(p, p.c.id == ps.c.project_id)
+             .join(rm, rm.c.id == t.c.remote_id)
+        )
+    elif source == "extra_materials":
+        t = ProjectExtraMaterial.__table__
+        new_price = om.c.unit_price
+        from_ = t.join(p, p.c.id == t.c.project_id).join(om, om.c.id == t.c.material_id)
+    elif source == "extra_remotes":
+        t = ProjectExtraRemote.__table__
+        new_price = rm.c.price
+        from_ = t.join(p, p.c.id == t.c.project_id).join(rm, rm.c.id == t.c.remote_id)
+    else:
+        raise ValueError(f"Bilinmeyen fiyat kaynağı: {source}")
+
+    base = (
+        select(
+            t.c.id.label("row_id"),
+            p.c.id.label("project_id"),
+            p.c.project_kodu.label("project_kodu"),
+            t.c.count.label("qty"),
+            t.c.unit_price.label("old_price"),
+            new_price.label("new_price"),
+        )
+        .select_from(from_)
+        .where(*project_conds)
+        .subquery(f"cur_{source}")
+    )
+    # Yeni fiyat bir kez hesaplansın diye filtre dış sorguda
+    sub = (
+        select(base)
+        .where(base.c.new_price.isnot(None), base.c.old_price.is_distinct_from(base.c.new_price))
+        .subquery(f"chg_{source}")
+    )
+    return t, sub
+
+
+def _summary_select(src):
+    """Proje bazında: değişen satır, eski/yeni toplam (adet × birim fiyat)."""
+    return (
+        select(
+            src.c.project_id,
+            src.c.project_kodu,
+            func.count().label("rows"),
+            func.coalesce(func.sum(src.c.qty * src.c.old_price), 0).label("old_total"),
+            func.coalesce(func.sum(src.c.qty * src.c.new_price), 0).label("new_total"),
+        )
+        .group_by(src.c.project_id, src.c.project_kodu)
+    )
+
+
+def reprice_open_quotes(
+    db: Session,
+    *,
+    owner_id: Optional[UUID] = None,
+    project_ids: Optional[Sequence[UUID]] = None,
+    customer_id: Optional[UUID] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    sources: Sequence[str] = REPRICE_SOURCES,
+    dry_run: bool = True,
+) -> dict:
+    """
+    owner_id=None → tüm sahipler (sadece admin için). dry_run=True → hiçbir şey yazılmaz.
+    Döner: proje bazında kaynak kırılımlı fark özeti.
+    """
+    p = Project.__table__
+    conds = _project_filters(p, owner_id, project_ids, customer_id, created_from, created_to)
+
+    projects: Dict[UUID, dict] = OrderedDict()
+    totals = {"rows": 0, "old_total": 0.0, "new_total": 0.0}
+
+    for source in sources:
+        table, sub = _changed_rows(source, conds)
+        if dry_run:
+            summary = _summary_select(sub)
+        else:
+            upd = (
+                update(table)
+                .where(table.c.id == sub.c.row_id)
+                .values(unit_price=sub.c.new_price)
+                .returning(sub.c.project_id, sub.c.project_kodu, sub.c.qty, sub.c.old_price, sub.c.new_price)
+                .cte(f"upd_{source}")
+            )
+            summary = _summary_select(upd)
+
+        for row in db.execute(summary).all():
+            entry = projects.setdefault(row.project_id, {
+                "project_id": row.project_id,
+                "project_kodu": row.project_kodu,
+                "rows": 0,
+                "old_total": 0.0,
+                "new_total": 0.0,
+                "sources": {},
+            })
+            old_total, new_total = float(row.old_total), float(row.new_total)
+            entry["sources"][source] = {
+                "rows": row.rows,
+                "old_total": round(old_total, 2),
+                "new_total": round(new_total, 2),
+            }
+            entry["rows"] += row.rows
+            entry["old_total"] += old_total
+            entry["new_total"] += new_total
+            totals["rows"] += row.rows
+            totals["old_total"] += old_total
+            totals["new_total"] += new_total
+
+    if not dry_run:
+        if projects:
+            db.execute(
+                update(p)
+                .where(p.c.id.in_(list(projects.keys())))
+                .values(updated_at=func.now())
+            )
+        db.commit()
+
+    items: List[dict] = []
+    for entry in projects.values():
+        entry["delta"] = round(entry["new_total"] - entry["old_total"], 2)
+        entry["old_total"] = round(entry["old_total"], 2)
+        entry["new_total"] = round(entry["new_total"], 2)
+        items.append(entry)
+
+    return {
+        "dry_run": dry_run,
+        "project_count": len(items),
+        "rows": totals["rows"],
+        "old_total": round(totals["old_total"], 2),
+        "new_total": round(totals["new_total"], 2),
+        "delta": round(totals["new_total"] - totals["old_total"], 2),
+        "projects": items,
+    }
@@ -0,0 +1,139 @@
+# app/crud/sync.py
+"""
+Bayi istemcileri için artımlı (delta) senkron.
+
+- İmleç (cursor): sync_change_log.txid üzerinden commit sırasına uyan imleç
+  (proje/müşteri/satır tablolarındaki trigger'lar yazar) → crud/change_log.py.
+- Doküman kompakt: her varlık için {"fields": [...], "rows": [[...], ...]}; delta'da ayrıca
+  "deleted": artık görünmeyen id'ler (tombstone).
+- Delta: since'ten sonra bu bayinin log'una düşen varlıklar yeniden okunur. Silinen proje /
+  sistem için alt satırların ayrı tombstone'u yoktur; istemci üst satırla birlikte düşürür.
+- since verilmezse (ya da log o noktadan sonra temizlenmişse) bayinin tüm verisi döner.
+  Log SYNC_LOG_RETENTION_DAYS'ten eski satırlardan periyodik olarak temizlenir (maintenance).
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.crud import change_log
+from app.models.customer import Customer
+from app.models.project import (
+    Project,
+    ProjectSystem,
+    ProjectSystemProfile,
+    ProjectSystemGlass,
+    ProjectSystemMaterial,
+    ProjectSystemRemote,
+    ProjectExtraMaterial,
+    ProjectExtraProfile,
+    ProjectExtraGlass,
+    ProjectExtraRemote,
+)
+from app.models.sync_change_log import SyncChangeLog
+from app.services import maintenance
+
+
+def _columns(model, exclude=()) -> List[str]:
+    # DB kolon adları (ör. cam satırında serbest metin renk: glass_color_1)
+    return [c.name for c in model.__table__.columns if c.name not in exclude]
+
+
+# entity → (model, alanlar, sahiplik: "project" | "customer" | "project_child" | "system_child")
+ENTITIES = OrderedDict([
+    ("customers", (Customer, _columns(Customer, exclude=("dealer_id", "is_deleted")), "customer")),
+    ("projects", (Project, _columns(Project, exclude=("created_by",)), "project")),
+    ("project_systems", (ProjectSystem, _columns(ProjectSystem), "project_child")),
+    ("project_system_profiles", (ProjectSystemProfile, _columns(ProjectSystemProfile), "system_child")),
+    ("project_system_glasses", (ProjectSystemGlass, _columns(ProjectSystemGlass), "system_child")),
+    ("project_system_materials", (ProjectSystemMaterial, _columns(ProjectSystemMaterial), "system_child")),
+    ("project_system_remotes", (ProjectSystemRemote, _columns(ProjectSystemRemote), "system_child")),
+    ("project_extra_materials", (ProjectExtraMaterial, _columns(ProjectExtraMaterial), "project_child")),
+    ("project_extra_profiles", (ProjectExtraProfile, _columns(ProjectExtraProfile), "project_child")),
+    ("project_extra_glasses", (ProjectExtraGlass, _columns(ProjectExtraGlass), "project_child")),
+    ("project_extra_remotes", (ProjectExtraRemote, _columns(ProjectExtraRemote), "project_child")),
+])
+
+
+def current_cursor(db: Session) -> int:
+    """Bu imleçten küçük txid'li bütün değişiklikler commit olmuş (ya da geri alınmış) olur."""
+    return change_log.commit_cursor(db, SyncChangeLog)[0]
+
+
+def purge_log(db: Session) -> int:
+    return change_log.purge(db, SyncChangeLog, settings.SYNC_LOG_RETENTION_DAYS)
+
+
+maintenance.register("sync_change_log_purge", purge_log)
+
+
+def _select_rows(db: Session, owner_id: UUID, entity: str, ids: Optional[Set[UUID]] = None) -> List[list]:
+    model, fields, ownership = ENTITIES[entity]
+    stmt = select(*[model.__table__.c[f] for f in fields])
+    if ownership == "customer":
+        stmt = stmt.where(Customer.dealer_id == owner_id, Customer.is_deleted == False)  # noqa: E712
+    elif ownership == "project":
+        stmt = stmt.where(Project.created_by == owner_id)
+    elif ownership == "project_child":
+        stmt = stmt.join(Project, Project.id == model.project_id).where(Project.created_by == owner_id)
+    else:
+        stmt = (
+            stmt.join(ProjectSystem, ProjectSystem.id == model.project_system_id)
+                .join(Project, Project.id == ProjectSystem.project_id)
+                .where(Project.created_by == owner_id)
+        )
+    if ids is not None:
+        stmt = stmt.where(model.id.in_(list(ids)))
+    stmt = stmt.order_by(model.id)
+    return [list(row) for row in db.execute(stmt).all()]
+
+
+def build_full(db: Session, owner_id: UUID, cursor: int) -> dict:
+    entities = OrderedDict()
+    for entity, (_, fields, _) in ENTITIES.items():
+        entities[entity] = {"fields": fields, "rows": _select_rows(db, owner_id, entity)}
+    return {"cursor": cursor, "full": True, "entities": entities}
+
+
+def build_delta(db: Session, owner_id: UUID, since: int, cursor: int) -> dict:
+    """
+    since <= txid < cursor aralığında bu bayinin log'una düşen varlıklar yeniden okunur:
+      - hâlâ var olanlar → rows
+      - silinmiş olanlar (müşteride is_deleted) → deleted (id listesi)
+    Log'un başı since'ten yeniyse (temizlenmişse) ya da since imleçten ilerideyse tam doküman döner.
+    """
+    oldest = change_log.oldest_txid(db, SyncChangeLog)
+    if since > cursor or (oldest is not None and oldest > since):
+        return build_full(db, owner_id, cursor)
+
+    changed: Dict[str, Set[UUID]] = {entity: set() for entity in ENTITIES}
+    rows = (
+        db.query(SyncChangeLog.entity, SyncChangeLog.entity_id)
+        .filter(
+            SyncChangeLog.owner_id == owner_id,
+            SyncChangeLog.txid >= since,
+            SyncChangeLog.txid < cursor,
+        )
+        .distinct()
+        .all()
+    )
+    for entity, entity_id in rows:
+        if entity in changed:
+            changed[entity].add(entity_id)
+
+    entities = OrderedDict()
+    for entity, ids in changed.items():
+        if not ids:
+            continue
+        fields = ENTITIES[entity][1]
+        current = _select_rows(db, owner_id, entity, ids)
+        present = {row[0] for row in current}
+        entities[entity] = {
+            "fields": fields,
+            "rows": current,
+            "deleted": sorted(str(i) for i in ids if i not in present),
+        }
+    return {"cursor": cursor, "since": since, "full": False, "entities": entities}
@@ -1,10 +1,14 @@
 from uuid import uuid4, UUID
+from datetime import datetime, timezone
+from decimal import Decimal
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.orm import joinedload
-from sqlalchemy import asc
+from sqlalchemy import asc, delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from typing import Optional, List, Tuple, Any
 
 from app.models.system import System, SystemVariant
+from app.crud import ordering
 from app.models.system_profile_template import SystemProfileTemplate
 from app.models.system_glass_template import SystemGlassTemplate
 from app.models.system_material_template import SystemMaterialTemplate
@@ -422,6 +426,45 @@ def get_system_templates(db: Session, variant_id: UUID):
     return profiles, glasses, materials, remotes
 
 
+def template_sort_key(tpl):
+    # get_system_templates ile aynı sıra: order_index (NULL en sonda), sonra created_at
+    return (tpl.order_index is None, tpl.order_index or 0, tpl.created_at or datetime.min.replace(tzinfo=timezone.utc))
+
+
+def get_published_system_tree(db: Session) -> List[System]:
+    """
+    Yayındaki (silinmemiş) sistemler + yayındaki varyantlar + tüm şablonlar.
+    Her koleksiyon ayrı bir IN (...) sorgusuyla (selectin) yüklenir; joinedload'daki
+    kartezyen satır çoğalması olmaz. Şablon listeleri sıralı, pdf alanları ekli döner.
+    """
+    systems = (
+        db.query(System)
+        .filter(System.is_deleted == False, System.is_published == True)
+        .options(
+            selectinload(
+                System.variants.and_(
+                    SystemVariant.is_deleted == False,
+                    SystemVariant.is_published == True,
+                )
+            ).options(
+                selectinload(SystemVariant.profile_templates).selectinload(SystemProfileTemplate.profile),
+                selectinload(SystemVariant.glass_templates).selectinload(SystemGlassTemplate.glass_type),
+                selectinload(SystemVariant.material_templates).selectinload(SystemMaterialTemplate.material),
+                selectinload(SystemVariant.remote_templates).selectinload(SystemRemoteTemplate.remote),
+            )
+        )
+        .order_by(asc(System.sort_index), asc(System.name), asc(System.created_at))
+        .all()
+    )
+    for system in systems:
+        for variant in system.variants:
+            _attach_pdf_many(variant.profile_templates)
+            _attach_pdf_many(variant.glass_templates)
+            _attach_pdf_many(variant.material_templates)
+            _attach_pdf_many(variant.remote_templates)
+    return systems
+
+
 
 # ————— Combined full creation —————
 
@@ -569,7 +612,120 @@ def create_system_variant_with_templates(db: Session, payload: SystemVariantCrea
 
 
 # ————— Update SystemVariant + all its templates —————
-def update_system_variant_with_templates(db: Session, variant_id: UUID, payload: SystemVariantUpdateWithTemplates) -> SystemVariant:
+PDF_COLUMNS = tuple(PDF_MAP_IN.values())
+
+# tür → (model, kalem kolonu, payload listesi adı, kolon builder)
+TEMPLATE_KINDS = {
+    "profile": (
+        SystemProfileTemplate, "profile_id", "profile_templates",
+        lambda t: {
+            "formula_cut_length": t.formula_cut_length,
+            "formula_cut_count": t.formula_cut_count,
+            "is_painted": bool(getattr(t, "is_painted", False)),
+        },
+    ),
+    "glass": (
+        SystemGlassTemplate, "glass_type_id", "glass_templates",
+        lambda t: {
+            "formula_width": t.formula_width,
+            "formula_height": t.formula_height,
+            "formula_count": t.formula_count,
+        },
+    ),
+    "material": (
+        SystemMaterialTemplate, "material_id", "material_templates",
+        lambda t: {
+            "formula_quantity": t.formula_quantity,
+            "formula_cut_length": t.formula_cut_length,
+            "unit_price": t.unit_price,
+            "type": t.type,
+            "piece_length_mm": t.piece_length_mm,
+        },
+    ),
+    "remote": (SystemRemoteTemplate, "remote_id", "remote_templates", lambda t: {}),
+}
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    # Numeric kolonlar Decimal döner, payload float gelir
+    if isinstance(a, Decimal) or isinstance(b, Decimal):
+        return a is not None and b is not None and Decimal(str(a)) == Decimal(str(b))
+    return a == b
+
+
+def _desired_template_row(item: Any, item_col: str, build, index: int) -> dict:
+    """Payload kalemi → kolon değerleri (yeni kayıtla aynı varsayılanlar: pdf bayrakları True)."""
+    row = {
+        item_col: getattr(item, item_col),
+        "order_index": item.order_index if item.order_index is not None else index,
+        **build(item),
+    }
+    row.update({col: True for col in PDF_COLUMNS})
+    pdf = getattr(item, "pdf", None)
+    if pdf is not None:
+        pdf_data = pdf.dict(exclude_unset=True) if hasattr(pdf, "dict") else dict(pdf)
+        for key, val in pdf_data.items():
+            col = PDF_MAP_IN.get(key)
+            if col is not None and val is not None:
+                row[col] = bool(val)
+    return row
+
+
+def _reconcile_templates(db: Session, variant_id: UUID, kind: str, items: List[Any]) -> dict:
+    """
+    Varyantın bir şablon kümesini payload ile eşitler.
+    Eşleşme (kalem id, order_index) üzerinden; eşleşen kayıt yerinde güncellenir,
+    kalanlar tek INSERT / tek DELETE ile eklenir/silinir. Değişen id'ler döner.
+    """
+    model, item_col, _, build = TEMPLATE_KINDS[kind]
+    existing = (
+        db.query(model)
+        .filter(model.system_variant_id == variant_id)
+        .order_by(asc(model.order_index), asc(model.created_at))
+        .all()
+    )
+    pool: dict = {}
+    for obj in existing:
+        pool.setdefault((getattr(obj, item_col), obj.order_index), []).append(obj)
+
+    updated: List[UUID] = []
+    to_insert: List[dict] = []
+    for i, item in enumerate(items):
+        row = _desired_template_row(item, item_col, build, i)
+        candidates = pool.get((row[item_col], row["order_index"]))
+        if not candidates:
+            to_insert.append({"id": uuid4(), "system_variant_id": variant_id, **row})
+            continue
+        obj = candidates.pop(0)
+        changed = False
+        for col, val in row.items():
+            if not _same_value(getattr(obj, col), val):
+                setattr(obj, col, val)
+                changed = True
+        if changed:
+            updated.append(obj.id)
+
+    deleted = [obj.id for leftovers in pool.values() for obj in leftovers]
+    if deleted:
+        db.execute(delete(model).where(model.id.in_(deleted)).execution_options(synchronize_session=False))
+    if to_insert:
+        db.execute(insert(model), to_insert)
+
+    return {
+        "inserted": [r["id"] for r in to_insert],
+        "updated": updated,
+        "deleted": deleted,
+    }
+
+
+def update_system_variant_with_templates(
+    db: Session, variant_id: UUID, payload: SystemVariantUpdateWithTemplates
+) -> Tuple[SystemVariant, dict]:
+    """
+    Varyantı ve dört şablon kümesini günceller; şablonlar silinip yeniden yazılmaz,
+    sadece farklar uygulanır (id'ler korunur).
+    Dönüş: (variant, {tür: {"inserted": [...], "updated": [...], "deleted": [...]}})
+    """
     variant = get_system_variant(db, variant_id)
     if not variant:
         raise ValueError("Variant not found")
@@ -583,68 +739,71 @@ def update_system_variant_with_templates(db: Session, variant_id: UUID, payload:
     if payload.sort_index is not None:  # ✅ sıralama güncelle
         variant.sort_index = int(payload.sort_index)
 
-    # Eski şablonları temizle
-    db.query(SystemProfileTemplate).filter_by(system_variant_id=variant_id).delete(synchronize_session=False)
-    db.query(SystemGlassTemplate).filter_by(system_variant_id=variant_id).delete(synchronize_session=False)
-    db.query(SystemMaterialTemplate).filter_by(system_variant_id=variant_id).delete(synchronize_session=False)
-    db.query(SystemRemoteTemplate).filter_by(system_variant_id=variant_id).delete(synchronize_session=False)
-    db.flush()
+    changes = {
+        kind: _reconcile_templates(db, variant_id, kind, getattr(payload, field))
+        for kind, (_, _, field, _) in TEMPLATE_KINDS.items()
+    }
 
-    # PROFIL
-    for i, pt in enumerate(payload.profile_templates):
-        obj = SystemProfileTemplate(
-            id=uuid4(),
-            system_variant_id=variant_id,
-            profile_id=pt.profile_id,
-            formula_cut_length=pt.formula_cut_length,
-            formula_cut_count=pt.formula_cut_count,
-            order_index=pt.order_index if pt.order_index is not None else i,
-            is_painted=bool(getattr(pt, "is_painted", False)),
-        )
-        _apply_pdf(obj, getattr(pt, "pdf", None))
-        db.add(obj)
+    db.commit()
+    db.refresh(variant)
+    return variant, changes
 
-    # CAM
-    for i, gt in enumerate(payload.glass_templates):
-        obj = SystemGlassTemplate(
-            id=uuid4(),
-            system_variant_id=variant_id,
-            glass_type_id=gt.glass_type_id,
-            formula_width=gt.formula_width,
-            formula_height=gt.formula_height,
-            formula_count=gt.formula_count,
-            order_index=gt.order_index if gt.order_index is not None else i
-        )
-        _apply_pdf(obj, getattr(gt, "pdf", None))
-        db.add(obj)
 
-    # MALZEME
-    for i, mt in enumerate(payload.material_templates):
-        obj = SystemMaterialTemplate(
-            id=uuid4(),
-            system_variant_id=variant_id,
-            material_id=mt.material_id,
-            formula_quantity=mt.formula_quantity,
-            formula_cut_length=mt.formula_cut_length,
-            unit_price=mt.unit_price,
-            type=mt.type,
-            piece_length_mm=mt.piece_length_mm,
-            order_index=mt.order_index if mt.order_index is not None else i
-        )
-        _apply_pdf(obj, getattr(mt, "pdf", None))
-        db.add(obj)
+# ————— Clone SystemVariant + all its templates —————
+_CLONE_SKIP_COLUMNS = {"id", "system_variant_id", "created_at"}
 
-    # REMOTE
-    for i, rt in enumerate(payload.remote_templates):
-        obj = SystemRemoteTemplate(
-            id=uuid4(),
-            system_variant_id=variant_id,
-            remote_id=rt.remote_id,
-            order_index=rt.order_index if rt.order_index is not None else i
+
+def clone_system_variant(
+    db: Session,
+    variant_id: UUID,
+    target_system_id: Optional[UUID] = None,
+    name: Optional[str] = None,
+) -> Optional[SystemVariant]:
+    """
+    Varyantı dört şablon tablosuyla birlikte veritabanı içinde kopyalar (tek transaction).
+    Şablonlar Python'a çekilmez: her tablo için tek INSERT ... SELECT, yeni id'ler
+    gen_random_uuid() ile. Kopya yayınsız başlar ve hedef sistemin listesinin sonuna eklenir.
+    Varyant yoksa None; hedef sistem yoksa ValueError.
+    """
+    src = get_system_variant(db, variant_id)
+    if not src or src.is_deleted:
+        return None
+
+    system_id = target_system_id or src.system_id
+    target = get_system(db, system_id)
+    if not target or target.is_deleted:
+        raise ValueError("System not found")
+
+    max_idx = (
+        db.query(func.max(SystemVariant.sort_index))
+        .filter(SystemVariant.system_id == system_id, SystemVariant.is_deleted == False)  # noqa: E712
+        .scalar()
+    )
+    clone = SystemVariant(
+        id=uuid4(),
+        system_id=system_id,
+        name=name or src.name,
+        is_active=src.is_active,
+        is_published=False,
+        sort_index=(max_idx or 0) + ordering.SORT_GAP,
+    )
+    db.add(clone)
+    db.flush()
+
+    for model, *_ in TEMPLATE_KINDS.values():
+        table = model.__table__
+        cols = [c.name for c in table.columns if c.name not in _CLONE_SKIP_COLUMNS]
+        db.execute(
+            insert(table).from_select(
+                ["id", "system_variant_id"] + cols,
+                select(
+                    func.gen_random_uuid(),
+                    literal(clone.id, PGUUID(as_uuid=True)),
+                    *[table.c[c] for c in cols],
+                ).where(table.c.system_variant_id == variant_id),
+            )
         )
-        _apply_pdf(obj, getattr(rt, "pdf", None))
-        db.add(obj)
 
     db.commit()
-    db.refresh(variant)
-    return variant
+    db.refresh(clone)
+    return clone
@@ -0,0 +1,28 @@
+# app/models/catalog_change_log.py
+
+from sqlalchemy import Column, String, BigInteger, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class CatalogChangeLog(Base):
+    """
+    Katalog tablolarındaki her satır değişikliğinin kaydı (DB trigger'ları yazar).
+    version: sıra numarası (commit sırasını YANSITMAZ)
+    txid   : satırı yazan transaction (pg_current_xact_id); katalog sürümü buna göre → crud/change_log.py
+    entity : "profiles" | "glass_types" | "other_materials" | "remotes" | "colors" | "systems" | "system_variants"
+    op     : "insert" | "update" | "delete"
+    """
+    __tablename__ = "catalog_change_log"
+    __table_args__ = (
+        Index("ix_catalog_change_log_txid", "txid"),
+    )
+
+    version    = Column(BigInteger, primary_key=True, autoincrement=True)
+    txid       = Column(BigInteger, nullable=False, server_default=text("pg_current_xact_id()::text::bigint"))
+    entity     = Column(String(30), nullable=False)
+    entity_id  = Column(PGUUID(as_uuid=True), nullable=False)
+    op         = Column(String(10), nullable=False)
+    changed_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
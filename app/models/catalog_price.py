@@ -0,0 +1,32 @@
+# app/models/catalog_price.py
+
+from sqlalchemy import Column, String, Numeric, BigInteger, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class CatalogPriceHistory(Base):
+    """
+    Katalog fiyatlarının tarih etkili geçmişi.
+    - item_type: "profile" | "other_material" | "remote"
+    - price: effective_from anından itibaren geçerli fiyat (sonraki kayda kadar)
+    Katalogdaki fiyat değişince DB trigger'ı otomatik satır ekler; ileri tarihli fiyatlar
+    admin tarafından planlanabilir. "X anındaki fiyat" = effective_from <= X olan son satır.
+    """
+    __tablename__ = "catalog_price_history"
+
+    id             = Column(BigInteger, primary_key=True, autoincrement=True)
+    item_type      = Column(String(20), nullable=False)
+    item_id        = Column(PGUUID(as_uuid=True), nullable=False)
+    price          = Column(Numeric, nullable=True)
+    effective_from = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    created_by     = Column(PGUUID(as_uuid=True), ForeignKey("app_user.id", ondelete="SET NULL"), nullable=True)
+    created_at     = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("item_type", "item_id", "effective_from", name="uq_catalog_price_effective"),
+        # as-of araması: (item_type, item_id) eşit + effective_from <= X ORDER BY DESC LIMIT 1 → tek index taraması
+        Index("ix_catalog_price_asof", "item_type", "item_id", effective_from.desc()),
+    )
@@ -0,0 +1,37 @@
+# app/models/production_batch.py
+
+import uuid
+from sqlalchemy import Column, String, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ProductionBatch(Base):
+    """
+    Onaylı projelerin birlikte optimize edildiği üretim partisi.
+    - kind: "profile_cutting" (profil kesim optimizasyonu)
+    - status: queued | running | done | failed
+    - result: optimizasyon çıktısı (bar bazlı kesim listeleri), iş bitince yazılır
+    """
+    __tablename__ = "production_batch"
+
+    id          = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    owner_id    = Column(PGUUID(as_uuid=True), ForeignKey("app_user.id", ondelete="CASCADE"), nullable=False)
+    name        = Column(String(100), nullable=True)
+    kind        = Column(String(30), nullable=False, server_default="profile_cutting")
+    status      = Column(String(20), nullable=False, server_default="queued")
+
+    project_ids = Column(JSONB, nullable=False)           # ["uuid", ...]
+    params      = Column(JSONB, nullable=True)            # kerf, time_budget_s, ...
+    result      = Column(JSONB, nullable=True)
+    error       = Column(Text, nullable=True)
+
+    created_at  = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    started_at  = Column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_production_batch_owner_created", "owner_id", "created_at"),
+    )
@@ -1,9 +1,9 @@
 # app/models/project.py
 
 import uuid
-from sqlalchemy import Column, String, Numeric, Integer, ForeignKey, UniqueConstraint, Index, Boolean,Date
+from sqlalchemy import Column, String, Numeric, Integer, BigInteger, ForeignKey, UniqueConstraint, Index, Boolean, Date, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP
-from sqlalchemy.sql import func,expression
+from sqlalchemy.sql import func,expression,text
 from sqlalchemy.orm import relationship
 from app.models.color import Color
 from app.models.app_user import AppUser
@@ -11,6 +11,12 @@ from app.db.base import Base
 from sqlalchemy.ext.hybrid import hybrid_property
 
 
+def _save_seq_column():
+    # Kayıt sırası: INSERT anında ortak sequence'ten alınır, UPDATE/VACUUM'da değişmez
+    # (revizyon snapshot'ları ve kopyalama bu sırayı kullanır).
+    return Column(BigInteger, nullable=False, server_default=text("nextval('project_row_save_seq')"))
+
+
 class Project(Base):
     __tablename__ = "project"
 
@@ -50,6 +56,11 @@ class Project(Base):
     created_at     = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at     = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # İçerik sürümü: proje satırı ya da herhangi bir alt satırı (sistemler, profil/cam/malzeme/kumanda satırları,
+    # ekstralar) değişince DB trigger'ı artırır — toplu query().update()/delete() dahil.
+    # Uygulama yazmaz; server_onupdate → ORM güncellemesinden sonra yeniden okunur.
+    content_version = Column(BigInteger, nullable=False, server_default="0", server_onupdate=FetchedValue())
+
     creator         = relationship("AppUser", back_populates="projects")
     systems         = relationship("ProjectSystem", back_populates="project", cascade="all, delete-orphan")
     extra_materials = relationship("ProjectExtraMaterial", back_populates="project", cascade="all, delete-orphan")
@@ -72,6 +83,7 @@ class ProjectSystem(Base):
     __tablename__ = "project_system"
 
     id                = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq          = _save_seq_column()
     project_id        = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
     system_variant_id = Column(PGUUID(as_uuid=True), ForeignKey("system_variant.id"), nullable=False)
     width_mm          = Column(Numeric, nullable=False)
@@ -90,6 +102,7 @@ class ProjectSystemProfile(Base):
     __tablename__ = "project_system_profile"
 
     id                 = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq           = _save_seq_column()
     project_system_id  = Column(PGUUID(as_uuid=True), ForeignKey("project_system.id", ondelete="CASCADE"), nullable=False)
     profile_id         = Column(PGUUID(as_uuid=True), ForeignKey("profile.id"), nullable=False)
     cut_length_mm      = Column(Numeric, nullable=False)
@@ -117,6 +130,7 @@ class ProjectSystemGlass(Base):
     __tablename__ = "project_system_glass"
 
     id                 = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq           = _save_seq_column()
     project_system_id  = Column(PGUUID(as_uuid=True), ForeignKey("project_system.id", ondelete="CASCADE"), nullable=False)
     glass_type_id      = Column(PGUUID(as_uuid=True), ForeignKey("glass_type.id"), nullable=False)
     width_mm           = Column(Numeric, nullable=False)
@@ -164,6 +178,7 @@ class ProjectSystemMaterial(Base):
     __tablename__ = "project_system_material"
 
     id                 = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq           = _save_seq_column()
     project_system_id  = Column(PGUUID(as_uuid=True), ForeignKey("project_system.id", ondelete="CASCADE"), nullable=False)
     material_id        = Column(PGUUID(as_uuid=True), ForeignKey("other_material.id"), nullable=False)
     cut_length_mm      = Column(Numeric, nullable=True)
@@ -188,6 +203,7 @@ class ProjectSystemRemote(Base):
     __tablename__ = "project_system_remote"
 
     id                = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq          = _save_seq_column()
     project_system_id = Column(PGUUID(as_uuid=True), ForeignKey("project_system.id", ondelete="CASCADE"), nullable=False)
     remote_id         = Column(PGUUID(as_uuid=True), ForeignKey("remote.id"), nullable=False)
     count             = Column(Integer, nullable=False)          # kaç adet kumanda
@@ -211,6 +227,7 @@ class ProjectExtraMaterial(Base):
     __tablename__ = "project_extra_material"
 
     id            = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq      = _save_seq_column()
     project_id    = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
     material_id   = Column(PGUUID(as_uuid=True), ForeignKey("other_material.id"), nullable=False)
     count         = Column(Integer, nullable=False)
@@ -233,6 +250,7 @@ class ProjectExtraProfile(Base):
     __tablename__ = "project_extra_profile"
 
     id = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq = _save_seq_column()
     project_id = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
     profile_id = Column(PGUUID(as_uuid=True), ForeignKey("profile.id"), nullable=False)
     cut_length_mm = Column(Numeric, nullable=False)
@@ -258,6 +276,7 @@ class ProjectExtraGlass(Base):
     __tablename__ = "project_extra_glass"
 
     id           = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq     = _save_seq_column()
     project_id   = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
     glass_type_id= Column(PGUUID(as_uuid=True), ForeignKey("glass_type.id"), nullable=False)
     width_mm     = Column(Numeric, nullable=False)
@@ -303,6 +322,7 @@ class ProjectExtraRemote(Base):
     __tablename__ = "project_extra_remote"
 
     id         = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    save_seq   = _save_seq_column()
     project_id = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
     remote_id  = Column(PGUUID(as_uuid=True), ForeignKey("remote.id"), nullable=False)
     count      = Column(Integer, nullable=False)
@@ -0,0 +1,34 @@
+# app/models/project_revision.py
+
+import uuid
+from sqlalchemy import Column, String, Integer, LargeBinary, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ProjectRevision(Base):
+    """
+    Projenin sistem + ekstra içeriğinin değişmez (immutable) sürüm kaydı.
+    - kind="full"  → payload: zlib(JSON) tam snapshot
+    - kind="delta" → payload: zlib(JSON) bir önceki revizyona göre liste farkları
+    Listeleme payload'a dokunmaz; summary (satır sayıları) ve boyutlar yeterlidir.
+    """
+    __tablename__ = "project_revision"
+
+    id           = Column(PGUUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    project_id   = Column(PGUUID(as_uuid=True), ForeignKey("project.id", ondelete="CASCADE"), nullable=False)
+    revision_no  = Column(Integer, nullable=False)
+    kind         = Column(String(10), nullable=False)          # "full" | "delta"
+    payload      = Column(LargeBinary, nullable=False)
+    raw_size     = Column(Integer, nullable=False)             # sıkıştırılmamış tam snapshot (byte)
+    stored_size  = Column(Integer, nullable=False)             # payload (byte)
+    summary      = Column(JSONB, nullable=True)                # {"systems": 3, "extra_profiles": 1, ...}
+    note         = Column(String(100), nullable=True)          # "requirements", "restore:4", ...
+    created_by   = Column(PGUUID(as_uuid=True), ForeignKey("app_user.id", ondelete="SET NULL"), nullable=True)
+    created_at   = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("project_id", "revision_no", name="uq_project_revision_no"),
+    )
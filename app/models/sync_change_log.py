@@ -0,0 +1,32 @@
+# app/models/sync_change_log.py
+
+from sqlalchemy import Column, String, BigInteger, Index, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class SyncChangeLog(Base):
+    """
+    Bayi verisindeki (proje, müşteri, proje satırları) her satır değişikliğinin kaydı;
+    DB trigger'ları yazar. /api/sync delta'sı buna göre üretilir.
+    version : sıra numarası (commit sırasını YANSITMAZ)
+    txid    : satırı yazan transaction (pg_current_xact_id); imleç buna göre → crud/change_log.py
+    owner_id: satırın sahibi bayi (project.created_by / customer.dealer_id)
+    entity  : "projects" | "customers" | "project_systems" | ... (sync dokümanındaki ad)
+    op      : "insert" | "update" | "delete"
+    """
+    __tablename__ = "sync_change_log"
+    __table_args__ = (
+        Index("ix_sync_change_log_owner_txid", "owner_id", "txid"),
+        Index("ix_sync_change_log_txid", "txid"),
+    )
+
+    version    = Column(BigInteger, primary_key=True, autoincrement=True)
+    txid       = Column(BigInteger, nullable=False, server_default=text("pg_current_xact_id()::text::bigint"))
+    owner_id   = Column(PGUUID(as_uuid=True), nullable=False)
+    entity     = Column(String(40), nullable=False)
+    entity_id  = Column(PGUUID(as_uuid=True), nullable=False)
+    op         = Column(String(10), nullable=False)
+    changed_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -2,15 +2,20 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-import os, shutil
+from datetime import datetime
+import os, tempfile
 
 from math import ceil                              # 🟢
 from fastapi import Query 
 
-from fastapi.responses import FileResponse
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from app.db.session import get_db
+from app.services import images, uploads
+from app.core.responses import FastJSONResponse, dump
 
 # 🔐 roller
 from app.core.security import get_current_user
@@ -23,11 +28,18 @@ from app.models.glass_type import GlassType
 from app.models.other_material import OtherMaterial
 
 from app.crud import catalog as crud
+from app.services import catalog_cache
+from app.services.conditional_get import REVALIDATE, etag_matches
+from app.crud import catalog_io
+from app.crud import catalog_price as price_crud
+from app.db.session import SessionLocal
 from app.schemas.catalog import (                  # 🟢
     ProfileCreate, ProfileUpdate, ProfileOut, ProfilePageOut,
     GlassTypeCreate, GlassTypeUpdate, GlassTypeOut, GlassTypePageOut,
     OtherMaterialCreate, OtherMaterialOut, OtherMaterialPageOut,
-    RemoteCreate, RemoteOut, RemotePageOut
+    RemoteCreate, RemoteOut, RemotePageOut,
+    CatalogImportResult,
+    CatalogPriceIn, CatalogPriceOut,
 )
 from app.crud.catalog import (
     get_profiles_page, get_glass_types_page, get_other_materials_page, get_remotes_page,
@@ -76,7 +88,7 @@ def list_profiles(
     )
 
     total_pages = ceil(total / limit) if total > 0 else 0
-    return ProfilePageOut(
+    return FastJSONResponse(dump(ProfilePageOut, dict(
         items=items,
         total=total,
         page=page,
@@ -84,7 +96,7 @@ def list_profiles(
         total_pages=total_pages,
         has_next=(page < total_pages) if total_pages > 0 else False,
         has_prev=(page > 1) and (total_pages > 0),
-    )
+    )))
 
 
 @router.get("/profiles/{profile_id}", response_model=ProfileOut)
@@ -123,19 +135,20 @@ def upload_profile_image(profile_id: UUID, file: UploadFile = File(...), db: Ses
     obj = crud.get_profile(db, profile_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Profile not found")
-    ext = os.path.splitext(file.filename)[1]
-    filename = f"{obj.profil_kodu}{ext}"
-    filepath = os.path.join(IMAGE_DIR, filename)
-    with open(filepath, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    obj.profil_kesit_fotograf = filepath
+    old_path = obj.profil_kesit_fotograf
+    stored = images.store_upload(file)
+    if old_path != stored.url:
+        images.discard_after_commit(db, old_path)
+    obj.profil_kesit_fotograf = stored.url
     db.commit()
     db.refresh(obj)
-    return {"filename": filename}
+    return {"filename": stored.path.name}
 
 @router.get("/profiles/{profile_id}/image")
 def get_profile_image(
     profile_id: UUID,
+    request: Request,
+    size: Optional[str] = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
     db: Session = Depends(get_db),
     current_user: AppUser = Depends(get_current_user),
 ):
@@ -145,7 +158,10 @@ def get_profile_image(
     # Bayi: silinmiş/pasif profilin görselini göremez
     if current_user.role != "admin" and (obj.is_deleted or not obj.is_active):
         raise HTTPException(status_code=404, detail="Image not found")
-    return FileResponse(obj.profil_kesit_fotograf)
+    path = images.resolve_path(obj.profil_kesit_fotograf)
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Image not found")
+    return images.image_response(request, path, size=size)
 
 @router.put("/profiles/{profile_id}/image", dependencies=[Depends(get_current_admin)])
 def update_profile_image(profile_id: UUID, file: UploadFile = File(...), db: Session = Depends(get_db)):
@@ -153,26 +169,20 @@ def update_profile_image(profile_id: UUID, file: UploadFile = File(...), db: Ses
     if not obj or not obj.profil_kesit_fotograf:
         raise HTTPException(status_code=404, detail="Profile or image not found")
     old_path = obj.profil_kesit_fotograf
-    if os.path.exists(old_path):
-        os.remove(old_path)
-    ext = os.path.splitext(file.filename)[1]
-    filename = f"{obj.profil_kodu}{ext}"
-    filepath = os.path.join(IMAGE_DIR, filename)
-    with open(filepath, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    obj.profil_kesit_fotograf = filepath
+    stored = images.store_upload(file)
+    if old_path != stored.url:
+        images.discard_after_commit(db, old_path)
+    obj.profil_kesit_fotograf = stored.url
     db.commit()
     db.refresh(obj)
-    return {"filename": filename}
+    return {"filename": stored.path.name}
 
 @router.delete("/profiles/{profile_id}/image", status_code=204, dependencies=[Depends(get_current_admin)])
 def delete_profile_image(profile_id: UUID, db: Session = Depends(get_db)):
     obj = crud.get_profile(db, profile_id)
     if not obj or not obj.profil_kesit_fotograf:
         raise HTTPException(status_code=404, detail="Profile or image not found")
-    path = obj.profil_kesit_fotograf
-    if os.path.exists(path):
-        os.remove(path)
+    images.discard_after_commit(db, obj.profil_kesit_fotograf)
     obj.profil_kesit_fotograf = None
     db.commit()
     return
@@ -219,7 +229,7 @@ def list_glass_types(
     )
 
     total_pages = ceil(total / limit) if total > 0 else 0
-    return GlassTypePageOut(
+    return FastJSONResponse(dump(GlassTypePageOut, dict(
         items=items,
         total=total,
         page=page,
@@ -227,7 +237,7 @@ def list_glass_types(
         total_pages=total_pages,
         has_next=(page < total_pages) if total_pages > 0 else False,
         has_prev=(page > 1) and (total_pages > 0),
-    )
+    )))
 
 
 @router.get("/glass-types/{glass_type_id}", response_model=GlassTypeOut)
@@ -299,7 +309,7 @@ def list_other_materials(
     )
 
     total_pages = ceil(total / limit) if total > 0 else 0
-    return OtherMaterialPageOut(
+    return FastJSONResponse(dump(OtherMaterialPageOut, dict(
         items=items,
         total=total,
         page=page,
@@ -307,7 +317,7 @@ def list_other_materials(
         total_pages=total_pages,
         has_next=(page < total_pages) if total_pages > 0 else False,
         has_prev=(page > 1) and (total_pages > 0),
-    )
+    )))
 
 
 @router.get("/other-materials/{material_id}", response_model=OtherMaterialOut)
@@ -380,7 +390,7 @@ def list_remotes(
 
     total_pages = ceil(total / limit) if limit > 0 else 0
 
-    return RemotePageOut(
+    return FastJSONResponse(dump(RemotePageOut, dict(
         items=items,
         total=total,
         page=page,
@@ -388,7 +398,7 @@ def list_remotes(
         total_pages=total_pages,
         has_next=(page < total_pages) if total_pages > 0 else False,
         has_prev=(page > 1) and (total_pages > 0),
-    )
+    )))
 
 
 @router.get("/remotes/{remote_id}", response_model=RemoteOut)
@@ -436,3 +446,156 @@ def deactivate_remote(remote_id: UUID, db: Session = Depends(get_db)):
     if not obj:
         raise HTTPException(status_code=404, detail="Remote not found")
     return obj
+
+
+# ----- CATALOG SNAPSHOT (sürüm bazlı senkron) -----
+
+@router.get("/snapshot")
+def get_catalog_snapshot(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="İstemcideki katalog sürümü; verilirse sadece fark döner"),
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Yayındaki tüm katalog tek dokümanda (profiller, camlar, malzemeler, kumandalar, renkler,
+    sistemler, varyantlar). ETag = katalog sürümü; değişmediyse 304 döner.
+    """
+    if since is None:
+        version, body = catalog_cache.get_full(db)
+        etag = f'W/"catalog-{version}"'
+    else:
+        version, body = catalog_cache.get_delta(db, since)
+        etag = f'W/"catalog-{since}-{version}"'
+
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE, "X-Catalog-Version": str(version)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# ----- TOPLU İÇE / DIŞA AKTARMA (admin) -----
+
+@router.post(
+    "/import/{entity}",
+    response_model=CatalogImportResult,
+    dependencies=[Depends(get_current_admin)],
+    summary="CSV/XLSX ile toplu ekle/güncelle (profiles | glass-types | other-materials)",
+)
+def import_catalog_file(
+    entity: str,
+    file: UploadFile = File(...),
+    dry_run: bool = Query(False, description="True → sadece doğrula, yazma"),
+    db: Session = Depends(get_db),
+):
+    if entity not in catalog_io.IMPORT_SPECS:
+        raise HTTPException(status_code=404, detail="Catalog entity not found")
+    raw = uploads.read_limited(file)
+    try:
+        return catalog_io.import_catalog(db, entity, file.filename, raw, dry_run=dry_run)
+    except catalog_io.CatalogImportError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="XLSX desteği için openpyxl kurulu olmalı")
+
+
+def _export_stream(entity: str):
+    # Yanıt akarken request oturumu kapanmış olabilir → akış kendi oturumunu açar
+    db = SessionLocal()
+    try:
+        yield from catalog_io.iter_export_csv(db, entity)
+    finally:
+        db.close()
+
+
+@router.get(
+    "/export/{entity}",
+    dependencies=[Depends(get_current_admin)],
+    summary="Katalog dışa aktarma (import ile aynı kolonlar)",
+)
+def export_catalog_file(
+    entity: str,
+    format: str = Query("csv", regex="^(csv|xlsx)$"),
+):
+    if entity not in catalog_io.IMPORT_SPECS:
+        raise HTTPException(status_code=404, detail="Catalog entity not found")
+
+    if format == "xlsx":
+        # XLSX bir zip; parça parça üretilemez → geçici dosyaya yazılıp akıtılır
+        tmp = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        db = SessionLocal()
+        try:
+            catalog_io.write_export_xlsx(db, entity, tmp)
+        except ImportError:
+            tmp.close()
+            raise HTTPException(status_code=400, detail="XLSX desteği için openpyxl kurulu olmalı")
+        finally:
+            db.close()
+        tmp.seek(0)
+        return StreamingResponse(
+            tmp,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": f'attachment; filename="{entity}.xlsx"'},
+            background=BackgroundTask(tmp.close),
+        )
+
+    return StreamingResponse(
+        _export_stream(entity),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{entity}.csv"'},
+    )
+
+
+# ----- FİYAT GEÇMİŞİ (tarih etkili) -----
+
+def _check_price_item_type(item_type: str) -> None:
+    if item_type not in price_crud.PRICE_SOURCES:
+        raise HTTPException(status_code=404, detail="Catalog entity not found")
+
+
+@router.get("/prices/{item_type}/{item_id}", response_model=CatalogPriceOut)
+def get_price_as_of(
+    item_type: str,
+    item_id: UUID,
+    as_of: Optional[datetime] = Query(None, description="Boş → şimdi"),
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    _check_price_item_type(item_type)
+    row = price_crud.price_as_of(db, item_type, item_id, as_of)
+    if not row:
+        raise HTTPException(status_code=404, detail="Price not found")
+    return row
+
+
+@router.get("/prices/{item_type}/{item_id}/history", response_model=List[CatalogPriceOut])
+def get_price_history(
+    item_type: str,
+    item_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    _check_price_item_type(item_type)
+    return price_crud.list_price_history(db, item_type, item_id)
+
+
+@router.post("/prices/{item_type}/{item_id}", response_model=CatalogPriceOut, status_code=201)
+def schedule_catalog_price(
+    item_type: str,
+    item_id: UUID,
+    payload: CatalogPriceIn,
+    db: Session = Depends(get_db),
+    current_admin: AppUser = Depends(get_current_admin),
+):
+    """Geçmişe düzeltme veya ileri tarihli fiyat. Şu an geçerli fiyat değişirse katalog da güncellenir."""
+    _check_price_item_type(item_type)
+    if item_type == "remote" and payload.price is None:
+        raise HTTPException(status_code=400, detail="Remote price is required")
+    row = price_crud.schedule_price(
+        db, item_type, item_id, payload.price, payload.effective_from, user_id=current_admin.id
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Catalog item not found")
+    return row
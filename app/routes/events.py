@@ -0,0 +1,41 @@
+# app/routes/events.py
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.security import get_current_user
+from app.models.app_user import AppUser
+from app.services import project_events
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+
+@router.get("/projects")
+async def project_event_stream(
+    request: Request,
+    owner_id: Optional[UUID] = Query(None, description="Sadece admin: tek bayinin olayları (verilmezse hepsi)"),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Server-Sent Events: projeler değiştikçe olay gönderilir, /api/projects/ yoklamasına gerek kalmaz.
+      - status  : paint/glass/production_status, is_teklif ya da approval_date değişti
+      - changed : projenin başka bir alanı ya da satırları değişti (content_version arttı)
+      - created / deleted
+      - resync  : olay kaçmış olabilir → liste bir kez yeniden çekilmeli
+    data: {"event", "owner_id", "id", "project_kodu", "paint_status", "glass_status",
+           "production_status", "is_teklif", "approval_date", "content_version"}
+    Bayi sadece kendi projelerini alır. EventSource header gönderemediği için istemci
+    Authorization header'lı fetch akışı kullanmalı.
+    """
+    if current_user.role == "admin":
+        key = str(owner_id) if owner_id else project_events.ALL
+    else:
+        key = str(current_user.id)
+
+    return StreamingResponse(
+        project_events.stream(key, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
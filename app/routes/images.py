@@ -0,0 +1,28 @@
+# app/routes/images.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from app.core.security import get_current_user
+from app.models.app_user import AppUser
+from app.services import images
+
+router = APIRouter(prefix="/api/images", tags=["images"])
+
+
+@router.get("/{filename}", summary="İçerik adresli görsel (immutable önbellek)")
+def get_image(
+    filename: str,
+    request: Request,
+    size: Optional[str] = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    /api/images/<sha256>.<ext> ile saklanan görsel (orijinaller /static dışında, giriş gerekir).
+    URL içerikle değiştiği için cevap tarayıcıda bir yıl immutable (private) önbelleklenir.
+    """
+    stem, _, ext = filename.partition(".")
+    path = images.stored_path(filename)
+    if not ext or images.digest_of(path) is None or not path.exists():
+        raise HTTPException(status_code=404, detail="Görsel bulunamadı")
+    return images.image_response(request, path, size=size, immutable=True)
@@ -2,9 +2,8 @@
 from typing import Optional
 from uuid import UUID
 from pathlib import Path
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
 from sqlalchemy.orm import Session
-import time
 
 from app.db.session import get_db
 from app.core.security import get_current_user
@@ -12,7 +11,7 @@ from app.models.app_user import AppUser
 from app.schemas.pdf import PdfBrandUpdate, PdfBrandOut, PdfBrandLogoOut
 from app.crud import pdf as crud
 from app.core.config import MEDIA_ROOT
-from fastapi.responses import FileResponse
+from app.services import images
 
 router = APIRouter(prefix="/api/me/pdf/brand", tags=["me-pdf-brand"])
 
@@ -30,52 +29,6 @@ def _pick_ext(upload: UploadFile) -> str:
     if suffix == ".webp": return ".webp"
     raise HTTPException(status_code=415, detail="JPEG/PNG/WebP yükleyin.")
 
-def _save_upload(upload: UploadFile, dest: Path):
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    with dest.open("wb") as f:
-        while True:
-            chunk = upload.file.read(1024 * 1024)
-            if not chunk:
-                break
-            f.write(chunk)
-
-def _static_url(path: Path) -> str:
-    # Query param eklemeden baz yol
-    rel = path.relative_to(MEDIA_ROOT).as_posix()
-    return f"/static/{rel}"
-
-def _static_url_with_version(path: Path) -> str:
-    base = _static_url(path)
-    try:
-        ver = int(path.stat().st_mtime)
-    except Exception:
-        ver = int(time.time())
-    return f"{base}?v={ver}"
-
-def _remove_file_safely(path: Path):
-    try:
-        if path.exists():
-            path.unlink()
-    except Exception:
-        pass
-
-def _content_type_from_path(path: Path) -> str:
-    ext = path.suffix.lower()
-    if ext in (".jpg", ".jpeg"):
-        return "image/jpeg"
-    if ext == ".png":
-        return "image/png"
-    if ext == ".webp":
-        return "image/webp"
-    return "application/octet-stream"
-
-def _strip_static_and_query(url: str) -> str:
-    """
-    '/static/brands/..../logo.png?v=1234'  -> 'brands/..../logo.png'
-    """
-    no_query = url.split("?", 1)[0]
-    return no_query.replace("/static/", "")
-
 
 # --------- Tekil Brand (me) ---------
 
@@ -116,31 +69,23 @@ def create_my_brand_logo(file: UploadFile = File(...), db: Session = Depends(get
     obj = crud.brand_ensure_default(db, current_user.id)
     if obj.logo_url:
         raise HTTPException(status_code=409, detail="Bu brand için logo zaten var. PUT ile güncelleyebilirsiniz.")
-    ext = _pick_ext(file)
-    dest = _brand_dir(obj.id) / f"logo{ext}"
-    _save_upload(file, dest)
-    url = _static_url_with_version(dest)
+    _pick_ext(file)  # tür kontrolü (JPEG/PNG/WebP)
+    # İçerik adresli URL içerikle değişir; ?v= sürüm parametresine gerek yok
+    url = images.store_upload(file, public=True).url
     obj = crud.brand_set_logo(db, obj, url)
     return {"brand_id": obj.id, "logo_url": obj.logo_url}
 
 @router.put("/image", response_model=PdfBrandLogoOut)
 def update_my_brand_logo(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: AppUser = Depends(get_current_user)):
     obj = crud.brand_ensure_default(db, current_user.id)
+    old_url = obj.logo_url
 
-    old_path: Optional[Path] = None
-    if obj.logo_url:
-        rel = _strip_static_and_query(obj.logo_url)
-        old_path = Path(MEDIA_ROOT) / Path(rel)
-
-    ext = _pick_ext(file)
-    dest = _brand_dir(obj.id) / f"logo{ext}"
-    _save_upload(file, dest)
+    _pick_ext(file)  # tür kontrolü (JPEG/PNG/WebP)
+    url = images.store_upload(file, public=True).url
 
-    # Farklı uzantıya geçtiyse eski dosyayı sil
-    if old_path and old_path.resolve() != dest.resolve():
-        _remove_file_safely(old_path)
-
-    url = _static_url_with_version(dest)
+    # Eski dosya commit'ten sonra silinir
+    if old_url != url:
+        images.discard_after_commit(db, old_url)
     obj = crud.brand_set_logo(db, obj, url)
     return {"brand_id": obj.id, "logo_url": obj.logo_url}
 
@@ -149,17 +94,19 @@ def delete_my_brand_logo(db: Session = Depends(get_db), current_user: AppUser =
     obj = crud.brand_get_single(db, current_user.id)
     if not obj:
         return
-    if obj.logo_url:
-        rel = _strip_static_and_query(obj.logo_url)
-        fpath = Path(MEDIA_ROOT) / Path(rel)
-        _remove_file_safely(fpath)
+    images.discard_after_commit(db, obj.logo_url)
     crud.brand_clear_logo(db, obj)
     return
 
 @router.get("/image/file")
-def get_my_brand_logo_file(db: Session = Depends(get_db), current_user: AppUser = Depends(get_current_user)):
+def get_my_brand_logo_file(
+    request: Request,
+    size: Optional[str] = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
     """
-    Brand logosunu dosya (binary) olarak döndürür.
+    Brand logosunu dosya (binary) olarak döndürür (ETag ile; değişmediyse 304).
     """
     obj = crud.brand_get_single(db, current_user.id)
     if not obj:
@@ -167,8 +114,7 @@ def get_my_brand_logo_file(db: Session = Depends(get_db), current_user: AppUser
     if not obj.logo_url:
         raise HTTPException(status_code=404, detail="Bu brand için logo yok")
 
-    rel = _strip_static_and_query(obj.logo_url)
-    fpath = Path(MEDIA_ROOT) / Path(rel)
+    fpath = images.resolve_path(obj.logo_url)
 
     if not fpath.exists():
         folder = _brand_dir(obj.id)
@@ -177,11 +123,4 @@ def get_my_brand_logo_file(db: Session = Depends(get_db), current_user: AppUser
             raise HTTPException(status_code=404, detail="Logo dosyası bulunamadı")
         fpath = candidates[0]
 
-    if not fpath.exists():
-        raise HTTPException(status_code=404, detail="Logo dosyası bulunamadı")
-
-    return FileResponse(
-        path=fpath,
-        media_type=_content_type_from_path(fpath),
-        headers={"Cache-Control": "no-store, max-age=0"}
-    )
+    return images.image_response(request, fpath, size=size)
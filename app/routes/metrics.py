@@ -0,0 +1,27 @@
+# app/routes/metrics.py
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.core.settings import settings
+from app.services import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """
+    Prometheus scrape ucu. METRICS_TOKEN tanımlıysa Bearer token ister.
+    async: threadpool/havuz metrikleri event loop içinde okunur.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("authorization", ""), expected):
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+    rendered = metrics.render_latest()
+    if rendered is None:
+        raise HTTPException(status_code=503, detail="prometheus_client kurulu değil")
+    body, content_type = rendered
+    return Response(content=body, media_type=content_type)
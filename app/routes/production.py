@@ -0,0 +1,127 @@
+# app/routes/production.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.db.session import get_db
+from app.core.security import get_current_user
+from app.models.app_user import AppUser
+from app.crud import production as crud
+from app.schemas.production import (
+    ProductionBatchCreate,
+    ProductionBatchOut,
+    ProductionBatchDetailOut,
+    ProductionBatchPageOut,
+    GlassNestingRequest,
+)
+from app.services import jobs
+
+router = APIRouter(prefix="/api/production", tags=["Production"])
+
+
+def _get_own_batch_or_404(db: Session, batch_id: UUID, current_user: AppUser):
+    batch = crud.get_batch(db, batch_id)
+    if not batch or batch.owner_id != current_user.id:
+        raise HTTPException(404, "Batch not found")
+    return batch
+
+
+@router.post("/batches", response_model=ProductionBatchOut, status_code=202)
+def create_production_batch(
+    payload: ProductionBatchCreate,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Seçili onaylı projeler için profil kesim optimizasyonu başlatır.
+    İş arka planda çalışır; durum/sonuç GET /batches/{id} ile izlenir.
+    """
+    invalid = crud.find_invalid_project_ids(db, current_user.id, payload.project_ids)
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Projeler bulunamadı veya onaylanmamış (teklif).",
+                "project_ids": [str(pid) for pid in invalid],
+            },
+        )
+
+    batch = crud.create_batch(
+        db,
+        owner_id=current_user.id,
+        project_ids=payload.project_ids,
+        name=payload.name,
+        params={
+            "time_budget_s": payload.time_budget_s,
+            "kerf_mm": payload.kerf_mm,
+            "stock_length_mm": payload.stock_length_mm,
+        },
+    )
+    jobs.submit_with_session(crud.run_profile_cutting_batch, batch.id)
+    return batch
+
+
+@router.get("/batches", response_model=ProductionBatchPageOut)
+def list_production_batches(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    items, total = crud.list_batches(db, current_user.id, limit=limit, offset=offset)
+    return {"items": items, "total": total, "limit": limit, "offset": offset}
+
+
+@router.get("/batches/{batch_id}", response_model=ProductionBatchDetailOut)
+def get_production_batch(
+    batch_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    return _get_own_batch_or_404(db, batch_id, current_user)
+
+
+@router.delete("/batches/{batch_id}", status_code=204)
+def delete_production_batch(
+    batch_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    batch = _get_own_batch_or_404(db, batch_id, current_user)
+    if batch.status == "running":
+        raise HTTPException(409, "Çalışan batch silinemez")
+    crud.delete_batch(db, batch)
+
+
+@router.post("/glass-nesting")
+def glass_nesting(
+    payload: GlassNestingRequest,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Seçili projelerin camlarını cam tipi bazında stok levhalara yerleştirir.
+    Senkron çalışır (süre bütçesi ≤ 30 sn); sonuç kaydedilmez.
+    """
+    invalid = crud.find_invalid_project_ids(db, current_user.id, payload.project_ids, approved_only=False)
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "Projeler bulunamadı.",
+                "project_ids": [str(pid) for pid in invalid],
+            },
+        )
+
+    return crud.optimize_glass_nesting(
+        db,
+        owner_id=current_user.id,
+        project_ids=payload.project_ids,
+        sheet_width_mm=payload.sheet_width_mm,
+        sheet_height_mm=payload.sheet_height_mm,
+        sheet_sizes={s.glass_type_id: (s.width_mm, s.height_mm) for s in payload.sheet_sizes},
+        kerf_mm=payload.kerf_mm,
+        allow_rotation=payload.allow_rotation,
+        time_budget_s=payload.time_budget_s,
+    )
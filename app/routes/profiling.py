@@ -0,0 +1,41 @@
+# app/routes/profiling.py
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.deps import get_current_admin
+from app.schemas.profiling import ProfileReportOut
+from app.services import profiling
+
+router = APIRouter(
+    prefix="/api/admin/profiles",
+    tags=["admin-profiles"],
+    dependencies=[Depends(get_current_admin)],
+)
+
+
+@router.get("", response_model=List[ProfileReportOut])
+def list_profile_reports():
+    """
+    Kaydedilmiş profil raporları (en yeni önce).
+    Profil almak için: admin token ile isteğe "X-Profile: 1" başlığı veya "?__profile=1" ekleyin;
+    cevaptaki X-Profile-Id bu listedeki id'dir.
+    """
+    return profiling.list_profiles()
+
+
+@router.get("/{profile_id}")
+def get_profile_report(profile_id: str):
+    """speedscope JSON'u (https://www.speedscope.app ile açılır)."""
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(404, "Profile not found")
+    return FileResponse(path=str(path), media_type="application/json", filename=path.name)
+
+
+@router.delete("/{profile_id}", status_code=204)
+def delete_profile_report(profile_id: str):
+    if not profiling.delete_profile(profile_id):
+        raise HTTPException(404, "Profile not found")
+    return
@@ -1,10 +1,11 @@
 # app/routes/project.py
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from math import ceil
+import hashlib
 
 from app.db.session import get_db
 from app.core.security import get_current_user
@@ -12,6 +13,9 @@ from app.models.app_user import AppUser
 from app.models.customer import Customer
 
 from app.utils.ownership import ensure_owner_or_404
+from app.core.responses import FastJSONResponse
+from app.services import catalog_cache
+from app.services.conditional_get import REVALIDATE, etag_matches
 
 from app.crud.project import (
     create_project,
@@ -24,7 +28,7 @@ from app.crud.project import (
     get_project_requirements,
     add_only_systems_to_project,
     add_only_extras_to_project,
-    get_project_requirements_detailed,
+    get_project_requirements_detailed_data,
     update_project_colors,
     update_project_code,
     create_project_extra_profile,
@@ -54,6 +58,7 @@ from app.crud.project import (
     bulk_update_system_glass_color_by_type,
     bulk_update_all_glass_colors_in_project,        # ⬅️ EKLE
     bulk_update_glass_colors_by_type_in_project,    # ⬅️ EKLE
+    clone_project,
 
 )
 
@@ -94,8 +99,13 @@ from app.schemas.project import (
     ProjectGlassColorByTypeIn,    # ⬅️ EKLE
     SingleGlassColorUpdate,
     ExtraGlassColorBulkUpdate,
+    ProjectRevisionOut,
+    ProjectCloneIn,
+    ProjectRepriceIn,
 )
 from app.crud.project import _SENTINEL
+from app.crud import project_revision as revision_crud
+from app.crud import repricing as repricing_crud
 
 from app.models.project import (
     Project,
@@ -142,6 +152,67 @@ def create_project_endpoint(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/reprice", response_model=dict)
+def reprice_open_quotes_endpoint(
+    payload: ProjectRepriceIn,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Açık tekliflerdeki (is_teklif=True) malzeme/kumanda birim fiyatlarını güncel katalogdan yeniler.
+    dry_run=True (varsayılan) ise sadece proje bazında fark raporu döner.
+    Bayi sadece kendi projelerini, admin owner_id ile belirli bir bayiyi veya tümünü fiyatlar.
+    """
+    sources = payload.sources or list(repricing_crud.REPRICE_SOURCES)
+    unknown = [s for s in sources if s not in repricing_crud.REPRICE_SOURCES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Geçersiz kaynak: {', '.join(unknown)}")
+
+    owner_id = payload.owner_id if current_user.role == "admin" else current_user.id
+
+    return repricing_crud.reprice_open_quotes(
+        db,
+        owner_id=owner_id,
+        project_ids=payload.project_ids,
+        customer_id=payload.customer_id,
+        created_from=payload.created_from,
+        created_to=payload.created_to,
+        sources=sources,
+        dry_run=payload.dry_run,
+    )
+
+
+@router.post("/{project_id}/clone", response_model=ProjectOut, status_code=201)
+def clone_project_endpoint(
+    project_id: UUID,
+    payload: Optional[ProjectCloneIn] = None,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Projeyi tüm sistem ve ekstra içeriğiyle sunucu tarafında kopyalar.
+    Yeni proje kodu kullanıcının kod kuralından alınır.
+    """
+    proj = get_project(db, project_id)
+    ensure_owner_or_404(proj, current_user.id, "created_by")
+
+    payload = payload or ProjectCloneIn()
+    try:
+        new_proj = clone_project(
+            db,
+            project_id,
+            created_by=current_user.id,
+            project_name=payload.project_name,
+            is_teklif=payload.is_teklif,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not new_proj:
+        raise HTTPException(404, "Project not found")
+    _attach_customer_name(db, new_proj)
+    return ProjectOut.from_orm(new_proj)
+
+
 @router.get("/", response_model=ProjectPageOut)
 def list_projects(
     name: str | None = Query(
@@ -393,13 +464,20 @@ def add_requirements_endpoint(
     proj = get_project(db, project_id)
     ensure_owner_or_404(proj, current_user.id, "created_by")
 
+    # Revizyon geçmişi olmayan eski projelerde mevcut hali kaybolmasın
+    if not revision_crud.has_revisions(db, project_id):
+        revision_crud.record_revision(db, project_id, user_id=current_user.id, note="baseline", commit=False)
+
     try:
-        proj = add_systems_to_project(db, project_id, payload)
-        _attach_customer_name(db, proj)  # ⬅️ EKLENDİ
-        return ProjectOut.from_orm(proj)
+        proj = add_systems_to_project(db, project_id, payload, commit=False)
     except ValueError:
         raise HTTPException(404, "Project not found")
 
+    # Kayıt + revizyon tek commit
+    revision_crud.record_revision(db, project_id, user_id=current_user.id, note="requirements")
+    _attach_customer_name(db, proj)  # ⬅️ EKLENDİ
+    return ProjectOut.from_orm(proj)
+
 
 
 @router.put("/{project_id}/requirements", response_model=ProjectOut)
@@ -414,13 +492,19 @@ def update_requirements_endpoint(
     proj = get_project(db, project_id)
     ensure_owner_or_404(proj, current_user.id, "created_by")
 
+    # Revizyon geçmişi olmayan eski projelerde mevcut hali kaybolmasın
+    if not revision_crud.has_revisions(db, project_id):
+        revision_crud.record_revision(db, project_id, user_id=current_user.id, note="baseline", commit=False)
+
     try:
-        proj_updated = update_systems_for_project(db, project_id, payload)
+        proj_updated = update_systems_for_project(db, project_id, payload, commit=False)
     except ValueError:
         raise HTTPException(404, "Project not found")
 
     if not proj_updated:
         raise HTTPException(404, "Project not found")
+    # Baseline + kayıt + revizyon tek commit
+    revision_crud.record_revision(db, project_id, user_id=current_user.id, note="requirements")
     _attach_customer_name(db, proj_updated)  # ⬅️ EKLENDİ
     return ProjectOut.from_orm(proj_updated)
 
@@ -571,9 +655,26 @@ def add_only_extras_endpoint(
 
 
 
+def _requirements_etag(db: Session, proj) -> str:
+    """
+    Detaylı gereksinim cevabının sürüm anahtarı: proje içerik sürümü (alt satırlar dahil)
+    + katalog sürümü (gömülü profil/cam/renk/sistem objeleri) + müşteri bilgisi.
+    Gövde üretilmeden hesaplanır → değişmediyse 304 için sorgu atılmaz.
+    """
+    customer = db.query(Customer).filter(Customer.id == proj.customer_id).first() if proj.customer_id else None
+    customer_key = "-"
+    if customer is not None:
+        customer_key = hashlib.blake2b(
+            repr((customer.name, customer.company_name, customer.phone, customer.city, customer.is_deleted)).encode("utf-8"),
+            digest_size=6,
+        ).hexdigest()
+    return f'W/"req-{proj.content_version}-{catalog_cache.current_version(db)}-{customer_key}"'
+
+
 @router.get("/{project_id}/requirements-detailed", response_model=ProjectRequirementsDetailedOut)
 def get_detailed_requirements_endpoint(
     project_id: UUID,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: AppUser = Depends(get_current_user),
 ):
@@ -582,8 +683,14 @@ def get_detailed_requirements_endpoint(
     proj = get_project(db, project_id)
     ensure_owner_or_404(proj, current_user.id, "created_by")
 
+    # Sürümler gövdeden ÖNCE okunur: arada değişiklik olursa ETag eski kalır, sonraki istek tam cevap alır
+    headers = {"ETag": _requirements_etag(db, proj), "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
     try:
-        return get_project_requirements_detailed(db, project_id)
+        # Düz dict + orjson: response_model (OpenAPI) aynı, ikinci doğrulama yok
+        return FastJSONResponse(get_project_requirements_detailed_data(db, project_id), headers=headers)
     except ValueError:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -1158,11 +1265,11 @@ def update_project_system_endpoint(
         raise HTTPException(status_code=404, detail="Project system not found")
 
     # Güncel tek sistemi detaylı modelle döndür
-    details = get_project_requirements_detailed(db, project_id)
-    target = next((s for s in details.systems if s.project_system_id == project_system_id), None)
+    details = get_project_requirements_detailed_data(db, project_id)
+    target = next((s for s in details["systems"] if s["project_system_id"] == project_system_id), None)
     if not target:
         raise HTTPException(status_code=404, detail="Project system not found")
-    return target
+    return FastJSONResponse(target)
 
 
 
@@ -1182,3 +1289,57 @@ def delete_project_system_endpoint(
     if not success:
         raise HTTPException(status_code=404, detail="Project system not found")
     return
+
+
+# ───────── Revizyonlar ─────────
+
+@router.get("/{project_id}/revisions", response_model=List[ProjectRevisionOut])
+def list_revisions_endpoint(
+    project_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """Projenin revizyon listesi (yeniden eskiye). İçerik blob'ları okunmaz."""
+    proj = get_project(db, project_id)
+    ensure_owner_or_404(proj, current_user.id, "created_by")
+    return revision_crud.list_revisions(db, project_id)
+
+
+@router.get("/{project_id}/revisions/{revision_no}")
+def get_revision_endpoint(
+    project_id: UUID,
+    revision_no: int,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """Revizyondaki sistem + ekstra içeriğin ham snapshot'ı."""
+    proj = get_project(db, project_id)
+    ensure_owner_or_404(proj, current_user.id, "created_by")
+
+    snapshot = revision_crud.load_snapshot(db, project_id, revision_no)
+    if snapshot is None:
+        raise HTTPException(404, "Revision not found")
+    return {"revision_no": revision_no, "snapshot": snapshot}
+
+
+@router.post("/{project_id}/revisions/{revision_no}/restore", response_model=ProjectOut)
+def restore_revision_endpoint(
+    project_id: UUID,
+    revision_no: int,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """Projeyi verilen revizyona döndürür (yeni bir revizyon olarak kaydedilir)."""
+    proj = get_project(db, project_id)
+    ensure_owner_or_404(proj, current_user.id, "created_by")
+
+    try:
+        proj = revision_crud.restore_revision(db, project_id, revision_no, user_id=current_user.id)
+    except ValueError:
+        raise HTTPException(404, "Revision not found")
+    except revision_crud.RevisionRestoreError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not proj:
+        raise HTTPException(404, "Project not found")
+    _attach_customer_name(db, proj)
+    return ProjectOut.from_orm(proj)
@@ -0,0 +1,42 @@
+# app/routes/sync.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.core.responses import render
+from app.core.security import get_current_user
+from app.crud import sync as sync_crud
+from app.db.session import get_db
+from app.models.app_user import AppUser
+from app.services.conditional_get import REVALIDATE, etag_matches
+
+router = APIRouter(prefix="/api/sync", tags=["Sync"])
+
+
+@router.get("")
+def get_sync(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="İstemcideki son imleç (cursor); verilmezse tüm veri döner"),
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Bayinin projeleri, müşterileri ve proje satırları — since'ten sonra değişenler ve
+    silinenlerin id'leri (tombstone). Cevaptaki "cursor" bir sonraki istekte since olarak gönderilir.
+    Doküman kompakt: {"fields": [...], "rows": [[...]], "deleted": [...]} (gzip/br ile sıkıştırılır).
+    """
+    # İmleç veriden ÖNCE okunur ve hâlâ açık transaction'ların altında kalır: geç commit olan
+    # değişiklik bir sonraki delta'da gelir; imleçten sonra görünen satır iki kez gelebilir (zararsız)
+    cursor = sync_crud.current_cursor(db)
+    base = "full" if since is None else since
+    etag = f'W/"sync-{current_user.id}-{base}-{cursor}"'
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE, "X-Sync-Cursor": str(cursor)}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if since is None:
+        doc = sync_crud.build_full(db, current_user.id, cursor)
+    else:
+        doc = sync_crud.build_delta(db, current_user.id, since, cursor)
+    return Response(content=render(doc), media_type="application/json", headers=headers)
@@ -1,12 +1,9 @@
 # app/routes/system.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-import os, shutil
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response
+import os
 from sqlalchemy.orm import Session
 from uuid import UUID
-from fastapi.responses import FileResponse
-from pathlib import Path
-from sqlalchemy import asc, desc
 
 from app.db.session import get_db
 
@@ -20,6 +17,11 @@ from app.models.app_user import AppUser
 
 # 🔎 Model erişimleri (GET filtreleri için)
 from app.models.system import System, SystemVariant
+from app.services import system_tree_cache
+from app.services import images
+from app.services.conditional_get import REVALIDATE, etag_matches
+from app.core.responses import FastJSONResponse, dump
+from app.crud.ordering import bulk_set_sort_index, lock_scope, move_item
 
 from app.crud.system import (
     create_system,
@@ -154,6 +156,23 @@ def list_systems(
 
 
 
+@router.get("/systems/tree", summary="Yayındaki sistemler → varyantlar → şablonlar (tek istek)")
+def get_published_system_tree_endpoint(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: AppUser = Depends(get_current_user),
+):
+    """
+    Sistem seçici + varyant açılışı için tek doküman. Önbellekten byte olarak döner;
+    ETag eşleşirse 304. Sistem/varyant/şablon değişikliğinde önbellek yenilenir.
+    """
+    etag, body = system_tree_cache.get_tree(db)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("/systems/{system_id}", response_model=SystemOut)
 def get_system_endpoint(
     system_id: UUID,
@@ -227,59 +246,59 @@ def fetch_system_templates(
     profiles, glasses, materials, remotes = get_system_templates(db, variant_id)  # 🆕
 
 
-    return SystemTemplatesOut(
-        profileTemplates=[
-            ProfileTemplateOut(
-                profile_id=tpl.profile_id,
-                formula_cut_length=tpl.formula_cut_length,
-                formula_cut_count=tpl.formula_cut_count,
-                order_index=tpl.order_index,
+    # Düz dict + orjson: response_model (OpenAPI) aynı, ikinci doğrulama yok
+    return FastJSONResponse(dump(SystemTemplatesOut, {
+        "profileTemplates": [
+            {
+                "profile_id": tpl.profile_id,
+                "formula_cut_length": tpl.formula_cut_length,
+                "formula_cut_count": tpl.formula_cut_count,
+                "order_index": tpl.order_index,
                 # 👇 NEW
-                is_painted=bool(getattr(tpl, "is_painted", False)),
-                profile=tpl.profile,
-                pdf=tpl.pdf
-            )
+                "is_painted": bool(getattr(tpl, "is_painted", False)),
+                "profile": tpl.profile,
+                "pdf": tpl.pdf,
+            }
             for tpl in profiles
         ],
-        glassTemplates=[
-            GlassTemplateOut(
-                glass_type_id=tpl.glass_type_id,
-                formula_width=tpl.formula_width,
-                formula_height=tpl.formula_height,
-                formula_count=tpl.formula_count,
-                order_index=tpl.order_index,
-                glass_type=tpl.glass_type,
-                pdf=tpl.pdf
-            )
+        "glassTemplates": [
+            {
+                "glass_type_id": tpl.glass_type_id,
+                "formula_width": tpl.formula_width,
+                "formula_height": tpl.formula_height,
+                "formula_count": tpl.formula_count,
+                "order_index": tpl.order_index,
+                "glass_type": tpl.glass_type,
+                "pdf": tpl.pdf,
+            }
             for tpl in glasses
         ],
-        materialTemplates=[
-            MaterialTemplateOut(
-                material_id=tpl.material_id,
-                formula_quantity=tpl.formula_quantity,
-                formula_cut_length=tpl.formula_cut_length,
-                type=tpl.type,
-                piece_length_mm=tpl.piece_length_mm,
-                order_index=tpl.order_index,
-                material=tpl.material,
-                pdf=tpl.pdf
-            )
+        "materialTemplates": [
+            {
+                "material_id": tpl.material_id,
+                "formula_quantity": tpl.formula_quantity,
+                "formula_cut_length": tpl.formula_cut_length,
+                "type": tpl.type,
+                "piece_length_mm": tpl.piece_length_mm,
+                "order_index": tpl.order_index,
+                "material": tpl.material,
+                "pdf": tpl.pdf,
+            }
             for tpl in materials
         ],
-        remoteTemplates=[
-            RemoteTemplateOut(
-                id=tpl.id,
-                system_variant_id=tpl.system_variant_id,
-                remote_id=tpl.remote_id,
-                order_index=tpl.order_index,
-                created_at=tpl.created_at,
-                remote=tpl.remote,
-                pdf=_pdf_flags_from_tpl(tpl),
-            )
+        "remoteTemplates": [
+            {
+                "id": tpl.id,
+                "system_variant_id": tpl.system_variant_id,
+                "remote_id": tpl.remote_id,
+                "order_index": tpl.order_index,
+                "created_at": tpl.created_at,
+                "remote": tpl.remote,
+                "pdf": _pdf_flags_from_tpl(tpl),
+            }
             for tpl in remotes
         ],
-
-    )
+    }))
 
 
 @router.get(
@@ -516,21 +535,13 @@ def upload_or_replace_system_photo(
     if not obj:
         raise HTTPException(404, "System not found")
 
-    # Eski fotoğraf varsa sil
-    if obj.photo_url:
-        old_path = os.path.join(BASE_DIR, obj.photo_url)
-        if os.path.exists(old_path):
-            os.remove(old_path)
-
-    # Yeni fotoğrafı yükle
-    ext = os.path.splitext(file.filename)[-1]
-    filename = f"{system_id}{ext}"
-    full_path = os.path.join(SYSTEM_PHOTO_DIR, filename)
-
-    with open(full_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # İçerik adresli sakla (küçük boyutlar arka planda üretilir)
+    old_photo = obj.photo_url
+    photo_url = images.store_upload(file).url
 
-    photo_url = f"system_photos/{filename}"
+    # Eski dosya commit'ten sonra silinir (başka kayıt kullanmıyorsa); hata olursa yerinde kalır
+    if old_photo != photo_url:
+        images.discard_after_commit(db, old_photo, BASE_DIR)
     update_system(db, system_id, SystemUpdate(photo_url=photo_url))
 
     return {
@@ -548,10 +559,7 @@ def delete_system_photo(
     if not obj or not obj.photo_url:
         raise HTTPException(404, "Fotoğraf bulunamadı")
 
-    photo_path = os.path.join(BASE_DIR, obj.photo_url)
-    if os.path.exists(photo_path):
-        os.remove(photo_path)
-
+    images.discard_after_commit(db, obj.photo_url, BASE_DIR)
     update_system(db, system_id, SystemUpdate(photo_url=None))
 
     return {"message": "Fotoğraf silindi"}
@@ -560,6 +568,8 @@ def delete_system_photo(
 @router.get("/systems/{system_id}/photo", summary="Sisteme ait fotoğrafı döner")
 def get_system_photo_file(
     system_id: UUID,
+    request: Request,
+    size: str | None = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
     db: Session = Depends(get_db),
     current_user: AppUser = Depends(get_current_user),
 ):
@@ -572,19 +582,14 @@ def get_system_photo_file(
     if current_user.role != "admin" and (obj.is_deleted or not obj.is_published):
         raise HTTPException(404, "Fotoğraf bilgisi bulunamadı")
 
-    # system_photos klasörünü proje kök dizinine göre belirle
-    BASE_DIR_LOCAL = Path(__file__).resolve().parent.parent.parent
-    SYSTEM_PHOTO_DIR_LOCAL = BASE_DIR_LOCAL / "system_photos"
-
-    # Dosya adı sadece UUID.png (veya uzantısı neyse)
-    filename = Path(obj.photo_url).name
-    photo_path = SYSTEM_PHOTO_DIR_LOCAL / filename
+    # Yeni kayıtlar /api/images/..., eskiler system_photos/<id>.<ext> (proje köküne göre)
+    photo_path = images.resolve_path(obj.photo_url, BASE_DIR)
 
     # Dosya gerçekten varsa göster
     if not photo_path.exists():
-        raise HTTPException(404, f"Fotoğraf dosyası bulunamadı: {photo_path}")
+        raise HTTPException(404, f"Fotoğraf dosyası bulunamadı: {photo_path.name}")
 
-    return FileResponse(path=str(photo_path), media_type="image/jpeg")
+    return images.image_response(request, photo_path, size=size)
 
 @router.put("/systems/{system_id}/publish", response_model=SystemOut, dependencies=[Depends(get_current_admin)])
 def publish_system(
@@ -652,6 +657,9 @@ def reorder_systems(
     if not payload.items:
         raise HTTPException(status_code=400, detail="Boş liste gönderilemez")
 
+    # Taşıma / arka plan yeniden numaralama ile aynı kilit
+    lock_scope(db, "system")
+
     # Doğrulama: tüm id'ler var mı ve silinmemiş mi?
     ids = [it.id for it in payload.items]
     existing = (
@@ -664,12 +672,8 @@ def reorder_systems(
     if missing:
         raise HTTPException(status_code=404, detail=f"Bulunamadı/silinmiş id'ler: {', '.join(missing)}")
 
-    # Güncelleme (transaction)
-    for it in payload.items:
-        db.query(System).filter(System.id == it.id).update(
-            {"sort_index": int(it.sort_index)},
-            synchronize_session=False
-        )
+    # Tek UPDATE ... FROM (VALUES ...)
+    bulk_set_sort_index(db, System, [(it.id, it.sort_index) for it in payload.items])
     db.commit()
 
     return {"message": "Sıralama güncellendi", "updated": len(payload.items)}
@@ -681,42 +685,9 @@ def move_system(
     steps: int = Query(1, ge=1, le=50, description="Kaç adım taşınacağı (varsayılan 1)"),
     db: Session = Depends(get_db),
 ):
-    obj = get_system(db, system_id)
-    if not obj or obj.is_deleted:
+    # Aralıklı sort_index: komşuların ortasına tek satır UPDATE (yer yoksa kapsam yeniden numaralanır)
+    if move_item(db, "system", system_id, direction, steps) is None:
         raise HTTPException(404, "System not found")
 
-    # Her adımda komşu ile yer değiştir
-    for _ in range(steps):
-        cur_idx = obj.sort_index
-
-        if direction == "up":
-            neighbor = (
-                db.query(System)
-                .filter(System.is_deleted == False, System.sort_index < cur_idx)
-                .order_by(desc(System.sort_index))
-                .first()
-            )
-        else:  # "down"
-            neighbor = (
-                db.query(System)
-                .filter(System.is_deleted == False, System.sort_index > cur_idx)
-                .order_by(asc(System.sort_index))
-                .first()
-            )
-
-        if not neighbor:
-            # En üstte/en altta ise daha ileri hareket yok
-            break
-
-        # swap
-        neighbor_idx = neighbor.sort_index
-        db.query(System).filter(System.id == obj.id).update({"sort_index": neighbor_idx}, synchronize_session=False)
-        db.query(System).filter(System.id == neighbor.id).update({"sort_index": cur_idx}, synchronize_session=False)
-        db.flush()
-
-        # obj’nin güncel değerini çek
-        db.refresh(obj)
-
-    db.commit()
-    db.refresh(obj)
+    obj = get_system(db, system_id)
     return obj
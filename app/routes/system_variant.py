@@ -1,13 +1,10 @@
 # app/routes/system_variant.py
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Request
 from sqlalchemy.orm import Session
 from uuid import UUID
 import os, shutil
-from fastapi.responses import FileResponse
-from pathlib import Path
 from math import ceil
-from sqlalchemy import asc, desc
 
 from app.db.session import get_db
 
@@ -18,6 +15,8 @@ from app.models.app_user import AppUser
 
 # 🔎 filtreler için modeller
 from app.models.system import System, SystemVariant
+from app.crud.ordering import bulk_set_sort_index, lock_scope, move_item
+from app.services import images
 
 from app.crud.system_variant import (
     create_system_variant,
@@ -34,6 +33,7 @@ from app.crud.system import (
     create_system_variant_with_templates,
     get_system_variant_detail,
     update_system_variant_with_templates,
+    clone_system_variant,
 )
 
 from app.schemas.system import (
@@ -42,9 +42,11 @@ from app.schemas.system import (
     SystemVariantOut,
     SystemVariantCreateWithTemplates,
     SystemVariantDetailOut,
+    SystemVariantUpdateOut,
     SystemVariantUpdateWithTemplates,
     SystemVariantPageOut,
     SystemVariantReassignIn,   
+    SystemVariantCloneIn,
     SystemVariantReorderIn, 
 )
 
@@ -54,15 +56,6 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 VARIANT_PHOTO_DIR = os.path.join(BASE_DIR, "variant_photos")
 
 
-def _media_type_for_image(path: Path) -> str:
-    ext = path.suffix.lower()
-    if ext in (".png",):
-        return "image/png"
-    if ext in (".webp",):
-        return "image/webp"
-    return "image/jpeg"
-
-
 # -----------------------------------------------------------------------------
 # GET uçları: bayi + admin (bayi → sadece published & not-deleted)
 # -----------------------------------------------------------------------------
@@ -186,6 +179,8 @@ def list_variants_by_system(
 @router.get("/{variant_id}/photo", summary="Variant'a ait fotoğrafı döner")
 def get_variant_photo_file(
     variant_id: UUID,
+    request: Request,
+    size: str | None = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
     db: Session = Depends(get_db),
     current_user: AppUser = Depends(get_current_user),
 ):
@@ -201,22 +196,20 @@ def get_variant_photo_file(
         if not sys or sys.is_deleted or not sys.is_published:
             raise HTTPException(404, "Variant için fotoğraf bilgisi bulunamadı")
 
-    # Klasör yolu: proje kökü / variant_photos /
-    BASE_DIR_LOCAL = Path(__file__).resolve().parent.parent.parent
-    VARIANT_PHOTO_DIR_LOCAL = BASE_DIR_LOCAL / "variant_photos"
-
-    filename = Path(obj.photo_url).name
-    photo_path = VARIANT_PHOTO_DIR_LOCAL / filename
+    # Yeni kayıtlar /api/images/..., eskiler variant_photos/<id>.<ext> (proje köküne göre)
+    photo_path = images.resolve_path(obj.photo_url, BASE_DIR)
 
     if not photo_path.exists():
-        raise HTTPException(404, f"Fotoğraf dosyası bulunamadı: {photo_path}")
+        raise HTTPException(404, f"Fotoğraf dosyası bulunamadı: {photo_path.name}")
 
-    return FileResponse(path=str(photo_path), media_type="image/jpeg")
+    return images.image_response(request, photo_path, size=size)
 
 
 @router.get("/{variant_id}/pdf-photo", summary="Variant'a ait PDF foto çıktısını döner")
 def get_variant_pdf_photo_file(
     variant_id: UUID,
+    request: Request,
+    size: str | None = Query(None, regex=images.SIZE_PATTERN, description="thumb | medium (boşsa orijinal)"),
     db: Session = Depends(get_db),
     current_user: AppUser = Depends(get_current_user),
 ):
@@ -231,16 +224,12 @@ def get_variant_pdf_photo_file(
         if not sys or sys.is_deleted or not sys.is_published:
             raise HTTPException(404, "Variant için PDF foto bilgisi bulunamadı")
 
-    BASE_DIR_LOCAL = Path(__file__).resolve().parent.parent.parent
-    VARIANT_PHOTO_DIR_LOCAL = BASE_DIR_LOCAL / "variant_photos"
-
-    filename = Path(obj.pdf_foto_cikti).name
-    photo_path = VARIANT_PHOTO_DIR_LOCAL / filename
+    photo_path = images.resolve_path(obj.pdf_foto_cikti, BASE_DIR)
 
     if not photo_path.exists():
-        raise HTTPException(404, f"PDF fotoğraf dosyası bulunamadı: {photo_path}")
+        raise HTTPException(404, f"PDF fotoğraf dosyası bulunamadı: {photo_path.name}")
 
-    return FileResponse(path=str(photo_path), media_type=_media_type_for_image(photo_path))
+    return images.image_response(request, photo_path, size=size)
 
 
 # -----------------------------------------------------------------------------
@@ -316,25 +305,13 @@ def upload_or_replace_variant_photo(
     if not obj:
         raise HTTPException(404, "Variant not found")
 
-    # Eski fotoğraf varsa sil
-    if obj.photo_url:
-        old_path = os.path.join(BASE_DIR, obj.photo_url)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    # İçerik adresli sakla (küçük boyutlar arka planda üretilir)
+    old_photo = obj.photo_url
+    photo_url = images.store_upload(file).url
 
-    # Klasör yoksa oluştur
-    if not os.path.exists(VARIANT_PHOTO_DIR):
-        os.makedirs(VARIANT_PHOTO_DIR, exist_ok=True)
-
-    # Yeni fotoğrafı yükle
-    ext = os.path.splitext(file.filename)[-1]
-    filename = f"{variant_id}{ext}"
-    full_path = os.path.join(VARIANT_PHOTO_DIR, filename)
-
-    with open(full_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    photo_url = f"variant_photos/{filename}"
+    # Eski dosya commit'ten sonra silinir (başka kayıt kullanmıyorsa); hata olursa yerinde kalır
+    if old_photo != photo_url:
+        images.discard_after_commit(db, old_photo, BASE_DIR)
     update_system_variant(db, variant_id, SystemVariantUpdate(photo_url=photo_url))
 
     return {
@@ -352,10 +329,7 @@ def delete_variant_photo(
     if not obj or not obj.photo_url:
         raise HTTPException(404, "Fotoğraf bulunamadı")
 
-    photo_path = os.path.join(BASE_DIR, obj.photo_url)
-    if os.path.exists(photo_path):
-        os.remove(photo_path)
-
+    images.discard_after_commit(db, obj.photo_url, BASE_DIR)
     update_system_variant(db, variant_id, SystemVariantUpdate(photo_url=None))
 
     return {"message": "Fotoğraf silindi"}
@@ -371,22 +345,11 @@ def upload_or_replace_variant_pdf_photo(
     if not obj:
         raise HTTPException(404, "Variant not found")
 
-    if obj.pdf_foto_cikti:
-        old_path = os.path.join(BASE_DIR, obj.pdf_foto_cikti)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    old_photo = obj.pdf_foto_cikti
+    pdf_photo_url = images.store_upload(file).url
 
-    if not os.path.exists(VARIANT_PHOTO_DIR):
-        os.makedirs(VARIANT_PHOTO_DIR, exist_ok=True)
-
-    ext = os.path.splitext(file.filename)[-1]
-    filename = f"{variant_id}_pdf{ext}"
-    full_path = os.path.join(VARIANT_PHOTO_DIR, filename)
-
-    with open(full_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    pdf_photo_url = f"variant_photos/{filename}"
+    if old_photo != pdf_photo_url:
+        images.discard_after_commit(db, old_photo, BASE_DIR)
     update_system_variant(db, variant_id, SystemVariantUpdate(pdf_foto_cikti=pdf_photo_url))
 
     return {
@@ -404,10 +367,7 @@ def delete_variant_pdf_photo(
     if not obj or not obj.pdf_foto_cikti:
         raise HTTPException(404, "PDF fotoğraf bulunamadı")
 
-    photo_path = os.path.join(BASE_DIR, obj.pdf_foto_cikti)
-    if os.path.exists(photo_path):
-        os.remove(photo_path)
-
+    images.discard_after_commit(db, obj.pdf_foto_cikti, BASE_DIR)
     update_system_variant(db, variant_id, SystemVariantUpdate(pdf_foto_cikti=None))
     return {"message": "PDF fotoğraf silindi"}
 
@@ -432,7 +392,7 @@ def create_variant_with_templates_endpoint(
 
 @router.put(
     "/{variant_id}/templates",
-    response_model=SystemVariantDetailOut,
+    response_model=SystemVariantUpdateOut,
     summary="Bir SystemVariant ve tüm profil/cam/malzeme şablonlarını güncelle",
     dependencies=[Depends(get_current_admin)],
 )
@@ -443,15 +403,75 @@ def update_variant_templates_endpoint(
 ):
     """
     Mevcut bir variant’ın adını ve ilişkili tüm şablonlarını günceller.
+    template_changes: gerçekten eklenen / güncellenen / silinen şablon id'leri (tür bazında);
+    hiçbir şey değişmediyse listeler boş döner ve önbellekler boşaltılmaz.
     """
     try:
-        variant = update_system_variant_with_templates(db, variant_id, payload)
+        variant, changes = update_system_variant_with_templates(db, variant_id, payload)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
     detail = get_system_variant_detail(db, variant.id)
     if not detail:
         raise HTTPException(status_code=500, detail="Unable to fetch updated variant detail")
+    return SystemVariantUpdateOut(
+        **SystemVariantDetailOut.from_orm(detail).dict(),
+        template_changes=changes,
+    )
+
+
+def _copy_variant_file(rel_path: str | None, filename_stem: str) -> str | None:
+    """variant_photos altındaki dosyayı yeni ada kopyalar; kaynak yoksa None."""
+    if not rel_path:
+        return None
+    if images.is_content_addressed(rel_path):
+        # İçerik adresli dosya paylaşılır; discard referans kalmadıkça silmez
+        return rel_path
+    src = os.path.join(BASE_DIR, rel_path)
+    if not os.path.exists(src):
+        return None
+    os.makedirs(VARIANT_PHOTO_DIR, exist_ok=True)
+    filename = f"{filename_stem}{os.path.splitext(src)[-1]}"
+    shutil.copy2(src, os.path.join(VARIANT_PHOTO_DIR, filename))
+    return f"variant_photos/{filename}"
+
+
+@router.post(
+    "/{variant_id}/clone",
+    response_model=SystemVariantDetailOut,
+    status_code=201,
+    summary="Bir SystemVariant'ı tüm şablonlarıyla kopyala",
+    dependencies=[Depends(get_current_admin)],
+)
+def clone_variant_endpoint(
+    variant_id: UUID,
+    payload: SystemVariantCloneIn | None = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Varyantı profil/cam/malzeme/kumanda şablonlarıyla sunucu tarafında kopyalar.
+    system_id verilirse kopya o sisteme eklenir. Kopya yayınsız (draft) başlar.
+    """
+    payload = payload or SystemVariantCloneIn()
+    src = get_system_variant(db, variant_id)
+    src_photo, src_pdf_photo = (src.photo_url, src.pdf_foto_cikti) if src else (None, None)
+    try:
+        clone = clone_system_variant(db, variant_id, payload.system_id, payload.name)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if not clone:
+        raise HTTPException(status_code=404, detail="Variant not found")
+
+    # Eski (id adlı) foto yolları paylaşılmaz: kaynağın fotoğrafı değişince/silinince dosya gider
+    if payload.copy_photos and (src_photo or src_pdf_photo):
+        update_system_variant(db, clone.id, SystemVariantUpdate(
+            photo_url=_copy_variant_file(src_photo, f"{clone.id}"),
+            pdf_foto_cikti=_copy_variant_file(src_pdf_photo, f"{clone.id}_pdf"),
+        ))
+
+    detail = get_system_variant_detail(db, clone.id)
+    if not detail:
+        raise HTTPException(status_code=500, detail="Unable to fetch cloned variant detail")
     return detail
 
 
@@ -552,6 +572,9 @@ def reorder_variants_of_system(
 
     ids = [it.id for it in payload.items]
 
+    # Taşıma / arka plan yeniden numaralama ile aynı kilit
+    lock_scope(db, "system_variant", system_id)
+
     # Varlık ve sahiplik doğrulaması (hepsi aynı system'e ait ve silinmemiş olmalı)
     rows = (
         db.query(SystemVariant.id, SystemVariant.system_id)
@@ -570,12 +593,8 @@ def reorder_variants_of_system(
     if wrong_parent:
         raise HTTPException(status_code=400, detail=f"Bu varyantlar verilen system'e ait değil: {', '.join(wrong_parent)}")
 
-    # Güncelleme (transaction)
-    for it in payload.items:
-        db.query(SystemVariant).filter(SystemVariant.id == it.id).update(
-            {"sort_index": int(it.sort_index)},
-            synchronize_session=False
-        )
+    # Tek UPDATE ... FROM (VALUES ...)
+    bulk_set_sort_index(db, SystemVariant, [(it.id, it.sort_index) for it in payload.items])
     db.commit()
 
     return {"message": "Varyant sıralaması güncellendi", "updated": len(payload.items)}
@@ -587,49 +606,8 @@ def move_variant(
     steps: int = Query(1, ge=1, le=50),
     db: Session = Depends(get_db),
 ):
-    v = get_system_variant(db, variant_id)
-    if not v or v.is_deleted:
+    # Sıralama aynı system içinde; aralıklı sort_index → genelde tek satır UPDATE
+    if move_item(db, "system_variant", variant_id, direction, steps) is None:
         raise HTTPException(status_code=404, detail="Variant not found")
 
-    # Sıralama aynı system içinde
-    system_id = v.system_id
-
-    for _ in range(steps):
-        cur_idx = v.sort_index
-
-        if direction == "up":
-            neighbor = (
-                db.query(SystemVariant)
-                .filter(
-                    SystemVariant.system_id == system_id,
-                    SystemVariant.is_deleted == False,
-                    SystemVariant.sort_index < cur_idx,
-                )
-                .order_by(desc(SystemVariant.sort_index))
-                .first()
-            )
-        else:  # "down"
-            neighbor = (
-                db.query(SystemVariant)
-                .filter(
-                    SystemVariant.system_id == system_id,
-                    SystemVariant.is_deleted == False,
-                    SystemVariant.sort_index > cur_idx,
-                )
-                .order_by(asc(SystemVariant.sort_index))
-                .first()
-            )
-
-        if not neighbor:
-            # En üst/en alt, daha fazla hareket yok
-            break
-
-        neighbor_idx = neighbor.sort_index
-        db.query(SystemVariant).filter(SystemVariant.id == v.id).update({"sort_index": neighbor_idx}, synchronize_session=False)
-        db.query(SystemVariant).filter(SystemVariant.id == neighbor.id).update({"sort_index": cur_idx}, synchronize_session=False)
-        db.flush()
-        db.refresh(v)
-
-    db.commit()
-    db.refresh(v)
-    return v
+    return get_system_variant(db, variant_id)
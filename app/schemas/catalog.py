@@ -137,3 +137,38 @@ class RemotePageOut(BaseModel):
     total_pages: int
     has_next: bool
     has_prev: bool
+
+# ------- Toplu içe aktarma (CSV / XLSX)
+
+class CatalogImportRowError(BaseModel):
+    line: int                      # dosyadaki satır no (başlık = 1)
+    key: Optional[str] = None      # profil_kodu / cam_isim / diger_malzeme_isim
+    error: str
+
+class CatalogImportResult(BaseModel):
+    entity: str
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    matched: int                   # mevcut kayıtla eşleşen geçerli satır
+    updated: int
+    inserted: int
+    unchanged: int
+    error_count: int
+    errors: List[CatalogImportRowError]   # ilk 500 hata
+
+# ------- Fiyat geçmişi (tarih etkili)
+
+class CatalogPriceIn(BaseModel):
+    price: Optional[float] = Field(None, ge=0)
+    effective_from: Optional[datetime] = None   # boş → şimdi; ileri tarih → planlı fiyat
+
+class CatalogPriceOut(BaseModel):
+    item_type: str
+    item_id: UUID
+    price: Optional[float] = None
+    effective_from: datetime
+    created_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
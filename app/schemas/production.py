@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class ProductionBatchCreate(BaseModel):
+    project_ids: List[UUID] = Field(..., min_items=1, description="Onaylı (is_teklif=False) projeler")
+    name: Optional[str] = Field(None, max_length=100)
+    time_budget_s: float = Field(20.0, ge=1, le=120, description="Optimizasyon süre bütçesi (sn)")
+    kerf_mm: Optional[float] = Field(None, ge=0, description="Boşsa kullanıcının bıçak payı kullanılır")
+    stock_length_mm: Optional[float] = Field(None, gt=0, description="Boşsa profilin boy uzunluğu kullanılır")
+
+
+class ProductionBatchOut(BaseModel):
+    id: UUID
+    name: Optional[str] = None
+    kind: str
+    status: str
+    project_ids: List[UUID]
+    params: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
+class ProductionBatchDetailOut(ProductionBatchOut):
+    result: Optional[Dict[str, Any]] = None
+
+
+class ProductionBatchPageOut(BaseModel):
+    items: List[ProductionBatchOut]
+    total: int
+    limit: int
+    offset: int
+
+
+class GlassSheetSize(BaseModel):
+    glass_type_id: UUID
+    width_mm: float = Field(..., gt=0)
+    height_mm: float = Field(..., gt=0)
+
+
+class GlassNestingRequest(BaseModel):
+    project_ids: List[UUID] = Field(..., min_items=1)
+    sheet_width_mm: float = Field(3210, gt=0, description="Varsayılan stok levha genişliği")
+    sheet_height_mm: float = Field(2250, gt=0, description="Varsayılan stok levha yüksekliği")
+    sheet_sizes: List[GlassSheetSize] = Field(default_factory=list, description="Cam tipine özel levha ölçüleri")
+    kerf_mm: float = Field(0.0, ge=0, description="Kesim payı")
+    allow_rotation: bool = True
+    time_budget_s: float = Field(5.0, ge=0.5, le=30)
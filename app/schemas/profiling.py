@@ -0,0 +1,10 @@
+# app/schemas/profiling.py
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class ProfileReportOut(BaseModel):
+    id: str
+    size_bytes: int
+    created_at: datetime
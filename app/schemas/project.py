@@ -217,6 +217,7 @@ class ProjectOut(ProjectMeta):
     glass_status: str
     production_status: str
     approval_date: Optional[datetime] = None
+    content_version: int = 0  # alt satırlar dahil her değişiklikte artar (önbellek/ETag/senkron anahtarı)
 
     class Config:
         orm_mode = True
@@ -714,6 +715,38 @@ class ProjectGlassColorByTypeIn(BaseModel):
     glass_color_id_1: Optional[UUID] = None
     glass_color_id_2: Optional[UUID] = None
 
+# 🔹 Proje kopyalama
+class ProjectCloneIn(BaseModel):
+    project_name: Optional[str] = None     # boşsa kaynağın adı kullanılır
+    is_teklif: bool = True                 # kopya varsayılan olarak teklif açılır
+
+
+# 🔹 Açık tekliflerin toplu yeniden fiyatlanması
+class ProjectRepriceIn(BaseModel):
+    dry_run: bool = True                        # True → sadece fark raporu, yazma yok
+    project_ids: Optional[List[UUID]] = None    # boşsa tüm açık teklifler
+    customer_id: Optional[UUID] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    owner_id: Optional[UUID] = None             # sadece admin: belirli bayi (boşsa hepsi)
+    sources: Optional[List[str]] = None         # system_materials | extra_materials | system_remotes | extra_remotes
+
+
+# 🔹 Proje revizyonları
+class ProjectRevisionOut(BaseModel):
+    revision_no: int
+    kind: str                      # "full" | "delta"
+    raw_size: int
+    stored_size: int
+    summary: Optional[dict] = None
+    note: Optional[str] = None
+    created_by: Optional[UUID] = None
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+
 # --- Pydantic forward refs fix ---
 # --- Pydantic forward refs fix ---
 try:
@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from app.schemas.catalog import RemoteOut
 
@@ -418,6 +418,48 @@ class SystemVariantDetailOut(BaseModel):
     class Config:
         orm_mode = True
 
+
+class TemplateChangesOut(BaseModel):
+    inserted: List[UUID] = []
+    updated: List[UUID] = []
+    deleted: List[UUID] = []
+
+
+class SystemVariantUpdateOut(SystemVariantDetailOut):
+    # Bu kayıtta gerçekten değişen şablonlar: tür (profile|glass|material|remote) → id'ler.
+    # İstemci şablon id'sine bağlı önbelleklerini sadece bunlar için yeniler.
+    template_changes: Dict[str, TemplateChangesOut] = {}
+
+
+# ——————————————————————
+# Yayındaki sistem ağacı: System → Variant → şablonlar (tek istekte)
+class SystemTreeVariantOut(BaseModel):
+    id: UUID
+    name: str
+    photo_url: Optional[str] = None
+    pdf_foto_cikti: Optional[str] = None
+    is_active: bool
+    sort_index: int
+    profile_templates: List[ProfileTemplateOut]
+    glass_templates: List[GlassTemplateOut]
+    material_templates: List[MaterialTemplateOut]
+    remote_templates: List[RemoteTemplateOut]
+
+    class Config:
+        orm_mode = True
+
+class SystemTreeOut(BaseModel):
+    id: UUID
+    name: str
+    description: Optional[str] = None
+    photo_url: Optional[str] = None
+    is_active: bool
+    sort_index: int
+    variants: List[SystemTreeVariantOut]
+
+    class Config:
+        orm_mode = True
+
 # ——————————————————————
 # ——————————————————————
 # New: Bulk-create a SystemVariant with its templates
@@ -498,6 +540,12 @@ class SystemVariantReassignIn(BaseModel):
     system_id: UUID
 
 
+class SystemVariantCloneIn(BaseModel):
+    system_id: Optional[UUID] = None   # boşsa kaynakla aynı system
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)  # boşsa kaynağın adı
+    copy_photos: bool = True           # foto dosyaları kopyaya ayrı dosya olarak çoğaltılır
+
+
 # ——————————————————————
 # (Opsiyonel) Toplu sıralama (reorder) inputları
 class ReorderItem(BaseModel):
@@ -0,0 +1,237 @@
+# app/services/cache_bus.py
+"""
+Worker'lar (ve host'lar) arası önbellek geçersizleştirme: Postgres LISTEN/NOTIFY.
+
+Yayın:
+  - Her oturumda yazılan tablolar toplanır (ORM flush + toplu query.update()/delete()/insert);
+    sadece bir önbelleğin abone olduğu tablolar tutulur.
+  - Commit'ten hemen önce, transaction başına bir kez
+    `pg_notify('cache_invalidate', {"tables": [...], "origin": ...})` çalışır → mesaj sadece
+    COMMIT olursa dağıtılır, rollback'te hiç gitmez. İzlenen tablo yazılmadıysa NOTIFY yok
+    (NOTIFY commit'te global kuyruk kilidini alır; proje / token yazan commit'ler beklemesin).
+  - Katalog tablolarındaki trigger'lar da aynı kanala yazar (COPY / raw SQL yolları için).
+Dinleme:
+  - start() ile her worker'da bir daemon thread LISTEN eder, gelen tablo adlarına abone
+    önbellekleri boşaltır. Bağlantı koparsa / yeniden kurulursa tüm önbellekler boşaltılır.
+  - Kendi commit'lerimiz after_commit'te yerelde hemen uygulanır; aynı origin'den gelen
+    bildirim tekrar işlenmez.
+  - Başka kanallar da (ör. project_events) aynı bağlantıdan listen() ile dinlenir.
+"""
+import json
+import logging
+import os
+import select
+import socket
+import threading
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import psycopg2
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidate"
+RECONNECT_DELAY_S = 2.0
+POLL_TIMEOUT_S = 5.0
+
+_HOST = socket.gethostname()
+
+_WRITTEN = "cache_bus_written"      # bu transaction'da yazılan (izlenen) tablolar
+
+_subscribers: List[Tuple[frozenset, Callable[[], None]]] = []
+_watched: frozenset = frozenset()   # abonelerin tablolarının birleşimi
+_channels: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+_listener = None
+_listening = threading.Event()
+
+
+def _origin() -> str:
+    # fork sonrası (gunicorn --preload) her worker kendi pid'ini kullansın diye her seferinde hesaplanır
+    return f"{_HOST}:{os.getpid()}"
+
+
+def subscribe(tables: Iterable[str], evict: Callable[[], None]) -> None:
+    """tables içinden biri değişince evict() çağrılır (yerel commit + diğer worker'lar)."""
+    global _watched
+    tables = frozenset(tables)
+    _subscribers.append((tables, evict))
+    _watched = _watched | tables
+
+
+def listen(channel: str, handler: Callable[[Optional[str]], None]) -> None:
+    """
+    Ek kanal: gelen her mesajda handler(payload) dinleyici thread'inde çağrılır.
+    Bağlantı (yeniden) kurulunca handler(None) → arada kaçan mesaj olabilir.
+    start()'tan önce (modül import edilirken) çağrılmalı.
+    """
+    _channels.setdefault(channel, []).append(handler)
+
+
+def is_listening() -> bool:
+    """Dinleyici bağlıysa True; değilse önbellekler her istekte kendini doğrulamalı."""
+    return _listening.is_set()
+
+
+def _dispatch(tables: Set[str]) -> None:
+    for watched, evict in _subscribers:
+        if watched & tables:
+            try:
+                evict()
+            except Exception:
+                logger.exception("Önbellek boşaltma hatası")
+
+
+def _evict_all() -> None:
+    for _, evict in _subscribers:
+        try:
+            evict()
+        except Exception:
+            logger.exception("Önbellek boşaltma hatası")
+
+
+# ----- Yayın: oturum olayları -----
+
+def _mark(session: Session, tables: Iterable[str]) -> None:
+    tables = _watched.intersection(tables)
+    if tables:
+        session.info.setdefault(_WRITTEN, set()).update(tables)
+
+
+def _publish(session: Session) -> None:
+    written = session.info.get(_WRITTEN)
+    if not written:
+        return
+    payload = json.dumps({"tables": sorted(written), "origin": _origin()}, separators=(",", ":"))
+    # session.execute değil: do_orm_execute tekrar tetiklenmesin
+    session.connection().execute(text("SELECT pg_notify(:ch, :payload)"), {"ch": CHANNEL, "payload": payload})
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    _mark(session, (
+        getattr(obj, "__tablename__", None)
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    _mark(orm_execute_state.session, [getattr(table, "name", None)])
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_on_commit(session):
+    if session.in_nested_transaction():
+        return      # savepoint: dış transaction commit olunca yayınlanır
+    # Commit'in kendi flush'ı bu olaydan sonra çalışır → yazılan tablolar önce toplansın
+    session.flush()
+    _publish(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_on_commit(session):
+    if session.in_nested_transaction():
+        return
+    written = session.info.pop(_WRITTEN, None)
+    if written:
+        _dispatch(written)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_on_rollback(session):
+    if session.in_nested_transaction():
+        return      # savepoint geri alındı; fazladan boşaltma zararsız, eksik olan zararlı
+    session.info.pop(_WRITTEN, None)
+
+
+# ----- Dinleme: worker başına bir thread -----
+
+def _dsn() -> str:
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _handle(payload: str) -> None:
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        _evict_all()
+        return
+    if data.get("origin") == _origin():
+        return
+    _dispatch(set(data.get("tables") or ()))
+
+
+def _handle_channel(channel: str, payload: Optional[str]) -> None:
+    for handler in _channels.get(channel, ()):
+        try:
+            handler(payload)
+        except Exception:
+            logger.exception("%s kanal işleyicisi hatası", channel)
+
+
+class _Listener(threading.Thread):
+    def __init__(self):
+        super().__init__(name="cache-bus", daemon=True)
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        while not self._stopping.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(_dsn())
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL};")
+                    for channel in _channels:
+                        cur.execute(f"LISTEN {channel};")
+                # Bağlantı yokken kaçan mesajlar olabilir → her şeyi boşalt
+                _evict_all()
+                for channel in _channels:
+                    _handle_channel(channel, None)
+                _listening.set()
+                while not self._stopping.is_set():
+                    if select.select([conn], [], [], POLL_TIMEOUT_S) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        if notify.channel == CHANNEL:
+                            _handle(notify.payload)
+                        else:
+                            _handle_channel(notify.channel, notify.payload)
+            except Exception:
+                logger.exception("cache_bus dinleyicisi koptu; yeniden bağlanılacak")
+            finally:
+                _listening.clear()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+            _evict_all()
+            self._stopping.wait(RECONNECT_DELAY_S)
+
+
+def start() -> None:
+    global _listener
+    if _listener is not None and _listener.is_alive():
+        return
+    _listener = _Listener()
+    _listener.start()
+
+
+def stop() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
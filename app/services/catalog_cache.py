@@ -0,0 +1,96 @@
+# app/services/catalog_cache.py
+"""
+Katalog snapshot'ı için süreç içi (in-process) önbellek.
+
+Render edilmiş JSON byte'ları katalog sürümüyle birlikte tutulur. cache_bus dinleyicisi
+bağlıyken bilinen sürüm bellekten kullanılır (istek başına DB sorgusu yok); katalog
+tablolarına yazılınca bus invalidate() çağırır. Dinleyici bağlı değilse her istekte güncel
+sürüm (tek satırlık indeksli sorgu) okunur. Sürüm açık bir transaction yüzünden geride
+tutuluyorsa (settled değil) belleğe alınmaz; her istekte yeniden okunur.
+"""
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.crud import catalog_snapshot as snapshot_crud
+from app.services import cache_bus
+
+MAX_DELTAS = 64
+
+CATALOG_TABLES = frozenset({
+    "profile", "glass_type", "other_material", "remote", "color", "system", "system_variant",
+})
+
+_lock = threading.Lock()
+_generation = 0
+_known_version: Optional[int] = None
+_full: Optional[Tuple[int, bytes]] = None
+# (since, version) → body; sürüm sabitken değişmez, invalidate'te temizlenmez
+_deltas: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+
+
+def invalidate() -> None:
+    global _generation, _known_version, _full
+    with _lock:
+        _generation += 1
+        _known_version = None
+        _full = None
+
+
+def _current_version(db: Session) -> int:
+    global _known_version
+    listening = cache_bus.is_listening()
+    known = _known_version
+    if listening and known is not None:
+        return known
+
+    generation = _generation
+    version, settled = snapshot_crud.current_version(db)
+    if listening and settled:
+        with _lock:
+            if _generation == generation:
+                _known_version = version
+    return version
+
+
+def current_version(db: Session) -> int:
+    """Güncel katalog sürümü (dinleyici bağlıysa bellekten)."""
+    return _current_version(db)
+
+
+def get_full(db: Session) -> Tuple[int, bytes]:
+    global _full
+    version = _current_version(db)
+    cached = _full
+    if cached is not None and cached[0] == version:
+        return cached
+
+    with _lock:
+        # Başka bir thread bu sırada üretmiş olabilir
+        if _full is not None and _full[0] == version:
+            return _full
+        body = snapshot_crud.dumps(snapshot_crud.build_full(db, version))
+        _full = (version, body)
+        return _full
+
+
+def get_delta(db: Session, since: int) -> Tuple[int, bytes]:
+    version = _current_version(db)
+    key = (since, version)
+    with _lock:
+        body = _deltas.get(key)
+        if body is not None:
+            _deltas.move_to_end(key)
+            return version, body
+
+    body = snapshot_crud.dumps(snapshot_crud.build_delta(db, since, version))
+    with _lock:
+        _deltas[key] = body
+        while len(_deltas) > MAX_DELTAS:
+            _deltas.popitem(last=False)
+    return version, body
+
+
+cache_bus.subscribe(CATALOG_TABLES, invalidate)
@@ -0,0 +1,151 @@
+# app/services/compression.py
+"""
+Cevap sıkıştırma (Brotli / GZip).
+
+- İstemcinin Accept-Encoding'ine göre br (brotli paketi kuruluysa) ya da gzip seçilir.
+- COMPRESSION_MIN_BYTES altındaki tek parça cevaplar olduğu gibi gider (küçük cevapta
+  sıkıştırma kazandırmaz, CPU yer).
+- Zaten sıkıştırılmış içerik (görsel, zip, pdf), SSE akışları ve Content-Encoding'i
+  belirlenmiş cevaplar atlanır. Akış (more_body) cevapları parça parça sıkıştırılır.
+- Sıkıştırılabilir cevaplara "Vary: Accept-Encoding" eklenir.
+"""
+import zlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.core.settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    brotli = None
+
+SKIP_CONTENT_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-gzip", "application/pdf",
+    "text/event-stream",
+)
+
+
+def _accepted(header: str) -> set:
+    """Accept-Encoding → q > 0 olan kodlamalar."""
+    out = set()
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            out.add(token)
+    return out
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    accepted = _accepted(header)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+            self._gz = None
+        else:
+            self._br = None
+            self._gz = zlib.compressobj(settings.GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 → gzip başlığı
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self._br is not None:
+            return self._br.process(data) + self._br.finish()
+        return self._gz.compress(data) + self._gz.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        accept = ""
+        for name, value in scope.get("headers") or ():
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            kind = message["type"]
+            if kind == "http.response.start":
+                start = message
+                headers = MutableHeaders(scope=message)
+                ctype = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or ctype.startswith(SKIP_CONTENT_TYPES)
+                )
+                return
+            if kind != "http.response.body":
+                # pathsend / zerocopy: dosya olduğu gibi gider
+                if start is not None:
+                    await send(start)
+                    start = None
+                return await send(message)
+
+            if start is None:
+                # Başlık zaten gönderildi → akışın devamı
+                if compressor is not None:
+                    more = message.get("more_body", False)
+                    body = message.get("body", b"")
+                    message["body"] = compressor.chunk(body) if more else compressor.finish(body)
+                return await send(message)
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if passthrough or (not more and len(body) < self.minimum_size):
+                await send(start)
+                start = None
+                return await send(message)
+
+            headers = MutableHeaders(scope=start)
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = encoding
+            compressor = _Compressor(encoding)
+            if more:
+                del headers["Content-Length"]
+                message["body"] = compressor.chunk(body)
+            else:
+                message["body"] = compressor.finish(body)
+                headers["Content-Length"] = str(len(message["body"]))
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,109 @@
+# app/services/conditional_get.py
+"""
+Okuma uçları için koşullu GET (ETag + If-None-Match → 304).
+
+- CONDITIONAL_PATH_PREFIXES altındaki GET isteklerinin tek parça 200 JSON cevaplarına
+  içerik hash'inden zayıf ETag (W/"...") eklenir; istemcinin If-None-Match'i eşleşirse
+  gövde yerine 304 gider. Sıkıştırma bu katmanın dışında olduğundan ETag sıkıştırılmamış
+  gövdeye aittir (zayıf ETag bu yüzden).
+- Route kendi ETag'ini koyduysa (sürüm bazlı, sorgu yapmadan 304 verebilen uçlar) cevaba
+  dokunulmaz.
+"""
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+CONDITIONAL_PATH_PREFIXES = (
+    "/api/projects",
+    "/api/systems",
+    "/api/system-variants",
+    "/api/catalog",
+    "/api/colors",
+)
+REVALIDATE = "private, no-cache"
+# 304 cevabında taşınan başlıklar (RFC 9110 §15.4.5)
+_KEEP_ON_304 = {b"etag", b"cache-control", b"vary", b"content-location", b"expires", b"date"}
+
+
+def body_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match zayıf karşılaştırması (W/ öneki yok sayılır)."""
+    if not if_none_match:
+        return False
+    wanted = _opaque(etag)
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or _opaque(candidate) == wanted:
+            return True
+    return False
+
+
+class ConditionalGetMiddleware:
+    def __init__(self, app, prefixes=CONDITIONAL_PATH_PREFIXES):
+        self.app = app
+        self.prefixes = tuple(prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefixes)
+        ):
+            return await self.app(scope, receive, send)
+
+        if_none_match = None
+        for name, value in scope.get("headers") or ():
+            if name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+                break
+
+        start = None
+
+        async def send_with_etag(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                if (
+                    message["status"] != 200
+                    or "etag" in headers
+                    or not headers.get("content-type", "").startswith("application/json")
+                ):
+                    return await send(message)
+                start = message
+                return
+            if start is None:
+                return await send(message)
+
+            pending, start = start, None
+            if message["type"] != "http.response.body" or message.get("more_body", False):
+                # Akış cevabı: hash'lenemez, olduğu gibi
+                await send(pending)
+                return await send(message)
+
+            etag = body_etag(message.get("body", b""))
+            headers = MutableHeaders(scope=pending)
+            headers["ETag"] = etag
+            if "cache-control" not in headers:
+                headers["Cache-Control"] = REVALIDATE
+
+            if etag_matches(if_none_match, etag):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [(k, v) for k, v in pending["headers"] if k.lower() in _KEEP_ON_304],
+                })
+                return await send({"type": "http.response.body", "body": b""})
+
+            await send(pending)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,199 @@
+# app/services/cutting.py
+"""
+Profil kesim optimizasyonu (1D cutting stock).
+
+Saf Python; veritabanına dokunmaz. Girdi olarak (kesim boyu, etiket) listesi alır,
+standart boy (bar) uzunluğu ve bıçak payı (kerf) ile barlara yerleştirir.
+
+Algoritma:
+  1) Best-Fit Decreasing: parçalar büyükten küçüğe, kalan boşluğu en az olan
+     uygun bara yerleştirilir (kalan boşluklar sıralı listede, bisect ile O(log n) arama).
+  2) Zaman bütçesi kalırsa iyileştirme: en boş barlar sırayla "boşaltılmaya" çalışılır;
+     tüm kesimleri diğer barların artıklarına sığıyorsa bar tamamen düşülür.
+
+Tüm uzunluklar 0.1 mm tamsayı birimine çevrilerek hesaplanır (float hatası olmasın).
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from typing import Hashable, Iterable, List, Optional, Tuple
+
+SCALE = 10  # 0.1 mm hassasiyet
+
+Piece = Tuple[float, Hashable]   # (kesim boyu mm, etiket)
+
+
+class Bar:
+    __slots__ = ("cuts", "avail")
+
+    def __init__(self, avail: int):
+        self.cuts: List[Tuple[int, Hashable]] = []
+        # Son kesimin bıçak payından sonra kalan boşluk (negatif olabilir → bar kapalı)
+        self.avail = avail
+
+
+def _to_units(mm) -> int:
+    return int(round(float(mm) * SCALE))
+
+
+def _to_mm(units: int) -> float:
+    return units / SCALE
+
+
+def _place(caps: list, bars: List[Bar], length: int, tag: Hashable, kerf: int) -> bool:
+    """Parçayı boşluğu yeten en dar bara koyar. Sığmazsa False."""
+    i = bisect_left(caps, (length, -1))
+    if i >= len(caps):
+        return False
+    avail, idx = caps.pop(i)
+    bar = bars[idx]
+    bar.cuts.append((length, tag))
+    bar.avail = avail - length - kerf
+    if bar.avail > 0:
+        insort(caps, (bar.avail, idx))
+    return True
+
+
+def pack_cuts(
+    pieces: Iterable[Piece],
+    stock_length_mm: float,
+    kerf_mm: float = 0.0,
+    deadline: Optional[float] = None,
+) -> Tuple[List[Bar], List[Piece]]:
+    """
+    Döner: (barlar, sığmayan parçalar)
+    deadline: time.monotonic() cinsinden iyileştirme fazının bitiş anı. None → iyileştirme yok.
+    """
+    stock = _to_units(stock_length_mm)
+    kerf = max(_to_units(kerf_mm), 0)
+
+    oversize: List[Piece] = []
+    items: List[Tuple[int, Hashable]] = []
+    for length_mm, tag in pieces:
+        units = _to_units(length_mm)
+        if units <= 0:
+            continue
+        if units > stock:
+            oversize.append((length_mm, tag))
+            continue
+        items.append((units, tag))
+    items.sort(key=lambda x: x[0], reverse=True)
+
+    bars: List[Bar] = []
+    caps: list = []  # sıralı (avail, bar_idx)
+    for length, tag in items:
+        if not _place(caps, bars, length, tag, kerf):
+            bar = Bar(stock)
+            bars.append(bar)
+            idx = len(bars) - 1
+            bar.cuts.append((length, tag))
+            bar.avail = stock - length - kerf
+            if bar.avail > 0:
+                insort(caps, (bar.avail, idx))
+
+    if deadline is not None:
+        _improve(bars, caps, stock, kerf, deadline)
+
+    return [b for b in bars if b.cuts], oversize
+
+
+def _improve(bars: List[Bar], caps: list, stock: int, kerf: int, deadline: float) -> None:
+    """En az dolu barları diğer barların artıklarına dağıtmayı dener (zaman bütçeli)."""
+    candidates = sorted(
+        range(len(bars)),
+        key=lambda i: sum(l for l, _ in bars[i].cuts),
+    )
+    for idx in candidates:
+        if time.monotonic() >= deadline:
+            return
+        bar = bars[idx]
+        if not bar.cuts:
+            continue
+
+        # Adayın kendi boşluk kaydını çıkar
+        if bar.avail > 0:
+            pos = bisect_left(caps, (bar.avail, idx))
+            if pos < len(caps) and caps[pos] == (bar.avail, idx):
+                caps.pop(pos)
+
+        journal = []  # (hedef_idx, eski_avail) → geri alma için
+        ok = True
+        for length, tag in sorted(bar.cuts, key=lambda c: c[0], reverse=True):
+            i = bisect_left(caps, (length, -1))
+            if i >= len(caps):
+                ok = False
+                break
+            avail, target = caps.pop(i)
+            t = bars[target]
+            journal.append((target, avail))
+            t.cuts.append((length, tag))
+            t.avail = avail - length - kerf
+            if t.avail > 0:
+                insort(caps, (t.avail, target))
+
+        if ok:
+            bar.cuts = []
+            bar.avail = stock
+            continue
+
+        # Geri al: ters sırada
+        for target, old_avail in reversed(journal):
+            t = bars[target]
+            if t.avail > 0:
+                pos = bisect_left(caps, (t.avail, target))
+                if pos < len(caps) and caps[pos] == (t.avail, target):
+                    caps.pop(pos)
+            t.cuts.pop()
+            t.avail = old_avail
+            insort(caps, (old_avail, target))
+        if bar.avail > 0:
+            insort(caps, (bar.avail, idx))
+
+
+def summarize_bars(bars: List[Bar], stock_length_mm: float, kerf_mm: float = 0.0) -> dict:
+    """
+    Bar listesini JSON'a uygun özet + bar bazlı kesim listesine çevirir.
+    Aynı bar içindeki aynı (boy, etiket) kesimleri "count" ile gruplanır.
+    """
+    stock = _to_units(stock_length_mm)
+    kerf = max(_to_units(kerf_mm), 0)
+
+    out_bars = []
+    total_cut = 0
+    total_waste = 0
+    for no, bar in enumerate(bars, start=1):
+        grouped: dict = {}
+        order: list = []
+        for length, tag in sorted(bar.cuts, key=lambda c: c[0], reverse=True):
+            key = (length, tag)
+            if key not in grouped:
+                grouped[key] = 0
+                order.append(key)
+            grouped[key] += 1
+
+        cut_sum = sum(l for l, _ in bar.cuts)
+        offcut = max(bar.avail, 0)
+        total_cut += cut_sum
+        total_waste += stock - cut_sum
+        out_bars.append({
+            "bar_no": no,
+            "used_mm": _to_mm(min(cut_sum + kerf * len(bar.cuts), stock)),
+            "offcut_mm": _to_mm(offcut),
+            "cuts": [
+                {"length_mm": _to_mm(length), "tag": tag, "count": grouped[(length, tag)]}
+                for (length, tag) in order
+            ],
+        })
+
+    bar_count = len(bars)
+    total_stock = stock * bar_count
+    return {
+        "stock_length_mm": _to_mm(stock),
+        "kerf_mm": _to_mm(kerf),
+        "bar_count": bar_count,
+        "total_cut_mm": _to_mm(total_cut),
+        "waste_mm": _to_mm(total_waste),
+        "yield_pct": round(100.0 * total_cut / total_stock, 2) if total_stock else 0.0,
+        "bars": out_bars,
+    }
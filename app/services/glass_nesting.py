@@ -0,0 +1,231 @@
+# app/services/glass_nesting.py
+"""
+Cam levha yerleşim optimizasyonu (2D, giyotin kesim kısıtlı).
+
+Saf Python; veritabanına dokunmaz. Girdi olarak (genişlik, yükseklik, etiket) listesi alır,
+stok levha ölçüsüne göre parçaları levhalara yerleştirir.
+
+Algoritma (guillotine free-rectangle):
+  - Her levha boş dikdörtgenler listesi tutar. Parça, boş alanı en iyi dolduran
+    dikdörtgenin sol-alt köşesine konur (best area fit), kalan alan iki dikdörtgene bölünür.
+    Her bölme tam boy bir kesimdir → yerleşim giyotin makasıyla kesilebilir.
+  - Sadece son K levha açık tutulur (next-k-fit); binlerce parçada arama maliyeti sabit kalır.
+  - Zaman bütçesi içinde farklı sıralama / bölme kuralları, ardından sıralamanın rastgele
+    bozulmuş halleri denenir; en az levha kullanan (eşitlikte son levhası en boş kalan →
+    artığı en büyük) sonuç seçilir.
+
+Ölçüler 0.1 mm tamsayı birimine çevrilerek hesaplanır.
+Kesim payı (kerf) parçanın sağına/üstüne eklenir; levha da aynı pay kadar büyütülür ki
+kenara dayanan parçadan pay düşülmesin.
+"""
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+SCALE = 10  # 0.1 mm hassasiyet
+OPEN_SHEETS = 8  # aynı anda aday olarak taranan levha sayısı
+
+GlassPiece = Tuple[float, float, Hashable]   # (genişlik mm, yükseklik mm, etiket)
+
+
+class _Sheet:
+    __slots__ = ("free", "placed", "used")
+
+    def __init__(self, w: int, h: int):
+        self.free: List[Tuple[int, int, int, int]] = [(0, 0, w, h)]   # (x, y, w, h)
+        self.placed: List[Tuple[int, int, int, int, bool, Hashable]] = []
+        self.used = 0
+
+
+def _to_units(mm) -> int:
+    return int(round(float(mm) * SCALE))
+
+
+def _to_mm(units: int) -> float:
+    return units / SCALE
+
+
+def _split_shorter_leftover(fx, fy, fw, fh, w, h):
+    # Kısa artık eksen boyunca böl: büyük parça mümkün olduğunca bütün kalsın
+    if (fw - w) < (fh - h):
+        return (fx + w, fy, fw - w, h), (fx, fy + h, fw, fh - h)
+    return (fx + w, fy, fw - w, fh), (fx, fy + h, w, fh - h)
+
+
+def _split_longer_leftover(fx, fy, fw, fh, w, h):
+    if (fw - w) >= (fh - h):
+        return (fx + w, fy, fw - w, h), (fx, fy + h, fw, fh - h)
+    return (fx + w, fy, fw - w, fh), (fx, fy + h, w, fh - h)
+
+
+_SPLITS = {
+    "shorter_leftover": _split_shorter_leftover,
+    "longer_leftover": _split_longer_leftover,
+}
+
+_SORTS: dict = {
+    "area": lambda p: -(p[0] * p[1]),
+    "long_side": lambda p: (-max(p[0], p[1]), -min(p[0], p[1])),
+    "perimeter": lambda p: -(p[0] + p[1]),
+}
+
+
+class _Deadline(Exception):
+    pass
+
+
+def _pack_once(
+    items: List[Tuple[int, int, Hashable]],
+    sheet_w: int,
+    sheet_h: int,
+    kerf: int,
+    allow_rotation: bool,
+    split: Callable,
+    deadline: Optional[float],
+) -> List[_Sheet]:
+    sheets: List[_Sheet] = []
+    bw, bh = sheet_w + kerf, sheet_h + kerf
+    for n, (pw, ph, tag) in enumerate(items):
+        if deadline is not None and (n & 255) == 0 and time.monotonic() >= deadline:
+            raise _Deadline()
+
+        w, h = pw + kerf, ph + kerf
+        best = None  # (score, short_leftover, sheet, free_idx, w, h, rotated)
+        for sheet in sheets[-OPEN_SHEETS:]:
+            for i, (fx, fy, fw, fh) in enumerate(sheet.free):
+                for rw, rh, rot in ((w, h, False), (h, w, True)) if allow_rotation and w != h else ((w, h, False),):
+                    if rw <= fw and rh <= fh:
+                        score = fw * fh - rw * rh
+                        short = min(fw - rw, fh - rh)
+                        if best is None or (score, short) < (best[0], best[1]):
+                            best = (score, short, sheet, i, rw, rh, rot)
+
+        if best is None:
+            sheet = _Sheet(bw, bh)
+            sheets.append(sheet)
+            if w <= bw and h <= bh:
+                best = (0, 0, sheet, 0, w, h, False)
+            else:
+                best = (0, 0, sheet, 0, h, w, True)
+
+        _, _, sheet, i, rw, rh, rot = best
+        fx, fy, fw, fh = sheet.free.pop(i)
+        for r in split(fx, fy, fw, fh, rw, rh):
+            if r[2] > kerf and r[3] > kerf:
+                sheet.free.append(r)
+        sheet.placed.append((fx, fy, rw - kerf, rh - kerf, rot, tag))
+        sheet.used += (rw - kerf) * (rh - kerf)
+
+    return sheets
+
+
+def nest_pieces(
+    pieces: Iterable[GlassPiece],
+    sheet_width_mm: float,
+    sheet_height_mm: float,
+    kerf_mm: float = 0.0,
+    allow_rotation: bool = True,
+    deadline: Optional[float] = None,
+) -> Tuple[List[_Sheet], List[GlassPiece]]:
+    """
+    Döner: (levhalar, levhaya sığmayan parçalar)
+    deadline: time.monotonic() cinsinden; None → sadece ilk (varsayılan) strateji çalışır.
+    """
+    sw, sh = _to_units(sheet_width_mm), _to_units(sheet_height_mm)
+    kerf = max(_to_units(kerf_mm), 0)
+
+    oversize: List[GlassPiece] = []
+    items: List[Tuple[int, int, Hashable]] = []
+    for w_mm, h_mm, tag in pieces:
+        w, h = _to_units(w_mm), _to_units(h_mm)
+        if w <= 0 or h <= 0:
+            continue
+        fits = (w <= sw and h <= sh) or (allow_rotation and h <= sw and w <= sh)
+        if not fits:
+            oversize.append((w_mm, h_mm, tag))
+            continue
+        items.append((w, h, tag))
+
+    if not items:
+        return [], oversize
+
+    strategies = [(s, p) for s in _SORTS for p in _SPLITS]
+    best: Optional[List[_Sheet]] = None
+    best_key = None
+    for sort_name, split_name in strategies:
+        ordered = sorted(items, key=_SORTS[sort_name])
+        try:
+            # İlk strateji her zaman tamamlanır; sonrakiler bütçeye tabidir
+            sheets = _pack_once(
+                ordered, sw, sh, kerf, allow_rotation, _SPLITS[split_name],
+                deadline if best is not None else None,
+            )
+        except _Deadline:
+            break
+        key = (len(sheets), sheets[-1].used)
+        if best_key is None or key < best_key:
+            best, best_key = sheets, key
+        if deadline is None or time.monotonic() >= deadline:
+            break
+
+    # Kalan sürede: alana göre sıralı listeyi komşu takaslarıyla boz, tekrar dene
+    if deadline is not None and best is not None and time.monotonic() < deadline:
+        rng = random.Random(len(items))
+        base = sorted(items, key=_SORTS["area"])
+        swaps = max(len(base) // 10, 1)
+        while time.monotonic() < deadline:
+            ordered = list(base)
+            for _ in range(swaps):
+                i = rng.randrange(len(ordered) - 1) if len(ordered) > 1 else 0
+                j = min(i + rng.randint(1, 3), len(ordered) - 1)
+                ordered[i], ordered[j] = ordered[j], ordered[i]
+            try:
+                sheets = _pack_once(
+                    ordered, sw, sh, kerf, allow_rotation,
+                    rng.choice(list(_SPLITS.values())), deadline,
+                )
+            except _Deadline:
+                break
+            key = (len(sheets), sheets[-1].used)
+            if key < best_key:
+                best, best_key = sheets, key
+
+    return best or [], oversize
+
+
+def summarize_sheets(sheets: List[_Sheet], sheet_width_mm: float, sheet_height_mm: float) -> dict:
+    """Levha listesini JSON'a uygun yerleşim + verim özetine çevirir."""
+    sw, sh = _to_units(sheet_width_mm), _to_units(sheet_height_mm)
+    sheet_area = sw * sh
+    total_used = 0
+    out = []
+    for no, sheet in enumerate(sheets, start=1):
+        total_used += sheet.used
+        out.append({
+            "sheet_no": no,
+            "used_pct": round(100.0 * sheet.used / sheet_area, 2) if sheet_area else 0.0,
+            "placements": [
+                {
+                    "x_mm": _to_mm(x),
+                    "y_mm": _to_mm(y),
+                    "width_mm": _to_mm(w),
+                    "height_mm": _to_mm(h),
+                    "rotated": rot,
+                    "tag": tag,
+                }
+                for (x, y, w, h, rot, tag) in sheet.placed
+            ],
+        })
+
+    total_area = sheet_area * len(sheets)
+    return {
+        "sheet_width_mm": _to_mm(sw),
+        "sheet_height_mm": _to_mm(sh),
+        "sheet_count": len(sheets),
+        "used_area_m2": round(total_used / (SCALE * SCALE) / 1_000_000, 4),
+        "total_area_m2": round(total_area / (SCALE * SCALE) / 1_000_000, 4),
+        "yield_pct": round(100.0 * total_used / total_area, 2) if total_area else 0.0,
+        "sheets": out,
+    }
@@ -0,0 +1,338 @@
+# app/services/images.py
+"""
+Görsel yükleme / sunma hattı.
+
+- Orijinaller içerik adresli saklanır: IMAGE_ROOT/<ab>/<sha256>.<ext>
+  (aynı dosya iki kez yüklenirse tek kopya; URL içerik değişince değişir).
+  IMAGE_ROOT, /static ile açılan MEDIA_ROOT'un dışındadır: yayınlanmamış sistemlerin
+  fotoğrafları URL tahminiyle alınamaz. DB'ye /api/images/<sha256>.<ext> yazılır.
+- Bayi profil fotoğrafı ve PDF logosu gibi gizli olmayan görseller (public=True) istemcide
+  doğrudan <img> / PDF render'ına verildiği için (Authorization header gönderilemez)
+  PUBLIC_ROOT'ta (MEDIA_ROOT/assets) saklanır: /static/assets/<ab>/<sha256>.<ext>.
+  Yazma uploads.receive ile: boyut sınırlı, geçici dosya + atomik rename.
+- Küçük boyutlar (thumb / medium) WebP + JPEG olarak jobs havuzunda üretilir;
+  hazır değilse orijinal sunulur ve üretim planlanır.
+- Sunum: doğru media type, güçlü ETag + If-None-Match → 304.
+  İçerik adresli URL'ler (GET /api/images/..., giriş gerekir) tarayıcıda bir yıl immutable
+  önbelleklenir (private: paylaşılan önbelleklere girmez);
+  id bazlı uçlar (…/photo) her seferinde ETag ile doğrulanır.
+- Eski (id/kod adlı) dosyalar da aynı uçlardan sunulur; küçük boyut anahtarı
+  dosyanın yol+mtime+boyutundan türetilir.
+
+Pillow opsiyoneldir: yoksa küçük boyut üretilmez, her zaman orijinal döner.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from fastapi import HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, Response
+
+from app.core.config import IMAGE_ROOT as IMAGE_ROOT_DIR, MEDIA_ROOT
+from app.services import uploads
+from app.services.conditional_get import REVALIDATE, etag_matches
+
+logger = logging.getLogger(__name__)
+
+IMAGE_ROOT = Path(IMAGE_ROOT_DIR)
+PUBLIC_ROOT = Path(MEDIA_ROOT) / "assets"
+DERIVED_ROOT = IMAGE_ROOT / "_d"
+STATIC_PREFIX = "/static/"
+API_PREFIX = "/api/images/"
+LEGACY_PREFIX = "/static/images/"   # ilk sürümde MEDIA_ROOT/images altına yazılan kayıtlar
+
+# ad → en uzun kenar (px)
+SIZES = {"thumb": 320, "medium": 960}
+SIZE_PATTERN = "^(thumb|medium)$"
+QUALITY = int(os.getenv("IMAGE_QUALITY", "82"))
+
+IMMUTABLE = "private, max-age=31536000, immutable"
+
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+}
+_FORMAT_EXT = {"webp": ".webp", "jpeg": ".jpg"}
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+_pending: set = set()
+_pending_lock = threading.Lock()
+
+
+if Path(MEDIA_ROOT).resolve() in (IMAGE_ROOT.resolve(), *IMAGE_ROOT.resolve().parents):
+    logger.warning("IMAGE_ROOT (%s) MEDIA_ROOT altında: görseller /static'ten yetkisiz okunabilir", IMAGE_ROOT)
+
+
+@dataclass
+class StoredImage:
+    url: str            # DB'ye yazılan değer: /api/images/<sha256>.<ext> (public: /static/assets/...)
+    digest: str
+    path: Path
+    media_type: str
+
+
+def _sniff_ext(head: bytes) -> Optional[str]:
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    return None
+
+
+def media_type_for(path: Path) -> str:
+    return MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream")
+
+
+def _under(path: Path, root: Path) -> bool:
+    try:
+        path.resolve().relative_to(root.resolve())
+    except ValueError:
+        return False
+    return True
+
+
+def _url_for(path: Path) -> str:
+    if _under(path, PUBLIC_ROOT):
+        return STATIC_PREFIX + path.resolve().relative_to(Path(MEDIA_ROOT).resolve()).as_posix()
+    return API_PREFIX + path.name
+
+
+def _url_forms(path: Path) -> tuple:
+    """İçerik adresli dosyanın DB'de görülebilecek tüm yazımları (IMAGE_ROOT: yeni + ilk sürüm)."""
+    if _under(path, PUBLIC_ROOT):
+        return (_url_for(path),)
+    return (_url_for(path), f"{LEGACY_PREFIX}{path.name[:2]}/{path.name}")
+
+
+def stored_path(filename: str) -> Path:
+    """<sha256>.<ext> → IMAGE_ROOT/<ab>/<sha256>.<ext>"""
+    return IMAGE_ROOT / filename[:2] / filename
+
+
+# -----------------------------------------------------------------------------
+# Saklama
+# -----------------------------------------------------------------------------
+
+def store_upload(
+    upload: UploadFile, max_bytes: int = uploads.MAX_UPLOAD_BYTES, *, public: bool = False
+) -> StoredImage:
+    """
+    Yüklemeyi hash'leyerek geçici dosyaya akıtır (boyut sınırlı), türünü doğrular
+    ve içerik adresli yerine atomik taşır. public=True → PUBLIC_ROOT, URL /static/assets/...
+    """
+    root = PUBLIC_ROOT if public else IMAGE_ROOT
+    received = uploads.receive(upload, root, max_bytes)
+    ext = _sniff_ext(received.head) or Path(upload.filename or "").suffix.lower()
+    if ext not in MEDIA_TYPES:
+        received.discard()
+        raise HTTPException(status_code=415, detail="Desteklenmeyen dosya türü. JPEG/PNG/WebP/GIF yükleyin.")
+
+    digest = received.digest
+    dest = received.move_to(root / digest[:2] / f"{digest}{ext}")
+    schedule_derivatives(dest)
+    return StoredImage(url=_url_for(dest), digest=digest, path=dest, media_type=MEDIA_TYPES[ext])
+
+
+def resolve_path(stored: Optional[str], base_dir: Optional[str] = None) -> Optional[Path]:
+    """
+    DB'deki değeri dosya yoluna çevirir.
+    '/api/images/...' (ve ilk sürümün '/static/images/...') → IMAGE_ROOT altı;
+    '/static/...' → MEDIA_ROOT altı; diğerleri base_dir'e (yoksa çalışma dizinine) göre.
+    """
+    if not stored:
+        return None
+    value = stored.split("?", 1)[0]
+    if value.startswith(API_PREFIX) or value.startswith(LEGACY_PREFIX):
+        return stored_path(value.rsplit("/", 1)[-1])
+    if value.startswith(STATIC_PREFIX):
+        return Path(MEDIA_ROOT) / value[len(STATIC_PREFIX):]
+    return Path(base_dir) / value if base_dir else Path(value)
+
+
+def digest_of(path: Optional[Path]) -> Optional[str]:
+    """İçerik adresli dosyanın sha256'sı; eski (id adlı) dosyalar için None."""
+    if path is None or not _DIGEST_RE.match(path.stem):
+        return None
+    if not (_under(path, IMAGE_ROOT) or _under(path, PUBLIC_ROOT)):
+        return None
+    return path.stem
+
+
+def is_content_addressed(stored: Optional[str]) -> bool:
+    return digest_of(resolve_path(stored)) is not None
+
+
+def _source_key(path: Path) -> str:
+    digest = digest_of(path)
+    if digest:
+        return digest
+    st = path.stat()
+    raw = f"{path.resolve()}:{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _is_referenced(db, path: Path) -> bool:
+    from app.models.dealer_profile_picture import DealerProfilePicture
+    from app.models.pdf import PdfBrand
+    from app.models.profile import Profile
+    from app.models.system import System, SystemVariant
+
+    for col in (
+        System.photo_url,
+        SystemVariant.photo_url,
+        SystemVariant.pdf_foto_cikti,
+        Profile.profil_kesit_fotograf,
+        DealerProfilePicture.image_url,
+        PdfBrand.logo_url,
+    ):
+        if db.query(col).filter(col.in_(_url_forms(path))).limit(1).first() is not None:
+            return True
+    return False
+
+
+def discard(db, stored: Optional[str], base_dir: Optional[str] = None) -> None:
+    """
+    Artık kullanılmayan görseli ve küçük boyutlarını siler.
+    İçerik adresli dosya başka bir kayıtta da kullanılıyorsa dokunulmaz.
+    """
+    path = resolve_path(stored, base_dir)
+    if path is None or not path.exists():
+        return
+    if digest_of(path) and _is_referenced(db, path):
+        return
+    try:
+        key = _source_key(path)
+        for derived in (DERIVED_ROOT / key[:2]).glob(f"{key}_*"):
+            derived.unlink(missing_ok=True)
+        path.unlink(missing_ok=True)
+    except OSError:
+        logger.warning("Görsel silinemedi: %s", path, exc_info=True)
+
+
+def discard_after_commit(db, stored: Optional[str], base_dir: Optional[str] = None) -> None:
+    """discard'ı oturumun bir sonraki commit'inden sonra çalıştırır (rollback'te dosya kalır)."""
+    if stored:
+        uploads.on_commit(db, discard, stored, base_dir)
+
+
+# -----------------------------------------------------------------------------
+# Küçük boyutlar (jobs havuzunda)
+# -----------------------------------------------------------------------------
+
+def derivative_path(key: str, size: str, fmt: str) -> Path:
+    return DERIVED_ROOT / key[:2] / f"{key}_{size}{_FORMAT_EXT[fmt]}"
+
+
+def _render(src: Path, key: str) -> None:
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return
+
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im)
+        has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        base = im.convert("RGBA" if has_alpha else "RGB")
+
+        for size, edge in SIZES.items():
+            resized = base.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            if has_alpha:
+                flat = Image.new("RGB", resized.size, (255, 255, 255))
+                flat.paste(resized, mask=resized.getchannel("A"))
+            else:
+                flat = resized
+
+            for fmt, img, opts in (
+                ("webp", resized, {"quality": QUALITY, "method": 4}),
+                ("jpeg", flat, {"quality": QUALITY, "optimize": True, "progressive": True}),
+            ):
+                dest = derivative_path(key, size, fmt)
+                if dest.exists():
+                    continue
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=dest.parent, prefix=".render-")
+                try:
+                    with os.fdopen(fd, "wb") as out:
+                        img.save(out, format=fmt.upper(), **opts)
+                    os.replace(tmp_name, dest)
+                except BaseException:
+                    if os.path.exists(tmp_name):
+                        os.unlink(tmp_name)
+                    raise
+
+
+def _render_job(src: Path, key: str) -> None:
+    try:
+        _render(src, key)
+    finally:
+        with _pending_lock:
+            _pending.discard(key)
+
+
+def schedule_derivatives(path: Path) -> None:
+    """Kaynak için tüm boyutları (zaten planlanmadıysa) arka planda üretir."""
+    if path.suffix.lower() not in MEDIA_TYPES:
+        return
+    key = _source_key(path)
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+
+    from app.services import jobs  # döngüsel import olmasın
+
+    jobs.submit(_render_job, path, key)
+
+
+# -----------------------------------------------------------------------------
+# Sunum
+# -----------------------------------------------------------------------------
+
+def image_response(
+    request: Request,
+    path: Path,
+    size: Optional[str] = None,
+    immutable: bool = False,
+) -> Response:
+    """
+    Dosyayı (istenirse küçük boyutunu) ETag ile döner.
+    immutable=True yalnızca içerik adresli URL'ler içindir.
+    """
+    key = _source_key(path)
+    headers = {}
+    serve = path
+    etag = f'"{key}"'
+    cacheable = immutable and digest_of(path) is not None
+
+    if size in SIZES:
+        headers["Vary"] = "Accept"
+        fmt = "webp" if "image/webp" in request.headers.get("accept", "") else "jpeg"
+        derived = derivative_path(key, size, fmt)
+        if derived.exists():
+            serve = derived
+            etag = f'"{key}-{size}-{fmt}"'
+        else:
+            # Henüz üretilmedi: orijinali ver, bu cevabı uzun süre önbellekleme
+            schedule_derivatives(path)
+            cacheable = False
+
+    headers["ETag"] = etag
+    headers["Cache-Control"] = IMMUTABLE if cacheable else REVALIDATE
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path=str(serve), media_type=media_type_for(serve), headers=headers)
@@ -0,0 +1,65 @@
+# app/services/jobs.py
+"""
+Arka plan işleri için küçük, sınırlı bir thread havuzu.
+
+Uzun süren (CPU ağırlıklı) işler request thread'ini bloklamasın diye buraya verilir.
+İş fonksiyonu kendi DB oturumunu açar; request oturumu thread'ler arasında paylaşılmaz.
+"""
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.db.session import SessionLocal
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=max(JOB_WORKERS, 1), thread_name_prefix="abay-job")
+
+
+def _run_logged(name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    metrics.JOBS_QUEUED.dec()
+    metrics.JOBS_RUNNING.inc()
+    started = time.perf_counter()
+    result = "error"
+    try:
+        value = fn(*args, **kwargs)
+        result = "ok"
+        return value
+    except Exception:
+        logger.exception("Arka plan işi hata verdi: %s", name)
+        raise
+    finally:
+        metrics.JOBS_RUNNING.dec()
+        metrics.JOB_DURATION.labels(name, result).observe(time.perf_counter() - started)
+
+
+def _job_name(fn: Callable[..., Any]) -> str:
+    return getattr(fn, "__name__", repr(fn))
+
+
+def _submit(name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+    metrics.JOBS_QUEUED.inc()
+    return _executor.submit(_run_logged, name, fn, *args, **kwargs)
+
+
+def submit(fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """fn(*args, **kwargs) çağrısını havuza verir."""
+    return _submit(_job_name(fn), fn, *args, **kwargs)
+
+
+def _with_session(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    db = SessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+def submit_with_session(fn: Callable[..., Any], *args, **kwargs) -> Future:
+    """fn(db, *args, **kwargs) — db: iş için açılan yeni SessionLocal()."""
+    return _submit(_job_name(fn), _with_session, fn, *args, **kwargs)
@@ -0,0 +1,91 @@
+# app/services/maintenance.py
+"""
+Periyodik bakım işleri (log temizliği vb.).
+
+- Her worker'da bir daemon thread MAINTENANCE_INTERVAL_S'de bir kayıtlı işleri dener.
+- Her iş kendi oturumunda ve transaction'ında çalışır; pg_try_advisory_xact_lock ile aynı işi
+  aynı anda tek worker yapar (diğerleri o turu atlar). Kilit commit/rollback'te kendiliğinden düşer.
+- İşler modül import edilirken register() ile eklenir.
+"""
+import logging
+import threading
+import zlib
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+_tasks: List[Tuple[str, Callable[[Session], Any]]] = []
+_runner = None
+
+
+def register(name: str, fn: Callable[[Session], Any]) -> None:
+    """fn(db) periyodik çalışır; commit fn'e aittir."""
+    _tasks.append((name, fn))
+
+
+def _lock_key(name: str) -> int:
+    # advisory lock anahtarı: isimden sabit 31 bitlik sayı
+    return zlib.crc32(f"maintenance:{name}".encode()) & 0x7FFFFFFF
+
+
+def run_task(name: str, fn: Callable[[Session], Any]) -> bool:
+    """İşi bir kez çalıştırır; kilit başka worker'daysa False."""
+    db = SessionLocal()
+    try:
+        locked = db.execute(text("SELECT pg_try_advisory_xact_lock(:k)"), {"k": _lock_key(name)}).scalar()
+        if not locked:
+            db.rollback()
+            return False
+        result = fn(db)
+        db.commit()
+        if result:
+            logger.info("Bakım işi %s: %s", name, result)
+        return True
+    except Exception:
+        db.rollback()
+        logger.exception("Bakım işi hata verdi: %s", name)
+        return False
+    finally:
+        db.close()
+
+
+def run_all() -> None:
+    for name, fn in list(_tasks):
+        run_task(name, fn)
+
+
+class _Runner(threading.Thread):
+    def __init__(self, interval: float):
+        super().__init__(name="maintenance", daemon=True)
+        self._interval = interval
+        self._stopping = threading.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def run(self) -> None:
+        while not self._stopping.wait(self._interval):
+            run_all()
+
+
+def start() -> None:
+    global _runner
+    if settings.MAINTENANCE_INTERVAL_S <= 0:
+        return
+    if _runner is not None and _runner.is_alive():
+        return
+    _runner = _Runner(settings.MAINTENANCE_INTERVAL_S)
+    _runner.start()
+
+
+def stop() -> None:
+    global _runner
+    if _runner is not None:
+        _runner.stop()
+        _runner = None
@@ -0,0 +1,238 @@
+# app/services/metrics.py
+"""
+Prometheus metrikleri (GET /metrics).
+
+- HTTP: route şablonu + method bazında süre histogramı, istek sayacı (status ile),
+  anlık işlenen istek sayısı. Route etiketi eşleşen route'un path şablonudur
+  (/api/projects/{project_id}) → kardinalite sınırlı.
+- Threadpool (sync route'lar): toplam/kullanılan token ve bekleyen görev sayısı.
+- DB havuzu: size / checked-out / overflow ve bağlantı alma bekleme süresi.
+- bcrypt: süren işlem sayısı (kuyruk derinliği) ve süre.
+- E-posta: gönderim süresi ve sonuç sayacı.
+- jobs havuzu: kuyrukta / çalışan iş sayısı ve iş süreleri (kesim optimizasyonu, küçük
+  görsel üretimi, yeniden numaralama ...).
+
+Birden çok worker (uvicorn --workers / gunicorn): PROMETHEUS_MULTIPROC_DIR verilirse
+prometheus_client'ın multiprocess modu kullanılır; her worker değerlerini bu dizindeki mmap
+dosyalarına yazar, /metrics'i hangi worker karşılarsa karşılasın tüm worker'ların toplamı döner.
+Dizin her deploy'da (worker'lar başlamadan önce) boşaltılmalı. Değişken yoksa her worker kendi
+sayaçlarını döner (tek worker için doğru; çok worker'da scrape rastgele bir worker'ı görür).
+Havuz / threadpool göstergeleri scrape anında okunur ve birleştirilemez: multiprocess modunda
+sadece isteği karşılayan worker'ınkiler "pid" etiketiyle döner.
+
+prometheus_client opsiyoneldir: kurulu değilse metrikler no-op olur, /metrics 503 döner.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from app.db.session import engine
+
+try:
+    import prometheus_client as prom
+    from prometheus_client import multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    prom = None
+    multiprocess = None
+    GaugeMetricFamily = None
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+def _histogram(name, doc, labels=(), buckets=None):
+    if prom is None:
+        return _NoopMetric()
+    kwargs = {"buckets": buckets} if buckets else {}
+    return prom.Histogram(name, doc, list(labels), **kwargs)
+
+
+def _counter(name, doc, labels=()):
+    return prom.Counter(name, doc, list(labels)) if prom is not None else _NoopMetric()
+
+
+def _gauge(name, doc, labels=()):
+    # multiprocess: canlı worker'ların toplamı (ölen worker'ın değeri düşer)
+    return prom.Gauge(name, doc, list(labels), multiprocess_mode="livesum") if prom is not None else _NoopMetric()
+
+
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+JOB_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+HTTP_DURATION = _histogram(
+    "abay_http_request_duration_seconds", "HTTP istek süresi", ("method", "route"),
+)
+HTTP_REQUESTS = _counter(
+    "abay_http_requests_total", "HTTP istek sayısı", ("method", "route", "status"),
+)
+HTTP_IN_FLIGHT = _gauge("abay_http_requests_in_flight", "İşlenmekte olan HTTP istekleri")
+
+DB_POOL_WAIT = _histogram(
+    "abay_db_pool_wait_seconds", "Havuzdan bağlantı alma süresi", buckets=FAST_BUCKETS,
+)
+
+BCRYPT_IN_PROGRESS = _gauge("abay_bcrypt_in_progress", "Süren bcrypt hash/verify işlemleri")
+BCRYPT_DURATION = _histogram(
+    "abay_bcrypt_duration_seconds", "bcrypt işlem süresi", ("op",), buckets=FAST_BUCKETS + (5.0,),
+)
+
+EMAIL_DURATION = _histogram("abay_email_send_duration_seconds", "SMTP gönderim süresi", buckets=JOB_BUCKETS)
+EMAIL_SENT = _counter("abay_email_send_total", "E-posta gönderimleri", ("result",))
+
+JOBS_QUEUED = _gauge("abay_jobs_queued", "jobs havuzunda sırada bekleyen işler")
+JOBS_RUNNING = _gauge("abay_jobs_running", "jobs havuzunda çalışan işler")
+JOB_DURATION = _histogram(
+    "abay_job_duration_seconds", "Arka plan iş süresi", ("job", "result"), buckets=JOB_BUCKETS,
+)
+
+
+@contextmanager
+def track_bcrypt(op: str):
+    BCRYPT_IN_PROGRESS.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        BCRYPT_DURATION.labels(op).observe(time.perf_counter() - started)
+        BCRYPT_IN_PROGRESS.dec()
+
+
+@contextmanager
+def track_email():
+    started = time.perf_counter()
+    result = "error"
+    try:
+        yield
+        result = "ok"
+    finally:
+        EMAIL_DURATION.observe(time.perf_counter() - started)
+        EMAIL_SENT.labels(result).inc()
+
+
+# -----------------------------------------------------------------------------
+# Scrape anında okunan değerler (havuz, threadpool)
+# -----------------------------------------------------------------------------
+
+class _RuntimeCollector:
+    def __init__(self, per_worker: bool = False):
+        self._labels = {"pid": str(os.getpid())} if per_worker else {}
+
+    def _gauge(self, name, doc, value):
+        family = GaugeMetricFamily(name, doc, labels=list(self._labels))
+        family.add_metric(list(self._labels.values()), value)
+        return family
+
+    def collect(self):
+        pool = engine.pool
+        for name, doc, getter in (
+            ("abay_db_pool_size", "DB havuz boyutu", "size"),
+            ("abay_db_pool_checked_out", "Kullanımdaki DB bağlantıları", "checkedout"),
+            ("abay_db_pool_overflow", "Havuz boyutunu aşan bağlantılar", "overflow"),
+        ):
+            fn = getattr(pool, getter, None)
+            if fn is not None:
+                yield self._gauge(name, doc, fn())
+
+        # Sync route'ların çalıştığı anyio threadpool (scrape event loop içinde yapılır)
+        try:
+            from anyio.to_thread import current_default_thread_limiter
+
+            limiter = current_default_thread_limiter()
+            stats = limiter.statistics()
+        except Exception:
+            return
+        yield self._gauge("abay_threadpool_size", "Threadpool kapasitesi", limiter.total_tokens)
+        yield self._gauge("abay_threadpool_busy", "Kullanımdaki threadpool thread'leri", stats.borrowed_tokens)
+        yield self._gauge("abay_threadpool_waiting", "Thread bekleyen görevler", stats.tasks_waiting)
+
+
+def _instrument_pool_wait() -> None:
+    # Connection açılışı engine.raw_connection() üzerinden havuzdan alır → bekleme süresi burada
+    raw_connection = engine.raw_connection
+
+    def timed_raw_connection(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+    engine.raw_connection = timed_raw_connection
+
+
+if prom is not None:
+    if not MULTIPROC_DIR:
+        prom.REGISTRY.register(_RuntimeCollector())
+    _instrument_pool_wait()
+
+
+def render_latest():
+    """(body, content_type) — prometheus_client yoksa None."""
+    if prom is None:
+        return None
+    if MULTIPROC_DIR:
+        # Scrape başına yeni registry: tüm worker'ların dosyaları + bu worker'ın anlık göstergeleri
+        registry = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_RuntimeCollector(per_worker=True))
+        return prom.generate_latest(registry), prom.CONTENT_TYPE_LATEST
+    return prom.generate_latest(prom.REGISTRY), prom.CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """Worker kapanırken: livesum göstergelerinden bu worker'ın değerleri düşülür."""
+    if prom is not None and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+# -----------------------------------------------------------------------------
+# Middleware
+# -----------------------------------------------------------------------------
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or prom is None:
+            return await self.app(scope, receive, send)
+
+        from app.services.request_stats import is_long_lived, route_template
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = route_template(scope)
+            method = scope.get("method", "")
+            if not is_long_lived(scope):
+                # SSE bağlantı süresi gecikme histogramını bozmasın
+                HTTP_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
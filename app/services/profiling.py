@@ -0,0 +1,268 @@
+# app/services/profiling.py
+"""
+Admin için istek bazında profil çıkarma.
+
+- İstek "X-Profile: 1" başlığı ya da "?__profile=1" ile gelir ve Bearer token admin'e
+  aitse, istek boyunca örnekleyici bir thread çalışır (PROFILE_INTERVAL_MS'de bir
+  sys._current_frames). Diğer tüm istekler için tek maliyet başlık/query kontrolüdür;
+  PROFILING_ENABLED=False ise middleware hiç eklenmez.
+- Örneklenen thread'ler: event loop (boşta beklerken alınanlar atlanır) ve yığınında
+  eşleşen endpoint fonksiyonu bulunan threadpool thread'leri (sync route'lar).
+- Sonuç speedscope JSON'u olarak PROFILE_DIR'e yazılır (https://www.speedscope.app ile açılır);
+  cevaba X-Profile-Id başlığı eklenir, rapor /api/admin/profiles/{id} ile indirilir.
+- En yeni PROFILE_KEEP rapor saklanır.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import anyio
+from jose import JWTError, jwt
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings as auth_settings
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ENABLED = settings.PROFILING_ENABLED
+PROFILE_ROOT = Path(settings.PROFILE_DIR)
+SUFFIX = ".speedscope.json"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+_ID_RE = re.compile(r"^\d{8}-\d{6}-[0-9a-f]{12}$")
+MAX_DEPTH = 200
+
+
+def _requested(scope) -> bool:
+    if b"__profile=1" in scope.get("query_string", b""):
+        return True
+    for name, value in scope.get("headers") or ():
+        if name == b"x-profile":
+            return value not in (b"", b"0")
+    return False
+
+
+def _bearer_user_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers") or ():
+        if name == b"authorization":
+            raw = value.decode("latin-1")
+            if raw[:7].lower() != "bearer ":
+                return None
+            try:
+                payload = jwt.decode(raw[7:], auth_settings.SECRET_KEY, algorithms=[auth_settings.ALGORITHM])
+            except JWTError:
+                return None
+            return payload.get("sub")
+    return None
+
+
+def _is_admin(user_id: str) -> bool:
+    from app.crud.user import get_user_by_id
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        user = get_user_by_id(db, user_id)
+        return bool(user and user.role == "admin" and not user.is_deleted)
+
+
+# -----------------------------------------------------------------------------
+# Örnekleyici
+# -----------------------------------------------------------------------------
+
+class _Sampler(threading.Thread):
+    def __init__(self, scope, loop_thread_id: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.scope = scope
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.frames: List[dict] = []
+        self._frame_index = {}
+        self.samples = {"event-loop": ([], []), "worker": ([], [])}  # ad → (stacks, weights)
+        self._stopping = threading.Event()
+        self.started_at = time.perf_counter()
+        self.elapsed_ms = 0.0
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self.join()
+
+    def _frame_id(self, code, line) -> int:
+        key = (code.co_filename, code.co_name, line)
+        idx = self._frame_index.get(key)
+        if idx is None:
+            idx = len(self.frames)
+            self._frame_index[key] = idx
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": line})
+        return idx
+
+    def _stack(self, frame) -> List[int]:
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            stack.append(self._frame_id(frame.f_code, frame.f_lineno))
+            frame = frame.f_back
+        stack.reverse()  # kök → yaprak
+        return stack
+
+    @staticmethod
+    def _idle(frame) -> bool:
+        # Event loop boşta: en üst Python çerçevesi selector beklemesi
+        code = frame.f_code
+        return code.co_filename.endswith("selectors.py") or code.co_name in ("run_forever", "_run_once")
+
+    @staticmethod
+    def _runs(frame, code) -> bool:
+        while frame is not None:
+            if frame.f_code is code:
+                return True
+            frame = frame.f_back
+        return False
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self._stopping.wait(self.interval):
+            now = time.perf_counter()
+            weight = (now - last) * 1000
+            last = now
+            endpoint = self.scope.get("endpoint")
+            code = getattr(endpoint, "__code__", None)
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                if tid == self.loop_thread_id:
+                    if self._idle(frame):
+                        continue
+                    kind = "event-loop"
+                elif code is not None and self._runs(frame, code):
+                    kind = "worker"
+                else:
+                    continue
+                stacks, weights = self.samples[kind]
+                stacks.append(self._stack(frame))
+                weights.append(round(weight, 3))
+        self.elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+
+    def to_speedscope(self, title: str) -> dict:
+        profiles = []
+        for kind, (stacks, weights) in self.samples.items():
+            if not stacks:
+                continue
+            profiles.append({
+                "type": "sampled",
+                "name": f"{title} · {kind}",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": stacks,
+                "weights": weights,
+            })
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": title,
+            "exporter": "abaysystems",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self.frames},
+            "profiles": profiles,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Rapor dosyaları
+# -----------------------------------------------------------------------------
+
+def profile_path(profile_id: str) -> Optional[Path]:
+    if not _ID_RE.match(profile_id):
+        return None
+    path = PROFILE_ROOT / f"{profile_id}{SUFFIX}"
+    return path if path.exists() else None
+
+
+def list_profiles() -> List[dict]:
+    if not PROFILE_ROOT.exists():
+        return []
+    out = []
+    for path in PROFILE_ROOT.glob(f"*{SUFFIX}"):
+        st = path.stat()
+        out.append({
+            "id": path.name[: -len(SUFFIX)],
+            "size_bytes": st.st_size,
+            "created_at": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc),
+        })
+    out.sort(key=lambda p: p["id"], reverse=True)
+    return out
+
+
+def delete_profile(profile_id: str) -> bool:
+    path = profile_path(profile_id)
+    if path is None:
+        return False
+    path.unlink(missing_ok=True)
+    return True
+
+
+def _prune() -> None:
+    for item in list_profiles()[settings.PROFILE_KEEP:]:
+        (PROFILE_ROOT / f"{item['id']}{SUFFIX}").unlink(missing_ok=True)
+
+
+def _write(profile_id: str, report: dict) -> None:
+    PROFILE_ROOT.mkdir(parents=True, exist_ok=True)
+    dest = PROFILE_ROOT / f"{profile_id}{SUFFIX}"
+    tmp = dest.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, separators=(",", ":"))
+    os.replace(tmp, dest)
+    _prune()
+
+
+# -----------------------------------------------------------------------------
+# Middleware
+# -----------------------------------------------------------------------------
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope):
+            return await self.app(scope, receive, send)
+
+        user_id = _bearer_user_id(scope)
+        if not user_id or not await anyio.to_thread.run_sync(_is_admin, user_id):
+            # Admin değilse bayrak yok sayılır; istek normal çalışır
+            return await self.app(scope, receive, send)
+
+        from app.services.request_stats import route_template
+
+        profile_id = f"{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:12]}"
+        status = None
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        sampler = _Sampler(scope, threading.get_ident(), max(settings.PROFILE_INTERVAL_MS, 1) / 1000)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            title = (
+                f"{scope.get('method')} {route_template(scope)} → {status} "
+                f"({sampler.elapsed_ms:.0f} ms, user {user_id})"
+            )
+            try:
+                await anyio.to_thread.run_sync(_write, profile_id, sampler.to_speedscope(title))
+            except OSError:
+                logger.warning("Profil yazılamadı: %s", profile_id, exc_info=True)
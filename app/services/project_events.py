@@ -0,0 +1,116 @@
+# app/services/project_events.py
+"""
+Proje durum / değişiklik olaylarının canlı yayını (SSE).
+
+- project tablosundaki ertelenmiş trigger COMMIT anında `pg_notify('project_events', {...})`
+  çalıştırır (satırın son hali) → proje başına transaction'da olay türü başına tek mesaj;
+  toplu UPDATE ve raw SQL yolları da dahil, rollback'te hiç gitmez.
+- Her worker cache_bus'ın LISTEN bağlantısıyla kanalı dinler; mesaj owner_id'ye göre o
+  worker'daki abonelere (asyncio kuyrukları) dağıtılır.
+- Yavaş istemcinin kuyruğu dolarsa ya da dinleyici yeniden bağlanırsa (kaçan mesaj olabilir)
+  tek bir "resync" olayı gönderilir → istemci listeyi bir kez yeniden çeker.
+"""
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set, Tuple
+
+from app.services import cache_bus
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "project_events"
+ALL = "*"                   # admin: tüm bayilerin olayları
+QUEUE_SIZE = 100
+HEARTBEAT_S = 15.0
+RETRY_MS = 5000
+
+Event = Tuple[str, str]     # (olay adı, JSON data)
+RESYNC: Event = ("resync", "{}")
+
+_lock = threading.Lock()
+_subscribers: Dict[str, Set["_Subscriber"]] = {}
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(QUEUE_SIZE)
+
+    def offer(self, event: Event) -> None:
+        # event loop thread'inde çalışır
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = RESYNC
+        self.queue.put_nowait(event)
+
+
+def _targets(owner_id: Optional[str]) -> Set[_Subscriber]:
+    with _lock:
+        if owner_id is None:
+            return set().union(*_subscribers.values())
+        return set(_subscribers.get(owner_id, ())) | set(_subscribers.get(ALL, ()))
+
+
+def _on_notify(payload: Optional[str]) -> None:
+    # cache_bus dinleyici thread'inde çalışır
+    if payload is None:
+        event, owner_id = RESYNC, None
+    else:
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            logger.warning("Geçersiz project_events mesajı: %r", payload[:200])
+            return
+        event, owner_id = (data.get("event") or "changed", payload), str(data.get("owner_id"))
+    for sub in _targets(owner_id):
+        try:
+            sub.loop.call_soon_threadsafe(sub.offer, event)
+        except RuntimeError:
+            pass    # loop kapanmış; abonelik zaten düşecek
+
+
+cache_bus.listen(CHANNEL, _on_notify)
+
+
+def subscriber_count() -> int:
+    with _lock:
+        return sum(len(subs) for subs in _subscribers.values())
+
+
+@asynccontextmanager
+async def subscribe(key: str):
+    """key: bayi id'si (str) ya da ALL. Olaylar dönen kuyruktan okunur."""
+    sub = _Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _subscribers.setdefault(key, set()).add(sub)
+    try:
+        yield sub.queue
+    finally:
+        with _lock:
+            subs = _subscribers.get(key)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del _subscribers[key]
+
+
+def format_sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def stream(key: str, is_disconnected):
+    """SSE gövdesi: önce "ready" (dinleyici bağlı mı), sonra olaylar; boşta iken heartbeat yorumu."""
+    async with subscribe(key) as queue:
+        yield f"retry: {RETRY_MS}\n"
+        yield format_sse("ready", json.dumps({"live": cache_bus.is_listening()}))
+        while not await is_disconnected():
+            try:
+                event, data = await asyncio.wait_for(queue.get(), HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_sse(event, data)
@@ -0,0 +1,204 @@
+# app/services/request_stats.py
+"""
+İstek başına SQL ölçümü.
+
+- Engine üzerindeki before/after_cursor_execute olayları her sorgunun süresini ölçer
+  ve o anki isteğin sayacına (ContextVar) yazar. Sync route'lar threadpool'da çalışsa da
+  context kopyalandığı için aynı sayaç görülür; jobs havuzundaki işler sayılmaz.
+- RequestStatsMiddleware istek bitince tek satır JSON log yazar: route şablonu, süre,
+  sorgu sayısı, toplam DB süresi, en yavaş sorgu, en çok tekrarlanan sorgu.
+- Eşik aşımı (yavaş istek / yavaş sorgu / çok sorgu / aynı sorgunun tekrarı = N+1 şüphesi)
+  WARNING olarak işaretlenir. Uzun ömürlü akışlar (SSE) yavaş istek sayılmaz.
+- REQUEST_STATS_HEADERS (veya DEBUG) açıksa cevaba Server-Timing ve X-DB-* başlıkları eklenir.
+- collect() aynı sayacı istek dışında (script / benchmark) kullanmak içindir.
+"""
+import json
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.core.settings import settings
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+SQL_PREVIEW_CHARS = 300
+# Bağlantı boyunca açık kalan akışlar (SSE): süreleri istek gecikmesi değildir
+LONG_LIVED_PATH_PREFIXES = ("/api/events",)
+_QUERY_START = "request_stats_query_start"
+
+
+@dataclass
+class RequestStats:
+    started: float
+    queries: int = 0
+    db_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_sql: Optional[str] = None
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, ms: float) -> None:
+        self.queries += 1
+        self.db_ms += ms
+        self.statements[statement] += 1
+        if ms > self.slowest_ms:
+            self.slowest_ms = ms
+            self.slowest_sql = statement
+
+    def most_repeated(self) -> Tuple[Optional[str], int]:
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+    def elapsed_ms(self) -> float:
+        return (perf_counter() - self.started) * 1000
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current() -> Optional[RequestStats]:
+    return _current.get()
+
+
+@contextmanager
+def collect() -> Iterator[RequestStats]:
+    """Blok içindeki sorguları sayar (HTTP isteği dışında ölçüm için)."""
+    stats = RequestStats(started=perf_counter())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def route_template(scope) -> str:
+    """Eşleşen route'un şablonu (/api/projects/{project_id}); eşleşme yoksa sabit etiket."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "<unmatched>"
+
+
+def is_long_lived(scope) -> bool:
+    return scope.get("path", "").startswith(LONG_LIVED_PATH_PREFIXES)
+
+
+def _preview(sql: Optional[str]) -> Optional[str]:
+    if sql is None:
+        return None
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= SQL_PREVIEW_CHARS else sql[:SQL_PREVIEW_CHARS] + "…"
+
+
+# -----------------------------------------------------------------------------
+# Engine olayları
+# -----------------------------------------------------------------------------
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_QUERY_START, []).append(perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_QUERY_START)
+    if not starts:
+        return
+    ms = (perf_counter() - starts.pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, ms)
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    # Hata veren sorguda after_cursor_execute çağrılmaz → başlangıç zamanı yığında kalmasın
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_QUERY_START)
+        if starts:
+            starts.pop()
+
+
+# -----------------------------------------------------------------------------
+# Middleware
+# -----------------------------------------------------------------------------
+
+def _headers_enabled() -> bool:
+    return bool(settings.REQUEST_STATS_HEADERS or settings.DEBUG)
+
+
+def _flags(stats: RequestStats, total_ms: float, long_lived: bool = False) -> List[str]:
+    flags = []
+    if total_ms > settings.SLOW_REQUEST_MS and not long_lived:
+        flags.append("slow_request")
+    if stats.slowest_ms > settings.SLOW_QUERY_MS:
+        flags.append("slow_query")
+    if stats.queries > settings.MAX_QUERIES_PER_REQUEST:
+        flags.append("many_queries")
+    if stats.most_repeated()[1] > settings.REPEATED_QUERY_LIMIT:
+        flags.append("repeated_query")
+    return flags
+
+
+def _report(scope, stats: RequestStats, status: Optional[int]) -> None:
+    total_ms = stats.elapsed_ms()
+    flags = _flags(stats, total_ms, is_long_lived(scope))
+    level = logging.WARNING if flags else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    repeated_sql, repeated_count = stats.most_repeated()
+    logger.log(level, json.dumps({
+        "event": "request",
+        "method": scope.get("method"),
+        "route": route_template(scope),
+        "status": status,
+        "ms": round(total_ms, 1),
+        "db_queries": stats.queries,
+        "db_ms": round(stats.db_ms, 1),
+        "slowest_query_ms": round(stats.slowest_ms, 1),
+        "slowest_query": _preview(stats.slowest_sql),
+        "repeated_query_count": repeated_count,
+        "repeated_query": _preview(repeated_sql) if repeated_count > 1 else None,
+        "flags": flags,
+    }, ensure_ascii=False))
+
+
+class RequestStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats(started=perf_counter())
+        token = _current.set(stats)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if _headers_enabled():
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        f'db;dur={stats.db_ms:.1f};desc="{stats.queries} queries", app;dur={stats.elapsed_ms():.1f}',
+                    )
+                    headers["X-DB-Queries"] = str(stats.queries)
+                    headers["X-DB-Time-Ms"] = f"{stats.db_ms:.1f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            _report(scope, stats, status)
@@ -0,0 +1,105 @@
+# app/services/system_tree_cache.py
+"""
+Yayındaki sistem ağacının (System → Variant → şablonlar) süreç içi önbelleği.
+
+Ağaç bir kez üretilip JSON byte'larına çevrilir; ETag içerik hash'idir (tüm worker'larda aynı).
+Sistem / varyant / şablon veya ağaçta gömülü katalog kalemlerine yazan bir commit olduğunda
+(bu worker'da ya da cache_bus üzerinden başka bir worker'da) önbellek boşaltılır.
+"""
+import hashlib
+import json
+import threading
+from typing import List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.services import cache_bus
+from app.crud.system import get_published_system_tree, template_sort_key
+from app.schemas.system import (
+    SystemTreeOut,
+    SystemTreeVariantOut,
+    ProfileTemplateOut,
+    GlassTemplateOut,
+    MaterialTemplateOut,
+    RemoteTemplateOut,
+)
+
+# Ağaçta görünen veriyi tutan tablolar
+WATCHED_TABLES = frozenset({
+    "system",
+    "system_variant",
+    "system_profile_template",
+    "system_glass_template",
+    "system_material_template",
+    "system_remote_template",
+    "profile",
+    "glass_type",
+    "other_material",
+    "remote",
+})
+
+_lock = threading.Lock()
+_generation = 0
+_cached: Optional[Tuple[str, bytes]] = None
+
+
+def invalidate() -> None:
+    global _generation, _cached
+    with _lock:
+        _generation += 1
+        _cached = None
+
+
+def _sorted(seq, schema) -> list:
+    return [schema.from_orm(t) for t in sorted(seq, key=template_sort_key)]
+
+
+def _build(db: Session) -> bytes:
+    items: List[SystemTreeOut] = []
+    for system in get_published_system_tree(db):
+        variants = [
+            SystemTreeVariantOut(
+                id=v.id,
+                name=v.name,
+                photo_url=v.photo_url,
+                pdf_foto_cikti=v.pdf_foto_cikti,
+                is_active=v.is_active,
+                sort_index=v.sort_index,
+                profile_templates=_sorted(v.profile_templates, ProfileTemplateOut),
+                glass_templates=_sorted(v.glass_templates, GlassTemplateOut),
+                material_templates=_sorted(v.material_templates, MaterialTemplateOut),
+                remote_templates=_sorted(v.remote_templates, RemoteTemplateOut),
+            )
+            for v in system.variants
+        ]
+        items.append(SystemTreeOut(
+            id=system.id,
+            name=system.name,
+            description=system.description,
+            photo_url=system.photo_url,
+            is_active=system.is_active,
+            sort_index=system.sort_index,
+            variants=variants,
+        ))
+    return json.dumps(jsonable_encoder(items), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def get_tree(db: Session) -> Tuple[str, bytes]:
+    """(etag, body) döner; önbellek boşsa ağacı üretir."""
+    global _cached
+    cached = _cached
+    if cached is not None:
+        return cached
+
+    generation = _generation
+    body = _build(db)
+    entry = (f'W/"systems-{hashlib.sha1(body).hexdigest()[:20]}"', body)
+    with _lock:
+        # Üretim sırasında invalidate geldiyse eski veriyi saklama
+        if _generation == generation:
+            _cached = entry
+    return entry
+
+
+cache_bus.subscribe(WATCHED_TABLES, invalidate)
@@ -0,0 +1,179 @@
+# app/services/uploads.py
+"""
+Ortak dosya yükleme yardımcıları.
+
+- receive        : UploadFile'ı parça parça hedef klasördeki geçici dosyaya yazar,
+                   yazarken sha256 hesaplar, boyut sınırı aşılırsa 413 verir.
+- ReceivedFile   : move_to() ile hedefe atomik taşınır (os.replace) → yarım dosya sunulmaz.
+- on_commit      : işi DB commit'inden SONRA (jobs havuzunda) çalıştırır; eski dosya
+                   silme gibi geri alınamaz adımlar için. Rollback olursa iş düşer.
+- UploadSizeLimitMiddleware : multipart istek gövdesini daha okunurken sınırlar.
+
+Route'lar sync olduğu için okuma/yazma threadpool'da çalışır, event loop bloklanmaz.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+CHUNK_SIZE = 1024 * 1024
+# Tek dosya için (görseller)
+MAX_UPLOAD_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+# Tüm multipart gövde için üst sınır (toplu içe aktarma dahil)
+MAX_REQUEST_BYTES = int(os.getenv("UPLOAD_MAX_REQUEST_BYTES", str(50 * 1024 * 1024)))
+
+_ON_COMMIT_KEY = "uploads_on_commit"
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Dosya çok büyük (en fazla {-(-max_bytes // (1024 * 1024))} MB).")
+
+
+@dataclass
+class ReceivedFile:
+    tmp_path: Path
+    digest: str        # sha256 (hex)
+    size: int
+    head: bytes        # ilk baytlar (tür tespiti için)
+
+    def move_to(self, dest: Path) -> Path:
+        """Geçici dosyayı hedefe atomik taşır; aynı içerik zaten varsa geçici dosya silinir."""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            self.discard()
+        else:
+            os.replace(self.tmp_path, dest)
+        return dest
+
+    def discard(self) -> None:
+        try:
+            self.tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def receive(upload: UploadFile, dest_dir: Path, max_bytes: int = MAX_UPLOAD_BYTES) -> ReceivedFile:
+    """
+    Yüklemeyi dest_dir içindeki geçici dosyaya akıtır (aynı dosya sistemi → atomik rename).
+    Sınır aşılırsa geçici dosya silinir ve 413 fırlatılır.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    hasher = hashlib.sha256()
+    head = b""
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=dest_dir, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = upload.file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                if len(head) < 16:
+                    head += chunk[:16]
+                hasher.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+    return ReceivedFile(tmp_path=Path(tmp_name), digest=hasher.hexdigest(), size=size, head=head)
+
+
+def read_limited(upload: UploadFile, max_bytes: int = MAX_REQUEST_BYTES) -> bytes:
+    """Küçük dosyaları (CSV/XLSX) belleğe okur; sınır aşılırsa 413."""
+    if upload.size is not None and upload.size > max_bytes:
+        raise _too_large(max_bytes)
+    data = upload.file.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    return data
+
+
+# -----------------------------------------------------------------------------
+# Commit sonrası işler
+# -----------------------------------------------------------------------------
+
+def on_commit(db: Session, fn: Callable[..., Any], *args) -> None:
+    """fn(db2, *args) — bu oturumun bir sonraki commit'inden sonra, ayrı oturumla çalışır."""
+    db.info.setdefault(_ON_COMMIT_KEY, []).append((fn, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    pending = session.info.pop(_ON_COMMIT_KEY, None)
+    if not pending:
+        return
+    from app.services import jobs  # döngüsel import olmasın
+
+    # after_commit içinde SQL çalıştırılamaz → iş kendi oturumuyla havuzda
+    for fn, args in pending:
+        jobs.submit_with_session(fn, *args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_on_commit(session: Session) -> None:
+    session.info.pop(_ON_COMMIT_KEY, None)
+
+
+# -----------------------------------------------------------------------------
+# İstek gövdesi sınırı
+# -----------------------------------------------------------------------------
+
+class UploadSizeLimitMiddleware:
+    """
+    multipart/form-data gövdesini okunurken sayar; sınırı aşınca 413.
+    Content-Length bildirilmişse gövde hiç okunmadan reddedilir.
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_bytes:
+            body = json.dumps({"detail": _too_large(self.max_bytes).detail}, ensure_ascii=False).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Form ayrıştırılırken fırlar → exception handler 413 döner
+                    raise _too_large(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -8,6 +8,11 @@ import app.models.other_material
 import app.models.profile
 import app.models.system
 import app.models.calculation_helper
+import app.models.production_batch
+import app.models.project_revision
+import app.models.catalog_change_log
+import app.models.catalog_price
+import app.models.sync_change_log
 
 from fastapi import FastAPI, APIRouter
 from app.routes.order import router as order_router
@@ -25,6 +30,20 @@ from app.routes import me_pdf_titles as me_pdf_titles_routes
 from app.routes import me_pdf_brands as me_pdf_brands_routes
 from app.routes import me_project_code as me_project_code_routes
 from app.routes import me_calculation_helper as me_calc_routes
+from app.routes import production as production_routes
+from app.routes import images as images_routes
+from app.routes import metrics as metrics_routes
+from app.routes import profiling as profiling_routes
+from app.routes import sync as sync_routes
+from app.routes import events as events_routes
+from app.services import cache_bus
+from app.services import maintenance
+from app.services import uploads
+from app.services import request_stats
+from app.services import metrics
+from app.services import profiling
+from app.services import compression
+from app.services import conditional_get
 
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
@@ -37,6 +56,35 @@ Path(MEDIA_ROOT).mkdir(parents=True, exist_ok=True)
 app = FastAPI()
 
 
+@app.on_event("startup")
+def _start_cache_bus():
+    # Worker başına bir LISTEN thread'i: diğer worker'ların commit'leri önbellekleri boşaltır,
+    # project_events kanalı SSE abonelerine dağıtılır
+    cache_bus.start()
+
+
+@app.on_event("shutdown")
+def _stop_cache_bus():
+    cache_bus.stop()
+
+
+@app.on_event("startup")
+def _start_maintenance():
+    # Periyodik bakım (log temizliği vb.); advisory lock ile her iş tek worker'da çalışır
+    maintenance.start()
+
+
+@app.on_event("shutdown")
+def _stop_maintenance():
+    maintenance.stop()
+
+
+@app.on_event("shutdown")
+def _mark_metrics_worker_dead():
+    # PROMETHEUS_MULTIPROC_DIR varsa bu worker'ın canlı göstergeleri toplamdan düşer
+    metrics.mark_worker_dead()
+
+
 app.mount("/static", StaticFiles(directory=MEDIA_ROOT), name="static")
 
 origins = [
@@ -45,6 +93,13 @@ origins = [
     "https://www.tumenaluminyum.com",
 ]
 
+# En içte: okuma uçlarına içerik ETag'i (If-None-Match → 304), dışında Brotli/GZip
+app.add_middleware(conditional_get.ConditionalGetMiddleware)
+app.add_middleware(compression.CompressionMiddleware)
+
+# Multipart gövde sınırı (CORS bunun dışında kalsın diye önce eklenir)
+app.add_middleware(uploads.UploadSizeLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS,      # Geliştirme için sadece bu kökenlere izin
@@ -55,6 +110,14 @@ app.add_middleware(
     expose_headers=["*"],        # Tüm başlıklar
 )
 
+# En dışta: istek başına SQL sayısı/süresi (log + debug'da Server-Timing) ve Prometheus metrikleri
+app.add_middleware(request_stats.RequestStatsMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Admin isteği "X-Profile: 1" ile gelirse örnekleyici profil (kapalıysa hiç eklenmez)
+if profiling.ENABLED:
+    app.add_middleware(profiling.ProfilingMiddleware)
+
 debug_router = APIRouter()
 
 @debug_router.get("/__cors_debug")
@@ -91,5 +154,11 @@ app.include_router(variant_router)
 
 app.include_router(color.router)
 app.include_router(catalog_router)
+app.include_router(production_routes.router)
+app.include_router(images_routes.router)
+app.include_router(metrics_routes.router)
+app.include_router(profiling_routes.router)
+app.include_router(sync_routes.router)
+app.include_router(events_routes.router)
 
 
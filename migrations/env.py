@@ -38,6 +38,11 @@ from app.models.order import (
     OrderItemExtraMaterial,
 )
 import app.models.user_token   # ← eklendi
+import app.models.production_batch
+import app.models.project_revision
+import app.models.catalog_change_log
+import app.models.catalog_price
+import app.models.sync_change_log
 
 
 # Alembic Config nesnesi
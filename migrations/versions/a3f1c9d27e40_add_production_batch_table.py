@@ -0,0 +1,47 @@
+"""add production_batch table
+
+Revision ID: a3f1c9d27e40
+Revises: 0e1d0a6b24af
+Create Date: 2026-01-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3f1c9d27e40"
+down_revision: Union[str, Sequence[str], None] = "0e1d0a6b24af"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "production_batch",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("app_user.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=True),
+        sa.Column("kind", sa.String(length=30), nullable=False, server_default="profile_cutting"),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("project_ids", postgresql.JSONB(), nullable=False),
+        sa.Column("params", postgresql.JSONB(), nullable=True),
+        sa.Column("result", postgresql.JSONB(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_production_batch_owner_created",
+        "production_batch",
+        ["owner_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_production_batch_owner_created", table_name="production_batch")
+    op.drop_table("production_batch")
@@ -0,0 +1,123 @@
+"""add project.content_version + child table triggers
+
+Revision ID: a7c3e9f1d246
+Revises: e2b9c4d7a613
+Create Date: 2026-02-02 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f1d246"
+down_revision: Union[str, Sequence[str], None] = "e2b9c4d7a613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# project_id kolonu olan alt tablolar
+PROJECT_CHILD_TABLES = (
+    "project_system",
+    "project_extra_material",
+    "project_extra_profile",
+    "project_extra_glass",
+    "project_extra_remote",
+)
+# project_system_id üzerinden projeye bağlı tablolar
+SYSTEM_CHILD_TABLES = (
+    "project_system_profile",
+    "project_system_glass",
+    "project_system_material",
+    "project_system_remote",
+)
+EVENTS = {
+    "insert": ("INSERT", "NEW TABLE AS changed_rows"),
+    "update": ("UPDATE", "NEW TABLE AS changed_rows"),
+    "delete": ("DELETE", "OLD TABLE AS changed_rows"),
+}
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project",
+        sa.Column("content_version", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+
+    # Projenin kendi satırı değişince de artar; alt tablo trigger'ının yaptığı UPDATE
+    # content_version'ı zaten değiştirdiği için ikinci kez artırılmaz.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION project_content_version_self_fn() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.content_version = OLD.content_version AND ROW(NEW.*) IS DISTINCT FROM ROW(OLD.*) THEN
+                NEW.content_version := OLD.content_version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER trg_project_content_version_self
+        BEFORE UPDATE ON project
+        FOR EACH ROW EXECUTE FUNCTION project_content_version_self_fn();
+        """
+    )
+
+    # Deyim başına tek UPDATE: toplu INSERT/UPDATE/DELETE (query().update()/delete() dahil)
+    # etkilenen her projeyi bir kez artırır. Geçiş tabloları (transition table) tek olaylı
+    # trigger ister → tablo başına üç trigger.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION project_content_version_fn() RETURNS trigger AS $$
+        BEGIN
+            UPDATE project SET content_version = content_version + 1
+             WHERE id IN (SELECT DISTINCT project_id FROM changed_rows);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION project_system_content_version_fn() RETURNS trigger AS $$
+        BEGIN
+            UPDATE project SET content_version = content_version + 1
+             WHERE id IN (
+                SELECT ps.project_id FROM project_system ps
+                 WHERE ps.id IN (SELECT DISTINCT project_system_id FROM changed_rows)
+             );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for tables, fn in (
+        (PROJECT_CHILD_TABLES, "project_content_version_fn"),
+        (SYSTEM_CHILD_TABLES, "project_system_content_version_fn"),
+    ):
+        for table in tables:
+            for suffix, (event, referencing) in EVENTS.items():
+                op.execute(
+                    f"""
+                    CREATE TRIGGER trg_{table}_content_version_{suffix}
+                    AFTER {event} ON "{table}"
+                    REFERENCING {referencing}
+                    FOR EACH STATEMENT EXECUTE FUNCTION {fn}();
+                    """
+                )
+
+
+def downgrade() -> None:
+    for table in PROJECT_CHILD_TABLES + SYSTEM_CHILD_TABLES:
+        for suffix in EVENTS:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_content_version_{suffix} ON "{table}";')
+    op.execute("DROP TRIGGER IF EXISTS trg_project_content_version_self ON project;")
+    op.execute("DROP FUNCTION IF EXISTS project_system_content_version_fn();")
+    op.execute("DROP FUNCTION IF EXISTS project_content_version_fn();")
+    op.execute("DROP FUNCTION IF EXISTS project_content_version_self_fn();")
+    op.drop_column("project", "content_version")
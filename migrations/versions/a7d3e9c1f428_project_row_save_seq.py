@@ -0,0 +1,46 @@
+"""project system / extra rows: save_seq (stable save order)
+
+Revision ID: a7d3e9c1f428
+Revises: f2c8d4a6b319
+Create Date: 2026-02-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3e9c1f428"
+down_revision: Union[str, Sequence[str], None] = "f2c8d4a6b319"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "project_system",
+    "project_system_profile",
+    "project_system_glass",
+    "project_system_material",
+    "project_system_remote",
+    "project_extra_profile",
+    "project_extra_glass",
+    "project_extra_material",
+    "project_extra_remote",
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE SEQUENCE IF NOT EXISTS project_row_save_seq")
+    # Volatile default → mevcut satırlar tablo taranırken (fiziksel sırayla) numaralanır;
+    # yeni satırlar INSERT sırasıyla alır.
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} "
+            f"ADD COLUMN save_seq bigint NOT NULL DEFAULT nextval('project_row_save_seq')"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS save_seq")
+    op.execute("DROP SEQUENCE IF EXISTS project_row_save_seq")
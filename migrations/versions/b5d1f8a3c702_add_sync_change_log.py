@@ -0,0 +1,102 @@
+"""add sync_change_log table + owner-scoped change triggers
+
+Revision ID: b5d1f8a3c702
+Revises: a7c3e9f1d246
+Create Date: 2026-02-06 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d1f8a3c702"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1d246"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tablo → (sync dokümanındaki ad, sahibin bulunma şekli)
+SYNC_TABLES = {
+    "project": ("projects", "project"),
+    "customer": ("customers", "customer"),
+    "project_system": ("project_systems", "project_child"),
+    "project_extra_material": ("project_extra_materials", "project_child"),
+    "project_extra_profile": ("project_extra_profiles", "project_child"),
+    "project_extra_glass": ("project_extra_glasses", "project_child"),
+    "project_extra_remote": ("project_extra_remotes", "project_child"),
+    "project_system_profile": ("project_system_profiles", "system_child"),
+    "project_system_glass": ("project_system_glasses", "system_child"),
+    "project_system_material": ("project_system_materials", "system_child"),
+    "project_system_remote": ("project_system_remotes", "system_child"),
+}
+EVENTS = {
+    "insert": ("INSERT", "NEW TABLE AS changed_rows"),
+    "update": ("UPDATE", "NEW TABLE AS changed_rows"),
+    "delete": ("DELETE", "OLD TABLE AS changed_rows"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sync_change_log",
+        sa.Column("version", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("owner_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity", sa.String(length=40), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_sync_change_log_owner_version", "sync_change_log", ["owner_id", "version"])
+
+    # Deyim başına tek INSERT ... SELECT (toplu UPDATE/DELETE dahil). Alt satır silinirken
+    # üst proje / sistem zaten silinmişse (CASCADE) sahibi bulunamaz → log'a düşmez;
+    # üst satırın silinme kaydı (tombstone) alt satırları da kapsar.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION sync_change_log_fn() RETURNS trigger AS $$
+        BEGIN
+            IF TG_ARGV[1] = 'project' THEN
+                INSERT INTO sync_change_log (owner_id, entity, entity_id, op)
+                SELECT c.created_by, TG_ARGV[0], c.id, lower(TG_OP) FROM changed_rows c;
+            ELSIF TG_ARGV[1] = 'customer' THEN
+                INSERT INTO sync_change_log (owner_id, entity, entity_id, op)
+                SELECT c.dealer_id, TG_ARGV[0], c.id, lower(TG_OP) FROM changed_rows c;
+            ELSIF TG_ARGV[1] = 'project_child' THEN
+                INSERT INTO sync_change_log (owner_id, entity, entity_id, op)
+                SELECT p.created_by, TG_ARGV[0], c.id, lower(TG_OP)
+                  FROM changed_rows c JOIN project p ON p.id = c.project_id;
+            ELSE
+                INSERT INTO sync_change_log (owner_id, entity, entity_id, op)
+                SELECT p.created_by, TG_ARGV[0], c.id, lower(TG_OP)
+                  FROM changed_rows c
+                  JOIN project_system ps ON ps.id = c.project_system_id
+                  JOIN project p ON p.id = ps.project_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, (entity, kind) in SYNC_TABLES.items():
+        for suffix, (event, referencing) in EVENTS.items():
+            op.execute(
+                f"""
+                CREATE TRIGGER trg_{table}_sync_{suffix}
+                AFTER {event} ON "{table}"
+                REFERENCING {referencing}
+                FOR EACH STATEMENT EXECUTE FUNCTION sync_change_log_fn('{entity}', '{kind}');
+                """
+            )
+
+
+def downgrade() -> None:
+    for table in SYNC_TABLES:
+        for suffix in EVENTS:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_sync_{suffix} ON "{table}";')
+    op.execute("DROP FUNCTION IF EXISTS sync_change_log_fn();")
+    op.drop_index("ix_sync_change_log_owner_version", table_name="sync_change_log")
+    op.drop_table("sync_change_log")
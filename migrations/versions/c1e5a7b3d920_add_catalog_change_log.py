@@ -0,0 +1,73 @@
+"""add catalog_change_log table + triggers
+
+Revision ID: c1e5a7b3d920
+Revises: b7d2e4f81c53
+Create Date: 2026-01-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1e5a7b3d920"
+down_revision: Union[str, Sequence[str], None] = "b7d2e4f81c53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tablo adı → snapshot'taki entity adı
+CATALOG_TABLES = {
+    "profile": "profiles",
+    "glass_type": "glass_types",
+    "other_material": "other_materials",
+    "remote": "remotes",
+    "color": "colors",
+    "system": "systems",
+    "system_variant": "system_variants",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_change_log",
+        sa.Column("version", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=30), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+
+    # Her satır değişikliği (toplu UPDATE/DELETE dahil) log'a bir satır yazar → version artar
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_change_log_fn() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], OLD.id, 'delete');
+            ELSE
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], NEW.id, lower(TG_OP));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, entity in CATALOG_TABLES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_catalog_change
+            AFTER INSERT OR UPDATE OR DELETE ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION catalog_change_log_fn('{entity}');
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_catalog_change ON "{table}";')
+    op.execute("DROP FUNCTION IF EXISTS catalog_change_log_fn();")
+    op.drop_table("catalog_change_log")
@@ -0,0 +1,81 @@
+"""add project_events NOTIFY trigger (deferred, one message per project per commit)
+
+Revision ID: c8e2a6f4b915
+Revises: b5d1f8a3c702
+Create Date: 2026-02-09 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e2a6f4b915"
+down_revision: Union[str, Sequence[str], None] = "b5d1f8a3c702"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Ertelenmiş (DEFERRABLE INITIALLY DEFERRED) trigger COMMIT anında çalışır ve satırın o
+    # anki son halini okur → bir kaydetmede projeye düşen yüzlerce content_version artışı
+    # birebir aynı mesajı üretir; Postgres aynı transaction'daki aynı kanal + aynı payload'ı
+    # tek bildirime indirir. Proje başına transaction'da olay türü başına en fazla bir mesaj.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION project_events_notify_fn() RETURNS trigger AS $$
+        DECLARE
+            r project%ROWTYPE;
+            kind text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                r := OLD;
+                kind := 'deleted';
+            ELSE
+                SELECT * INTO r FROM project WHERE id = NEW.id;
+                IF NOT FOUND THEN
+                    RETURN NULL;    -- aynı transaction'da silindi → 'deleted' mesajı gider
+                END IF;
+                IF TG_OP = 'INSERT' THEN
+                    kind := 'created';
+                ELSIF (NEW.paint_status, NEW.glass_status, NEW.production_status, NEW.is_teklif, NEW.approval_date)
+                      IS DISTINCT FROM
+                      (OLD.paint_status, OLD.glass_status, OLD.production_status, OLD.is_teklif, OLD.approval_date) THEN
+                    kind := 'status';
+                ELSIF ROW(NEW.*) IS DISTINCT FROM ROW(OLD.*) THEN
+                    kind := 'changed';
+                ELSE
+                    RETURN NULL;
+                END IF;
+            END IF;
+            PERFORM pg_notify('project_events', json_build_object(
+                'event', kind,
+                'owner_id', r.created_by,
+                'id', r.id,
+                'project_kodu', r.project_kodu,
+                'paint_status', r.paint_status,
+                'glass_status', r.glass_status,
+                'production_status', r.production_status,
+                'is_teklif', r.is_teklif,
+                'approval_date', r.approval_date,
+                'content_version', r.content_version
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE CONSTRAINT TRIGGER trg_project_events_notify
+        AFTER INSERT OR UPDATE OR DELETE ON project
+        DEFERRABLE INITIALLY DEFERRED
+        FOR EACH ROW EXECUTE FUNCTION project_events_notify_fn();
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_project_events_notify ON project;")
+    op.execute("DROP FUNCTION IF EXISTS project_events_notify_fn();")
@@ -0,0 +1,40 @@
+"""sync_change_log: commit-ordered txid cursor
+
+Revision ID: d3f7b1e9a284
+Revises: c8e2a6f4b915
+Create Date: 2026-02-12 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f7b1e9a284"
+down_revision: Union[str, Sequence[str], None] = "c8e2a6f4b915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # version (BIGSERIAL) commit sırasını yansıtmaz → imleç txid'e taşınır (PostgreSQL 13+).
+    # Mevcut satırlar bu migration'ın txid'ini alır; eski imleçli istemciler bir kez tam senkron alır.
+    op.add_column(
+        "sync_change_log",
+        sa.Column(
+            "txid", sa.BigInteger(), nullable=False,
+            server_default=sa.text("pg_current_xact_id()::text::bigint"),
+        ),
+    )
+    op.drop_index("ix_sync_change_log_owner_version", table_name="sync_change_log")
+    op.create_index("ix_sync_change_log_owner_txid", "sync_change_log", ["owner_id", "txid"])
+    op.create_index("ix_sync_change_log_txid", "sync_change_log", ["txid"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sync_change_log_txid", table_name="sync_change_log")
+    op.drop_index("ix_sync_change_log_owner_txid", table_name="sync_change_log")
+    op.create_index("ix_sync_change_log_owner_version", "sync_change_log", ["owner_id", "version"])
+    op.drop_column("sync_change_log", "txid")
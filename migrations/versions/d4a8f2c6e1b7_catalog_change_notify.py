@@ -0,0 +1,53 @@
+"""catalog change trigger also publishes cache_invalidate NOTIFY
+
+Revision ID: d4a8f2c6e1b7
+Revises: c1e5a7b3d920
+Create Date: 2026-01-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a8f2c6e1b7"
+down_revision: Union[str, Sequence[str], None] = "c1e5a7b3d920"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Aynı transaction'daki aynı payload'lı NOTIFY'ları Postgres tekilleştirir (satır başına değil, tablo başına bir mesaj)
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_change_log_fn() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], OLD.id, 'delete');
+            ELSE
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], NEW.id, lower(TG_OP));
+            END IF;
+            PERFORM pg_notify('cache_invalidate', json_build_object('tables', json_build_array(TG_TABLE_NAME))::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_change_log_fn() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], OLD.id, 'delete');
+            ELSE
+                INSERT INTO catalog_change_log (entity, entity_id, op) VALUES (TG_ARGV[0], NEW.id, lower(TG_OP));
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
@@ -0,0 +1,88 @@
+"""add catalog_price_history table + price change triggers
+
+Revision ID: e2b9c4d7a613
+Revises: d4a8f2c6e1b7
+Create Date: 2026-01-24 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b9c4d7a613"
+down_revision: Union[str, Sequence[str], None] = "d4a8f2c6e1b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# tablo → (item_type, fiyat kolonu)
+PRICE_TABLES = {
+    "profile": ("profile", "unit_price"),
+    "other_material": ("other_material", "unit_price"),
+    "remote": ("remote", "price"),
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_price_history",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("item_type", sa.String(length=20), nullable=False),
+        sa.Column("item_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("price", sa.Numeric(), nullable=True),
+        sa.Column("effective_from", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("app_user.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("item_type", "item_id", "effective_from", name="uq_catalog_price_effective"),
+    )
+    op.execute(
+        "CREATE INDEX ix_catalog_price_asof ON catalog_price_history (item_type, item_id, effective_from DESC)"
+    )
+
+    # Fiyat kolonu değişince (veya yeni kayıtta) geçmişe satır yaz; aynı transaction'da tekrar değişirse üzerine yaz
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_price_history_fn() RETURNS trigger AS $$
+        DECLARE
+            new_price numeric := (to_jsonb(NEW) ->> TG_ARGV[1])::numeric;
+        BEGIN
+            IF TG_OP = 'UPDATE' AND new_price IS NOT DISTINCT FROM (to_jsonb(OLD) ->> TG_ARGV[1])::numeric THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO catalog_price_history (item_type, item_id, price, effective_from)
+            VALUES (TG_ARGV[0], NEW.id, new_price, now())
+            ON CONFLICT (item_type, item_id, effective_from) DO UPDATE SET price = EXCLUDED.price;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    for table, (item_type, column) in PRICE_TABLES.items():
+        op.execute(
+            f"""
+            CREATE TRIGGER trg_{table}_price_history
+            AFTER INSERT OR UPDATE OF {column} ON "{table}"
+            FOR EACH ROW EXECUTE FUNCTION catalog_price_history_fn('{item_type}', '{column}');
+            """
+        )
+        # Mevcut fiyatlar: bilinen en eski andan (created_at) beri geçerli kabul edilir
+        op.execute(
+            f"""
+            INSERT INTO catalog_price_history (item_type, item_id, price, effective_from)
+            SELECT '{item_type}', id, {column}, COALESCE(created_at, now())
+            FROM "{table}"
+            ON CONFLICT DO NOTHING
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in PRICE_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_price_history ON "{table}";')
+    op.execute("DROP FUNCTION IF EXISTS catalog_price_history_fn();")
+    op.execute("DROP INDEX IF EXISTS ix_catalog_price_asof")
+    op.drop_table("catalog_price_history")
@@ -0,0 +1,36 @@
+"""catalog_change_log: commit-ordered txid cursor
+
+Revision ID: e6a4c2d8f153
+Revises: d3f7b1e9a284
+Create Date: 2026-02-12 00:00:01.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a4c2d8f153"
+down_revision: Union[str, Sequence[str], None] = "d3f7b1e9a284"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # version (BIGSERIAL) commit sırasını yansıtmaz → katalog sürümü txid'e taşınır (PostgreSQL 13+).
+    # Mevcut satırlar bu migration'ın txid'ini alır; eski sürümlü istemciler bir kez tam snapshot alır.
+    op.add_column(
+        "catalog_change_log",
+        sa.Column(
+            "txid", sa.BigInteger(), nullable=False,
+            server_default=sa.text("pg_current_xact_id()::text::bigint"),
+        ),
+    )
+    op.create_index("ix_catalog_change_log_txid", "catalog_change_log", ["txid"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalog_change_log_txid", table_name="catalog_change_log")
+    op.drop_column("catalog_change_log", "txid")
@@ -0,0 +1,68 @@
+"""catalog_price_history trigger: skip rows for already-effective prices
+
+Revision ID: f2c8d4a6b319
+Revises: e6a4c2d8f153
+Create Date: 2026-02-13 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8d4a6b319"
+down_revision: Union[str, Sequence[str], None] = "e6a4c2d8f153"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # İleri tarihli fiyat vadesi gelince katalog kolonuna yazılır (apply_due_prices); o an
+    # geçerli fiyatla aynı değer için geçmişe ikinci satır yazılmaz.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_price_history_fn() RETURNS trigger AS $$
+        DECLARE
+            new_price numeric := (to_jsonb(NEW) ->> TG_ARGV[1])::numeric;
+        BEGIN
+            IF TG_OP = 'UPDATE' AND new_price IS NOT DISTINCT FROM (to_jsonb(OLD) ->> TG_ARGV[1])::numeric THEN
+                RETURN NULL;
+            END IF;
+            IF EXISTS (
+                SELECT 1 FROM (
+                    SELECT price FROM catalog_price_history
+                     WHERE item_type = TG_ARGV[0] AND item_id = NEW.id AND effective_from <= now()
+                     ORDER BY effective_from DESC LIMIT 1
+                ) cur WHERE cur.price IS NOT DISTINCT FROM new_price
+            ) THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO catalog_price_history (item_type, item_id, price, effective_from)
+            VALUES (TG_ARGV[0], NEW.id, new_price, now())
+            ON CONFLICT (item_type, item_id, effective_from) DO UPDATE SET price = EXCLUDED.price;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION catalog_price_history_fn() RETURNS trigger AS $$
+        DECLARE
+            new_price numeric := (to_jsonb(NEW) ->> TG_ARGV[1])::numeric;
+        BEGIN
+            IF TG_OP = 'UPDATE' AND new_price IS NOT DISTINCT FROM (to_jsonb(OLD) ->> TG_ARGV[1])::numeric THEN
+                RETURN NULL;
+            END IF;
+            INSERT INTO catalog_price_history (item_type, item_id, price, effective_from)
+            VALUES (TG_ARGV[0], NEW.id, new_price, now())
+            ON CONFLICT (item_type, item_id, effective_from) DO UPDATE SET price = EXCLUDED.price;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
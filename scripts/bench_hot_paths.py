@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+"""
+Sıcak yolların süre ölçümü (seed_synthetic.py ile üretilmiş veri üzerinde).
+
+Ölçülenler (route'ların yaptığı iş, HTTP katmanı hariç):
+- project_list           : bayinin proje listesi (ilk sayfa, 50 kayıt)
+- requirements_detailed  : en büyük projenin detaylı gereksinimleri (düz dict + orjson, route'un yolu)
+- requirements_pydantic  : aynı veri eski yoldan (pydantic doğrulama + jsonable_encoder + json)
+- requirements_save      : aynı projenin gereksinimlerini okuyup aynen geri kaydetme
+- template_fetch         : varyant + şablon satırları
+- system_templates       : varyant şablonları (SystemTemplatesOut, hızlı yol)
+- catalog_page           : profil kataloğu ilk sayfası (200 kayıt, hızlı yol)
+- code_issuance          : proje kodu dağıtımı (rollback → veri değişmez)
+- login                  : kullanıcı + bcrypt doğrulama + refresh token
+
+Her ölçüm yeni oturumla yapılır (identity map önbelleği sonucu saptırmasın).
+Sonuç JSON olarak yazılır; --compare ile önceki bir sonuçla karşılaştırılır.
+
+Kullanım:
+    python scripts/bench_hot_paths.py
+    python scripts/bench_hot_paths.py --iterations 50 --only requirements_detailed,login
+    python scripts/bench_hot_paths.py --compare bench-results/20260101-120000-abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func
+
+from app.core.responses import render
+from app.core.security import verify_password
+from app.crud.project import get_projects_page, get_project_requirements_detailed_data, update_systems_for_project
+from app.crud.project_code import issue_next_code_in_tx
+from app.crud.refresh_token import mint_refresh_token
+from app.crud.user import get_user_by_username
+from app.db.session import SessionLocal, engine
+from app.models.project import Project, ProjectSystem
+from app.routes.project import list_requirements_endpoint
+from app.routes.catalog import list_profiles
+from app.routes.system import fetch_system_templates, get_system_variant_detail_endpoint
+from app.schemas.project import ProjectRequirementsDetailedOut
+from app.services import request_stats
+
+from seed_synthetic import BENCH_PASSWORD, USER_PREFIX
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUT_DIR = os.path.join(ROOT, "bench-results")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Hazırlık
+# -----------------------------------------------------------------------------
+
+def _fixture(username):
+    """Ölçümlerde kullanılacak bayi, en büyük proje ve bir varyant."""
+    with SessionLocal() as db:
+        user = get_user_by_username(db, username)
+        if user is None:
+            sys.exit(f"❌ {username} bulunamadı. Önce: python scripts/seed_synthetic.py")
+        project_id = (
+            db.query(Project.id)
+              .join(ProjectSystem, ProjectSystem.project_id == Project.id)
+              .filter(Project.created_by == user.id)
+              .group_by(Project.id)
+              .order_by(func.count(ProjectSystem.id).desc())
+              .limit(1)
+              .scalar()
+        )
+        variant_id = (
+            db.query(ProjectSystem.system_variant_id)
+              .filter(ProjectSystem.project_id == project_id)
+              .limit(1)
+              .scalar()
+        )
+        system_count = db.query(func.count(ProjectSystem.id)).filter(ProjectSystem.project_id == project_id).scalar()
+        return {
+            "user_id": user.id,
+            "username": username,
+            "project_id": project_id,
+            "variant_id": variant_id,
+            "project_systems": system_count,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Senaryolar — her biri (db, fx) alır
+# -----------------------------------------------------------------------------
+
+def _user(db, fx):
+    return get_user_by_username(db, fx["username"])
+
+
+def bench_project_list(db, fx):
+    get_projects_page(db, fx["user_id"], name=None, code=None, limit=50, offset=0)
+
+
+def bench_requirements_detailed(db, fx):
+    render(get_project_requirements_detailed_data(db, fx["project_id"]))
+
+
+def bench_requirements_pydantic(db, fx):
+    # Önceki serileştirme: model kur + response_model doğrulaması + encoder + json
+    data = get_project_requirements_detailed_data(db, fx["project_id"])
+    model = ProjectRequirementsDetailedOut.parse_obj(data)
+    json.dumps(jsonable_encoder(ProjectRequirementsDetailedOut.parse_obj(model.dict())))
+
+
+def bench_requirements_save(db, fx):
+    payload = list_requirements_endpoint(fx["project_id"], db=db, current_user=_user(db, fx))
+    update_systems_for_project(db, fx["project_id"], payload)
+
+
+def bench_template_fetch(db, fx):
+    get_system_variant_detail_endpoint(fx["variant_id"], db=db, current_user=_user(db, fx)).json()
+
+
+def bench_system_templates(db, fx):
+    fetch_system_templates(fx["variant_id"], db=db, current_user=_user(db, fx)).body
+
+
+def bench_catalog_page(db, fx):
+    list_profiles(q=None, limit=200, page=1, db=db, current_user=_user(db, fx)).body
+
+
+def bench_code_issuance(db, fx):
+    issue_next_code_in_tx(db, fx["user_id"])
+    db.flush()
+    db.rollback()
+
+
+def bench_login(db, fx):
+    user = _user(db, fx)
+    if not verify_password(BENCH_PASSWORD, user.password_hash):
+        raise RuntimeError("Şifre doğrulanamadı (BENCH_PASSWORD seed ile aynı mı?)")
+    _plain, token = mint_refresh_token(db, user.id, "bench", "127.0.0.1", ttl_days=1)
+    # Ölçüm dışı temizlik: token tablosu büyümesin
+    db.delete(token)
+    db.commit()
+
+
+BENCHES = {
+    "project_list": bench_project_list,
+    "requirements_detailed": bench_requirements_detailed,
+    "requirements_pydantic": bench_requirements_pydantic,
+    "requirements_save": bench_requirements_save,
+    "template_fetch": bench_template_fetch,
+    "system_templates": bench_system_templates,
+    "catalog_page": bench_catalog_page,
+    "code_issuance": bench_code_issuance,
+    "login": bench_login,
+}
+
+
+def run_bench(fn, fx, iterations, warmup):
+    timings, queries = [], []
+    for i in range(warmup + iterations):
+        with SessionLocal() as db:
+            with request_stats.collect() as stats:
+                started = time.perf_counter()
+                fn(db, fx)
+                elapsed = (time.perf_counter() - started) * 1000
+        if i >= warmup:
+            timings.append(elapsed)
+            queries.append(stats.queries)
+    return {
+        "iterations": iterations,
+        "min_ms": round(min(timings), 2),
+        "p50_ms": round(_percentile(timings, 50), 2),
+        "p95_ms": round(_percentile(timings, 95), 2),
+        "max_ms": round(max(timings), 2),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "queries": max(queries),
+    }
+
+
+def compare(current, previous_path):
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\n📊 Karşılaştırma: {previous.get('git_rev')} ({previous.get('started_at')}) → {current.get('git_rev')}")
+    print(f"  {'senaryo':<24}{'p50 önce':>10}{'p50 şimdi':>11}{'Δ%':>8}{'p95 önce':>10}{'p95 şimdi':>11}{'Δ%':>8}")
+    for name, now in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if not before:
+            continue
+        row = f"  {name:<24}"
+        for key in ("p50_ms", "p95_ms"):
+            delta = (now[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            row += f"{before[key]:>10.1f}{now[key]:>11.1f}{delta:>+8.1f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sıcak yol benchmark'ı")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--user", default=f"{USER_PREFIX}dealer_000")
+    parser.add_argument("--only", default=None, help="Virgülle ayrılmış senaryo adları")
+    parser.add_argument("--out", default=None, help="Sonuç JSON dosyası (varsayılan: bench-results/<zaman>-<rev>.json)")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki sonuç JSON'u")
+    args = parser.parse_args()
+
+    names = list(BENCHES)
+    if args.only:
+        names = [n.strip() for n in args.only.split(",") if n.strip()]
+        unknown = set(names) - set(BENCHES)
+        if unknown:
+            parser.error(f"Bilinmeyen senaryo: {', '.join(sorted(unknown))}")
+
+    # SQL echo açıksa log yazımı ölçümü saptırır
+    engine.echo = False
+
+    fx = _fixture(args.user)
+    started_at = datetime.now(timezone.utc)
+    rev = _git_rev()
+    print(f"🏁 {args.user} · proje {fx['project_id']} ({fx['project_systems']} sistem) · rev {rev}")
+
+    results = {}
+    for name in names:
+        results[name] = run_bench(BENCHES[name], fx, args.iterations, args.warmup)
+        r = results[name]
+        print(f"  {name:<24} p50 {r['p50_ms']:>8.1f} ms   p95 {r['p95_ms']:>8.1f} ms   {r['queries']:>4} sorgu")
+
+    report = {
+        "git_rev": rev,
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "fixture": {
+            "username": fx["username"],
+            "project_id": str(fx["project_id"]),
+            "project_systems": fx["project_systems"],
+            "variant_id": str(fx["variant_id"]),
+        },
+        "results": results,
+    }
+
+    out = args.out or os.path.join(DEFAULT_OUT_DIR, f"{started_at:%Y%m%d-%H%M%S}-{rev or 'norev'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"💾 {out}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+"""
+Bayi oturumu yük testi (gerçek HTTP, çalışan uygulamaya karşı).
+
+Her sanal kullanıcı şu akışı döngüde tekrarlar:
+    login → katalog (snapshot + sistem ağacı + cam renkleri) → proje oluştur →
+    gereksinim ekle → detaylı görüntüle → camları toplu renklendir → token yenile
+    (→ projeyi sil, --keep-projects verilmediyse)
+
+Eşzamanlılık kademeli artar (--stages "5:60,10:60,20:120" = 5 kullanıcı 60 sn, sonra 10 ...).
+Rapor: kademe ve uç bazında istek sayısı, hata oranı, p50/p95/p99 (ms); JSON olarak da yazılır.
+
+Veri: scripts/seed_synthetic.py ile üretilmiş bayiler (bench_dealer_000 ...).
+Sadece standart kütüphane kullanılır (keep-alive için http.client).
+
+Kullanım:
+    uvicorn main:app --workers 4 &
+    python scripts/load_dealer_flow.py --base-url http://127.0.0.1:8000 --dealers 20 --stages 5:60,20:120
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlencode, urlsplit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_OUT_DIR = os.path.join(ROOT, "bench-results")
+USER_PREFIX = "bench_"
+REFRESH_COOKIE = os.getenv("REFRESH_COOKIE_NAME", "refresh_token")
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def parse_stages(raw):
+    """'5:60,10:60' → [(5, 60.0), (10, 60.0)]"""
+    stages = []
+    for part in raw.split(","):
+        users, _, seconds = part.strip().partition(":")
+        stages.append((int(users), float(seconds)))
+    if not stages or any(u < 1 or s <= 0 for u, s in stages):
+        raise ValueError("Kademeler 'kullanıcı:saniye' biçiminde ve pozitif olmalı")
+    return stages
+
+
+# -----------------------------------------------------------------------------
+# Ölçüm kaydı
+# -----------------------------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stage = 0
+        self.timings = defaultdict(list)      # (stage, endpoint) → [ms]
+        self.errors = defaultdict(int)        # (stage, endpoint) → adet
+        self.statuses = defaultdict(int)      # (stage, endpoint, status) → adet
+        self.flows = defaultdict(int)         # stage → tamamlanan akış
+        self.flow_errors = defaultdict(int)   # stage → yarıda kalan akış
+
+    def record(self, endpoint, ms, status, ok):
+        with self._lock:
+            key = (self.stage, endpoint)
+            self.timings[key].append(ms)
+            self.statuses[(self.stage, endpoint, status)] += 1
+            if not ok:
+                self.errors[key] += 1
+
+    def flow_done(self, ok):
+        with self._lock:
+            if ok:
+                self.flows[self.stage] += 1
+            else:
+                self.flow_errors[self.stage] += 1
+
+    def summary(self, stages, durations):
+        out = []
+        for idx, (users, _seconds) in enumerate(stages):
+            elapsed = durations.get(idx) or 1.0
+            endpoints = {}
+            for (stage, endpoint), values in sorted(self.timings.items()):
+                if stage != idx:
+                    continue
+                errors = self.errors.get((stage, endpoint), 0)
+                endpoints[endpoint] = {
+                    "requests": len(values),
+                    "errors": errors,
+                    "error_rate": round(errors / len(values), 4),
+                    "rps": round(len(values) / elapsed, 2),
+                    "p50_ms": round(_percentile(values, 50), 1),
+                    "p95_ms": round(_percentile(values, 95), 1),
+                    "p99_ms": round(_percentile(values, 99), 1),
+                    "max_ms": round(max(values), 1),
+                    "statuses": {
+                        str(status): count
+                        for (s, e, status), count in sorted(self.statuses.items(), key=lambda kv: str(kv[0][2]))
+                        if s == stage and e == endpoint
+                    },
+                }
+            out.append({
+                "stage": idx + 1,
+                "users": users,
+                "seconds": round(elapsed, 1),
+                "flows_completed": self.flows.get(idx, 0),
+                "flows_failed": self.flow_errors.get(idx, 0),
+                "endpoints": endpoints,
+            })
+        return out
+
+
+# -----------------------------------------------------------------------------
+# HTTP istemcisi (sanal kullanıcı başına tek keep-alive bağlantı)
+# -----------------------------------------------------------------------------
+
+class FlowError(Exception):
+    pass
+
+
+class Client:
+    def __init__(self, base_url, recorder, timeout):
+        parts = urlsplit(base_url)
+        self._conn_cls = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self._netloc = parts.netloc
+        self._prefix = parts.path.rstrip("/")
+        self._timeout = timeout
+        self._conn = None
+        self.recorder = recorder
+        self.access_token = None
+        self.refresh_cookie = None
+        self.etags = {}
+        self.tree = []          # 304 gelirse son alınan ağaç kullanılır
+
+    def _connection(self):
+        if self._conn is None:
+            conn = self._conn_cls(self._netloc, timeout=self._timeout)
+            conn.connect()
+            # Başlık ve gövde ayrı paketlerde gider → Nagle + gecikmeli ACK ~40 ms ekler
+            conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def request(self, method, path, label, *, json_body=None, form=None, params=None, cached=False, expect=(200,)):
+        url = self._prefix + path + (f"?{urlencode(params)}" if params else "")
+        headers = {"Accept": "application/json", "User-Agent": "abay-load/1"}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        if self.refresh_cookie and path.startswith("/api/auth/"):
+            headers["Cookie"] = f"{REFRESH_COOKIE}={self.refresh_cookie}"
+        if cached and url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+
+        started = time.perf_counter()
+        status, data, resp_headers = None, b"", None
+        try:
+            conn = self._connection()
+            conn.request(method, url, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            status, resp_headers = resp.status, resp
+        except Exception as e:
+            # Bağlantı koptu → bir sonraki istek yeni bağlantı açar
+            self.close()
+            status = type(e).__name__
+        ms = (time.perf_counter() - started) * 1000
+
+        ok = status in expect or (cached and status == 304)
+        self.recorder.record(label, ms, status, ok)
+        if not ok:
+            raise FlowError(f"{label} → {status}")
+
+        if resp_headers is not None:
+            etag = resp_headers.getheader("ETag")
+            if cached and etag:
+                self.etags[url] = etag
+            for header, value in resp_headers.getheaders():
+                if header.lower() == "set-cookie" and value.startswith(f"{REFRESH_COOKIE}="):
+                    self.refresh_cookie = value.split(";", 1)[0].split("=", 1)[1]
+        if status == 304 or not data:
+            return None
+        return json.loads(data)
+
+
+# -----------------------------------------------------------------------------
+# Akış
+# -----------------------------------------------------------------------------
+
+def _requirements_from_tree(tree, rng, count):
+    """Sistem ağacındaki varyant şablonlarından gereksinim satırları üretir."""
+    variants = [v for s in tree for v in s.get("variants", []) if v.get("profile_templates")]
+    if not variants:
+        raise FlowError("Sistem ağacında şablonlu varyant yok")
+    systems = []
+    for _ in range(count):
+        v = rng.choice(variants)
+        width, height = rng.randint(600, 4000), rng.randint(600, 3200)
+        systems.append({
+            "system_variant_id": v["id"],
+            "width_mm": width,
+            "height_mm": height,
+            "quantity": rng.randint(1, 4),
+            "profiles": [
+                {
+                    "profile_id": t["profile_id"],
+                    "cut_length_mm": float(rng.choice([width, height])),
+                    "cut_count": 2,
+                    "total_weight_kg": round(rng.uniform(0.5, 8), 3),
+                    "order_index": t.get("order_index"),
+                    "is_painted": bool(t.get("is_painted")),
+                }
+                for t in v["profile_templates"]
+            ],
+            "glasses": [
+                {
+                    "glass_type_id": t["glass_type_id"],
+                    "width_mm": float(width - 80),
+                    "height_mm": float(height - 120),
+                    "count": 1,
+                    "area_m2": round((width - 80) * (height - 120) / 1_000_000, 4),
+                    "order_index": t.get("order_index"),
+                }
+                for t in v.get("glass_templates", [])
+            ],
+            "materials": [
+                {"material_id": t["material_id"], "count": rng.randint(1, 8), "order_index": t.get("order_index")}
+                for t in v.get("material_templates", [])
+            ],
+            "remotes": [
+                {"remote_id": t["remote_id"], "count": 1, "order_index": t.get("order_index")}
+                for t in v.get("remote_templates", [])
+            ],
+        })
+    return systems
+
+
+def dealer_flow(client, username, password, rng, opts):
+    client.access_token = None
+    token = client.request("POST", "/api/auth/token", "POST /api/auth/token",
+                           form={"username": username, "password": password, "remember_me": "true"})
+    client.access_token = token["access_token"]
+
+    client.request("GET", "/api/catalog/snapshot", "GET /api/catalog/snapshot", cached=True)
+    tree = client.request("GET", "/api/systems/tree", "GET /api/systems/tree", cached=True)
+    if tree is not None:
+        client.tree = tree
+    colors = client.request("GET", "/api/colors/", "GET /api/colors/", params={"type": "glass", "limit": 50})
+
+    project = client.request("POST", "/api/projects/", "POST /api/projects/", expect=(201,),
+                             json_body={"project_name": f"Yük testi {uuid.uuid4().hex[:8]}", "is_teklif": True})
+    project_id = project["id"]
+    try:
+        systems = _requirements_from_tree(client.tree, rng, opts.systems_per_project)
+        client.request("POST", f"/api/projects/{project_id}/add-requirements",
+                       "POST /api/projects/{id}/add-requirements", json_body={"systems": systems})
+        client.request("GET", f"/api/projects/{project_id}/requirements-detailed",
+                       "GET /api/projects/{id}/requirements-detailed")
+
+        items = (colors or {}).get("items") or []
+        if items:
+            client.request("PUT", f"/api/projects/{project_id}/glasses/colors/all",
+                           "PUT /api/projects/{id}/glasses/colors/all",
+                           json_body={"glass_color_id_1": rng.choice(items)["id"]})
+
+        refreshed = client.request("POST", "/api/auth/refresh", "POST /api/auth/refresh")
+        client.access_token = refreshed["access_token"]
+    finally:
+        if not opts.keep_projects:
+            client.request("DELETE", f"/api/projects/{project_id}", "DELETE /api/projects/{id}", expect=(204,))
+
+
+def worker(idx, opts, recorder, stop_at, stop_event):
+    rng = random.Random(opts.seed + idx)
+    username = f"{USER_PREFIX}dealer_{idx % opts.dealers:03d}"
+    client = Client(opts.base_url, recorder, opts.timeout)
+    try:
+        while not stop_event.is_set() and time.monotonic() < stop_at:
+            try:
+                dealer_flow(client, username, opts.password, rng, opts)
+                recorder.flow_done(True)
+            except FlowError:
+                recorder.flow_done(False)
+            if opts.think_ms:
+                time.sleep(rng.uniform(0.5, 1.5) * opts.think_ms / 1000)
+    finally:
+        client.close()
+
+
+def print_report(summary):
+    for stage in summary:
+        print(f"\n▶ Kademe {stage['stage']}: {stage['users']} kullanıcı, {stage['seconds']} sn — "
+              f"{stage['flows_completed']} akış tamamlandı, {stage['flows_failed']} hatalı")
+        print(f"  {'uç':<46}{'istek':>7}{'hata%':>7}{'rps':>8}{'p50':>8}{'p95':>8}{'p99':>8}")
+        for endpoint, r in stage["endpoints"].items():
+            print(f"  {endpoint:<46}{r['requests']:>7}{r['error_rate'] * 100:>7.1f}{r['rps']:>8.1f}"
+                  f"{r['p50_ms']:>8.0f}{r['p95_ms']:>8.0f}{r['p99_ms']:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bayi akışı HTTP yük testi")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--stages", default="2:30,5:30,10:60", help="kullanıcı:saniye,... (kademeli artış)")
+    parser.add_argument("--dealers", type=int, default=3, help="Kullanılacak sentetik bayi sayısı")
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD", "bench-pass-123"))
+    parser.add_argument("--systems-per-project", type=int, default=5)
+    parser.add_argument("--think-ms", type=int, default=0, help="Akışlar arası bekleme (ortalama)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep-projects", action="store_true", help="Oluşturulan projeleri silme")
+    parser.add_argument("--out", default=None)
+    opts = parser.parse_args()
+
+    try:
+        stages = parse_stages(opts.stages)
+    except ValueError as e:
+        parser.error(str(e))
+
+    recorder = Recorder()
+    stop_event = threading.Event()
+    total = sum(seconds for _, seconds in stages)
+    stop_at = time.monotonic() + total
+    threads, durations = [], {}
+    started_at = datetime.now(timezone.utc)
+    print(f"🚀 {opts.base_url} · kademeler {stages} · toplam {total:.0f} sn")
+
+    try:
+        for idx, (users, seconds) in enumerate(stages):
+            recorder.stage = idx
+            stage_started = time.monotonic()
+            # Kademe artışı: mevcut kullanıcılar devam eder, eksik olanlar eklenir
+            while len(threads) < users:
+                t = threading.Thread(target=worker, args=(len(threads), opts, recorder, stop_at, stop_event), daemon=True)
+                t.start()
+                threads.append(t)
+            time.sleep(seconds)
+            durations[idx] = time.monotonic() - stage_started
+    except KeyboardInterrupt:
+        print("\n⏹  Durduruluyor...")
+        durations[recorder.stage] = time.monotonic() - stage_started
+    finally:
+        stop_event.set()
+        for t in threads:
+            t.join(timeout=opts.timeout)
+
+    summary = recorder.summary(stages, durations)
+    print_report(summary)
+
+    report = {
+        "kind": "load_dealer_flow",
+        "started_at": started_at.isoformat(),
+        "base_url": opts.base_url,
+        "stages": [{"users": u, "seconds": s} for u, s in stages],
+        "systems_per_project": opts.systems_per_project,
+        "results": summary,
+    }
+    out = opts.out or os.path.join(DEFAULT_OUT_DIR, f"load-{started_at:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 {out}")
+
+
+if __name__ == '__main__':
+    main()
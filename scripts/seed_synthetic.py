@@ -0,0 +1,461 @@
+#!/usr/bin/env python
+"""
+Performans ölçümü için sentetik veri üretir (yerel Postgres!).
+
+- Bayiler (AppUser), müşteriler, katalog (profil/cam/malzeme/kumanda/renk),
+  sistemler + varyantlar + şablon satırları, projeler + proje sistemleri ve alt satırları,
+  ekstra satırlar, proje kodu kuralları ve ledger kayıtları.
+- Büyük projeler (--large-projects) yüzlerce sistem / binlerce alt satır içerir.
+- Yazma COPY ile yapılır (ORM yok); aynı --seed ile aynı veri üretilir.
+- Tüm kayıtlar işaretlidir (kullanıcı adı "bench_", katalog adları "BENCH") →
+  --reset önceki sentetik veriyi silip yeniden üretir, gerçek veriye dokunmaz.
+
+Kullanım:
+    python scripts/seed_synthetic.py --scale small
+    python scripts/seed_synthetic.py --scale medium --reset
+    python scripts/seed_synthetic.py --scale small --dealers 5 --large-project-systems 600
+
+Bayilerin şifresi BENCH_PASSWORD (varsayılan: bench-pass-123).
+Not: ORM olayları çalışmadığı için uygulama içi önbellekler güncellenmez; seed sonrası
+uygulamayı yeniden başlatın.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.core.security import get_password_hash
+from app.db.session import engine
+
+USER_PREFIX = "bench_"
+CATALOG_MARK = "BENCH"
+BENCH_PASSWORD = os.getenv("BENCH_PASSWORD", "bench-pass-123")
+
+FLUSH_ROWS = 50_000
+PDF_COLUMNS = [
+    "cam_ciktisi",
+    "profil_aksesuar_ciktisi",
+    "boya_ciktisi",
+    "siparis_ciktisi",
+    "optimizasyon_detayli_ciktisi",
+    "optimizasyon_detaysiz_ciktisi",
+]
+PDF_ON = ["t"] * len(PDF_COLUMNS)
+STATUSES = ["durum belirtilmedi", "beklemede", "hazır", "tamamlandı"]
+
+SCALES = {
+    "small": dict(
+        dealers=3, customers_per_dealer=10,
+        profiles=60, glass_types=12, materials=80, remotes=6, colors=20,
+        systems=10, variants_per_system=3,
+        projects_per_dealer=20, systems_per_project=8, extras_per_project=4,
+        large_projects=1, large_project_systems=200,
+    ),
+    "medium": dict(
+        dealers=20, customers_per_dealer=50,
+        profiles=300, glass_types=40, materials=400, remotes=15, colors=60,
+        systems=40, variants_per_system=4,
+        projects_per_dealer=100, systems_per_project=12, extras_per_project=8,
+        large_projects=2, large_project_systems=400,
+    ),
+    "large": dict(
+        dealers=100, customers_per_dealer=150,
+        profiles=1000, glass_types=80, materials=1500, remotes=30, colors=120,
+        systems=80, variants_per_system=5,
+        projects_per_dealer=150, systems_per_project=12, extras_per_project=10,
+        large_projects=3, large_project_systems=800,
+    ),
+}
+
+
+# -----------------------------------------------------------------------------
+# COPY yardımcıları
+# -----------------------------------------------------------------------------
+
+class Copier:
+    """
+    Satırları CSV tamponunda biriktirir, FLUSH_ROWS'ta bir COPY ile yazar.
+    parents: FK ile bağlı üst tablolar → önce onların tamponu yazılır.
+    """
+
+    def __init__(self, cur, table, columns, parents=()):
+        self.cur = cur
+        self.table = table
+        self.columns = columns
+        self.parents = parents
+        self.count = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._pending = 0
+
+    def add(self, *values):
+        # None → boş alan (CSV'de NULL); boş string hiç üretilmiyor
+        self._writer.writerow(["" if v is None else v for v in values])
+        self._pending += 1
+        self.count += 1
+        if self._pending >= FLUSH_ROWS:
+            self.flush()
+
+    def flush(self):
+        for parent in self.parents:
+            parent.flush()
+        if not self._pending:
+            return
+        self._buf.seek(0)
+        self.cur.copy_expert(
+            f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)",
+            self._buf,
+        )
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+        self._pending = 0
+
+
+class Ids:
+    """Aynı seed → aynı UUID'ler."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def __call__(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+
+def _ts(dt):
+    return dt.isoformat()
+
+
+def _money(rng, lo, hi):
+    return f"{rng.uniform(lo, hi):.2f}"
+
+
+# -----------------------------------------------------------------------------
+# Temizlik
+# -----------------------------------------------------------------------------
+
+def reset(cur):
+    """Önceki sentetik veriyi siler (bağımlılık sırasıyla)."""
+    users = f"SELECT id FROM app_user WHERE username LIKE '{USER_PREFIX}%'"
+    projects = f"SELECT id FROM project WHERE created_by IN ({users})"
+    variants = f"SELECT v.id FROM system_variant v JOIN system s ON s.id = v.system_id WHERE s.name LIKE '{CATALOG_MARK}%'"
+
+    statements = [
+        f"DELETE FROM project_code_ledger WHERE owner_id IN ({users})",
+        f"DELETE FROM project_system_profile WHERE project_system_id IN (SELECT id FROM project_system WHERE project_id IN ({projects}))",
+        f"DELETE FROM project_system_glass WHERE project_system_id IN (SELECT id FROM project_system WHERE project_id IN ({projects}))",
+        f"DELETE FROM project_system_material WHERE project_system_id IN (SELECT id FROM project_system WHERE project_id IN ({projects}))",
+        f"DELETE FROM project_system_remote WHERE project_system_id IN (SELECT id FROM project_system WHERE project_id IN ({projects}))",
+        f"DELETE FROM project_system WHERE project_id IN ({projects})",
+    ]
+    for table in ("project_extra_profile", "project_extra_glass", "project_extra_material", "project_extra_remote", "project_revision"):
+        statements.append(f"DELETE FROM {table} WHERE project_id IN ({projects})")
+    statements += [
+        f"DELETE FROM project WHERE created_by IN ({users})",
+        f"DELETE FROM project_code_rule WHERE owner_id IN ({users})",
+        f"DELETE FROM customer WHERE dealer_id IN ({users})",
+        f"DELETE FROM refresh_token WHERE user_id IN ({users})",
+        f"DELETE FROM user_token WHERE user_id IN ({users})",
+        f"DELETE FROM app_user WHERE username LIKE '{USER_PREFIX}%'",
+    ]
+    for table in ("system_profile_template", "system_glass_template", "system_material_template", "system_remote_template"):
+        statements.append(f"DELETE FROM {table} WHERE system_variant_id IN ({variants})")
+    statements += [
+        f"DELETE FROM system_variant WHERE id IN ({variants})",
+        f"DELETE FROM system WHERE name LIKE '{CATALOG_MARK}%'",
+        f"DELETE FROM profile WHERE profil_kodu LIKE '{CATALOG_MARK}%'",
+        f"DELETE FROM glass_type WHERE cam_isim LIKE '{CATALOG_MARK}%'",
+        f"DELETE FROM other_material WHERE diger_malzeme_isim LIKE '{CATALOG_MARK}%'",
+        f"DELETE FROM remote WHERE kumanda_isim LIKE '{CATALOG_MARK}%'",
+        f"DELETE FROM color WHERE name LIKE '{CATALOG_MARK}%'",
+    ]
+    for sql in statements:
+        cur.execute(sql)
+
+
+# -----------------------------------------------------------------------------
+# Üretim
+# -----------------------------------------------------------------------------
+
+def seed_catalog(cur, rng, new_id, opts, now):
+    catalog = {}
+
+    c = Copier(cur, "profile", ["id", "profil_kodu", "profil_isim", "birim_agirlik", "boy_uzunluk",
+                                "unit_price", "created_at", "updated_at", "is_active", "is_deleted"])
+    catalog["profiles"] = []
+    for i in range(opts.profiles):
+        pid, price, weight = new_id(), _money(rng, 20, 400), f"{rng.uniform(0.3, 3.5):.3f}"
+        catalog["profiles"].append((pid, price, float(weight)))
+        c.add(pid, f"{CATALOG_MARK}-P{i:05d}", f"{CATALOG_MARK} Profil {i}", weight, "6000",
+              price, _ts(now), _ts(now), "t", "f")
+    c.flush()
+
+    c = Copier(cur, "glass_type", ["id", "cam_isim", "thickness_mm", "belirtec_1", "belirtec_2",
+                                   "created_at", "updated_at", "is_active", "is_deleted"])
+    catalog["glass_types"] = []
+    for i in range(opts.glass_types):
+        gid = new_id()
+        catalog["glass_types"].append(gid)
+        c.add(gid, f"{CATALOG_MARK} Cam {i}", rng.choice(["4", "5", "6", "8", "10"]),
+              rng.randint(0, 20), rng.randint(0, 20), _ts(now), _ts(now), "t", "f")
+    c.flush()
+
+    c = Copier(cur, "other_material", ["id", "diger_malzeme_isim", "birim", "birim_agirlik", "hesaplama_turu",
+                                       "unit_price", "created_at", "updated_at", "is_active", "is_deleted"])
+    catalog["materials"] = []
+    for i in range(opts.materials):
+        mid, price = new_id(), _money(rng, 1, 150)
+        catalog["materials"].append((mid, price))
+        c.add(mid, f"{CATALOG_MARK} Malzeme {i}", rng.choice(["adet", "metre", "kg"]),
+              f"{rng.uniform(0.01, 1.5):.3f}", rng.choice(["adetli", "olculu"]),
+              price, _ts(now), _ts(now), "t", "f")
+    c.flush()
+
+    c = Copier(cur, "remote", ["id", "kumanda_isim", "price", "kapasite", "created_at", "updated_at", "is_active", "is_deleted"])
+    catalog["remotes"] = []
+    for i in range(opts.remotes):
+        rid, price = new_id(), _money(rng, 200, 2500)
+        catalog["remotes"].append((rid, price))
+        c.add(rid, f"{CATALOG_MARK} Kumanda {i}", price, rng.randint(1, 16), _ts(now), _ts(now), "t", "f")
+    c.flush()
+
+    c = Copier(cur, "color", ["id", "name", "type", "unit_cost", "is_active", "is_deleted", "is_default", "is_default_2"])
+    catalog["profile_colors"], catalog["glass_colors"] = [], []
+    for i in range(opts.colors):
+        cid = new_id()
+        kind = "profile" if i % 2 == 0 else "glass"
+        catalog[f"{kind}_colors"].append((cid, f"{CATALOG_MARK} Renk {i}"))
+        c.add(cid, f"{CATALOG_MARK} Renk {i}", kind, _money(rng, 0, 80), "t", "f", "f", "f")
+    c.flush()
+
+    return catalog
+
+
+def seed_systems(cur, rng, new_id, opts, catalog, now):
+    """Varyant başına şablon satırları; proje sistemleri bunlardan türetilir."""
+    systems = Copier(cur, "system", ["id", "name", "description", "created_at", "updated_at",
+                                     "is_published", "is_deleted", "is_active", "sort_index"])
+    variants = Copier(cur, "system_variant", ["id", "system_id", "name", "created_at", "updated_at",
+                                              "is_published", "is_deleted", "is_active", "sort_index"], parents=(systems,))
+    profile_t = Copier(cur, "system_profile_template", ["id", "system_variant_id", "profile_id", "formula_cut_length",
+                                                        "formula_cut_count", "order_index", "created_at", "is_painted"] + PDF_COLUMNS, parents=(variants,))
+    glass_t = Copier(cur, "system_glass_template", ["id", "system_variant_id", "glass_type_id", "formula_width",
+                                                    "formula_height", "formula_count", "order_index", "created_at"] + PDF_COLUMNS, parents=(variants,))
+    material_t = Copier(cur, "system_material_template", ["id", "system_variant_id", "material_id", "formula_quantity",
+                                                          "formula_cut_length", "order_index", "created_at"] + PDF_COLUMNS, parents=(variants,))
+    remote_t = Copier(cur, "system_remote_template", ["id", "system_variant_id", "remote_id", "order_index", "created_at"] + PDF_COLUMNS, parents=(variants,))
+
+    templates = {}
+    for s in range(opts.systems):
+        system_id = new_id()
+        systems.add(system_id, f"{CATALOG_MARK} Sistem {s}", "Sentetik sistem", _ts(now), _ts(now),
+                    "t", "f", "t", (s + 1) * 1024)
+        for v in range(opts.variants_per_system):
+            variant_id = new_id()
+            variants.add(variant_id, system_id, f"{CATALOG_MARK} Varyant {s}-{v}", _ts(now), _ts(now),
+                         "t", "f", "t", (v + 1) * 1024)
+            tpl = {
+                "profiles": rng.sample(catalog["profiles"], k=min(len(catalog["profiles"]), rng.randint(6, 10))),
+                "glasses": rng.sample(catalog["glass_types"], k=min(len(catalog["glass_types"]), rng.randint(1, 3))),
+                "materials": rng.sample(catalog["materials"], k=min(len(catalog["materials"]), rng.randint(4, 8))),
+                "remotes": rng.sample(catalog["remotes"], k=min(len(catalog["remotes"]), rng.randint(0, 1))),
+            }
+            for i, (profile_id, _price, _weight) in enumerate(tpl["profiles"]):
+                profile_t.add(new_id(), variant_id, profile_id, rng.choice(["W-40", "H-60", "W/2", "H"]),
+                              rng.choice(["1", "2", "4"]), i, _ts(now), rng.choice(["t", "f"]), *PDF_ON)
+            for i, glass_id in enumerate(tpl["glasses"]):
+                glass_t.add(new_id(), variant_id, glass_id, "W-80", "H-120", "1", i, _ts(now), *PDF_ON)
+            for i, (material_id, _price) in enumerate(tpl["materials"]):
+                material_t.add(new_id(), variant_id, material_id, rng.choice(["1", "2", "W/500"]), None, i, _ts(now), *PDF_ON)
+            for i, (remote_id, _price) in enumerate(tpl["remotes"]):
+                remote_t.add(new_id(), variant_id, remote_id, i, _ts(now), *PDF_ON)
+            templates[variant_id] = tpl
+
+    for c in (systems, variants, profile_t, glass_t, material_t, remote_t):
+        c.flush()
+    return templates
+
+
+def seed_dealers(cur, rng, new_id, opts, now):
+    password_hash = get_password_hash(BENCH_PASSWORD)  # bcrypt pahalı → tek hash, herkes aynı şifre
+    users = Copier(cur, "app_user", ["id", "username", "password_hash", "role", "name", "email", "owner_name",
+                                     "city", "is_deleted", "status", "password_set_at", "created_at", "updated_at"])
+    customers = Copier(cur, "customer", ["id", "dealer_id", "company_name", "name", "phone", "city", "is_deleted", "created_at"], parents=(users,))
+
+    dealers = []
+    for d in range(opts.dealers):
+        dealer_id = new_id()
+        username = f"{USER_PREFIX}dealer_{d:03d}"
+        users.add(dealer_id, username, password_hash, "dealer", f"Bench Bayi {d}", f"{username}@example.invalid",
+                  f"Bench Sahip {d}", rng.choice(["İstanbul", "Ankara", "İzmir", "Bursa"]), "f", "active",
+                  _ts(now), _ts(now), _ts(now))
+        customer_ids = []
+        for c in range(opts.customers_per_dealer):
+            customer_id = new_id()
+            customer_ids.append(customer_id)
+            customers.add(customer_id, dealer_id, f"Bench Firma {d}-{c}", f"Bench Müşteri {d}-{c}",
+                          f"0555{rng.randint(1000000, 9999999)}", "İstanbul", "f", _ts(now))
+        dealers.append((dealer_id, username, customer_ids))
+
+    users.flush()
+    customers.flush()
+    return dealers
+
+
+def seed_projects(cur, rng, new_id, opts, catalog, templates, dealers, now):
+    projects = Copier(cur, "project", ["id", "project_kodu", "customer_id", "project_name", "created_by", "press_price",
+                                       "painted_price", "is_teklif", "paint_status", "glass_status", "production_status",
+                                       "approval_date", "profile_color_id", "glass_color_id", "created_at", "updated_at"])
+    rules = Copier(cur, "project_code_rule", ["id", "owner_id", "prefix", "separator", "start_number", "current_number",
+                                              "is_active", "created_at", "updated_at"])
+    ledger = Copier(cur, "project_code_ledger", ["owner_id", "number", "project_id", "project_kodu", "used_at"], parents=(projects,))
+    ps = Copier(cur, "project_system", ["id", "project_id", "system_variant_id", "width_mm", "height_mm", "quantity", "created_at"], parents=(projects,))
+    psp = Copier(cur, "project_system_profile", ["id", "project_system_id", "profile_id", "cut_length_mm", "cut_count",
+                                                 "total_weight_kg", "unit_price", "order_index", "is_painted"] + PDF_COLUMNS, parents=(ps,))
+    psg = Copier(cur, "project_system_glass", ["id", "project_system_id", "glass_type_id", "width_mm", "height_mm", "count",
+                                               "area_m2", "order_index", "glass_color_id_1", "glass_color_1"] + PDF_COLUMNS, parents=(ps,))
+    psm = Copier(cur, "project_system_material", ["id", "project_system_id", "material_id", "cut_length_mm", "count",
+                                                  "unit_price", "order_index"] + PDF_COLUMNS, parents=(ps,))
+    psr = Copier(cur, "project_system_remote", ["id", "project_system_id", "remote_id", "count", "unit_price", "order_index"] + PDF_COLUMNS, parents=(ps,))
+    epm = Copier(cur, "project_extra_material", ["id", "project_id", "material_id", "count", "cut_length_mm", "unit_price", "created_at"] + PDF_COLUMNS, parents=(projects,))
+    epp = Copier(cur, "project_extra_profile", ["id", "project_id", "profile_id", "cut_length_mm", "cut_count", "unit_price",
+                                                "created_at", "is_painted"] + PDF_COLUMNS, parents=(projects,))
+    epg = Copier(cur, "project_extra_glass", ["id", "project_id", "glass_type_id", "width_mm", "height_mm", "count", "area_m2",
+                                              "created_at"] + PDF_COLUMNS, parents=(projects,))
+    epr = Copier(cur, "project_extra_remote", ["id", "project_id", "remote_id", "count", "unit_price", "created_at"] + PDF_COLUMNS, parents=(projects,))
+
+    variant_ids = list(templates)
+
+    def add_system(project_id):
+        variant_id = rng.choice(variant_ids)
+        tpl = templates[variant_id]
+        width, height = rng.randint(600, 4000), rng.randint(600, 3200)
+        project_system_id = new_id()
+        ps.add(project_system_id, project_id, variant_id, width, height, rng.randint(1, 4), _ts(now))
+        for i, (profile_id, price, weight) in enumerate(tpl["profiles"]):
+            cut = rng.choice([width, height, width / 2, height - 60])
+            count = rng.choice([1, 2, 4])
+            psp.add(new_id(), project_system_id, profile_id, f"{cut:.1f}", count,
+                    f"{weight * cut / 1000 * count:.3f}", price, i, rng.choice(["t", "f"]), *PDF_ON)
+        for i, glass_id in enumerate(tpl["glasses"]):
+            color_id, color_name = rng.choice(catalog["glass_colors"]) if catalog["glass_colors"] else (None, None)
+            gw, gh = width - 80, height - 120
+            psg.add(new_id(), project_system_id, glass_id, gw, gh, 1, f"{gw * gh / 1_000_000:.4f}", i,
+                    color_id, color_name, *PDF_ON)
+        for i, (material_id, price) in enumerate(tpl["materials"]):
+            psm.add(new_id(), project_system_id, material_id, None, rng.randint(1, 12), price, i, *PDF_ON)
+        for i, (remote_id, price) in enumerate(tpl["remotes"]):
+            psr.add(new_id(), project_system_id, remote_id, 1, price, i, *PDF_ON)
+
+    def add_extras(project_id):
+        for _ in range(opts.extras_per_project):
+            kind = rng.randrange(4)
+            if kind == 0:
+                material_id, price = rng.choice(catalog["materials"])
+                epm.add(new_id(), project_id, material_id, rng.randint(1, 20), None, price, _ts(now), *PDF_ON)
+            elif kind == 1:
+                profile_id, price, _weight = rng.choice(catalog["profiles"])
+                epp.add(new_id(), project_id, profile_id, rng.randint(300, 6000), rng.randint(1, 6), price,
+                        _ts(now), "f", *PDF_ON)
+            elif kind == 2:
+                w, h = rng.randint(300, 2000), rng.randint(300, 2000)
+                epg.add(new_id(), project_id, rng.choice(catalog["glass_types"]), w, h, 1,
+                        f"{w * h / 1_000_000:.4f}", _ts(now), *PDF_ON)
+            elif catalog["remotes"]:
+                remote_id, price = rng.choice(catalog["remotes"])
+                epr.add(new_id(), project_id, remote_id, 1, price, _ts(now), *PDF_ON)
+
+    large_left = opts.large_projects
+    for d, (dealer_id, _username, customer_ids) in enumerate(dealers):
+        prefix = f"BN{d:03d}"
+        rules.add(new_id(), dealer_id, prefix, "-", 1, opts.projects_per_dealer, "t", _ts(now), _ts(now))
+        for n in range(1, opts.projects_per_dealer + 1):
+            project_id = new_id()
+            code = f"{prefix}-{n}"
+            created = now - timedelta(days=rng.randint(0, 720), minutes=rng.randint(0, 1440))
+            is_teklif = rng.random() < 0.6
+            profile_color = rng.choice(catalog["profile_colors"])[0] if catalog["profile_colors"] else None
+            glass_color = rng.choice(catalog["glass_colors"])[0] if catalog["glass_colors"] else None
+            projects.add(project_id, code, rng.choice(customer_ids) if customer_ids else None, f"Bench Proje {d}-{n}",
+                         dealer_id, _money(rng, 50, 120), _money(rng, 60, 150), "t" if is_teklif else "f",
+                         rng.choice(STATUSES), rng.choice(STATUSES), rng.choice(STATUSES),
+                         None if is_teklif else _ts(created + timedelta(days=rng.randint(1, 30))),
+                         profile_color, glass_color, _ts(created), _ts(created))
+            ledger.add(dealer_id, n, project_id, code, _ts(created))
+
+            # İlk bayinin ilk projeleri "büyük proje" (benchmark bunları kullanır)
+            count = opts.systems_per_project
+            if large_left and d == 0:
+                count = opts.large_project_systems
+                large_left -= 1
+            for _ in range(count):
+                add_system(project_id)
+            add_extras(project_id)
+
+    # FK sırası: project → ledger / project_system → alt satırlar
+    for c in (rules, projects, ledger, ps, psp, psg, psm, psr, epm, epp, epg, epr):
+        c.flush()
+    return {c.table: c.count for c in (rules, projects, ledger, ps, psp, psg, psm, psr, epm, epp, epg, epr)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik veri üretici (COPY)")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Önceki sentetik veriyi sil")
+    for key, value in SCALES["small"].items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=int, default=None,
+                            help=f"(ölçeğin değerini ezer, small={value})")
+    args = parser.parse_args()
+
+    opts = argparse.Namespace(**SCALES[args.scale])
+    for key in SCALES["small"]:
+        if getattr(args, key) is not None:
+            setattr(opts, key, getattr(args, key))
+    if opts.dealers < 1 or opts.profiles < 1 or opts.glass_types < 1 or opts.materials < 1 or opts.systems < 1:
+        parser.error("dealers/profiles/glass-types/materials/systems en az 1 olmalı")
+
+    rng = random.Random(args.seed)
+    new_id = Ids(rng)
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+
+    conn = engine.raw_connection()
+    try:
+        cur = conn.cursor()
+        if args.reset:
+            print("🧹 Önceki sentetik veri siliniyor...")
+            reset(cur)
+        else:
+            cur.execute("SELECT 1 FROM app_user WHERE username LIKE %s LIMIT 1", (f"{USER_PREFIX}%",))
+            if cur.fetchone():
+                print("⚠️  Sentetik veri zaten var. Yeniden üretmek için --reset kullanın.")
+                return
+
+        print(f"🌱 Ölçek: {args.scale} {vars(opts)}")
+        catalog = seed_catalog(cur, rng, new_id, opts, now)
+        templates = seed_systems(cur, rng, new_id, opts, catalog, now)
+        dealers = seed_dealers(cur, rng, new_id, opts, now)
+        counts = seed_projects(cur, rng, new_id, opts, catalog, templates, dealers, now)
+        # COPY sonrası planlayıcı istatistikleri güncel olsun
+        cur.execute("ANALYZE")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    for table, count in counts.items():
+        print(f"  {table:<26} {count:>10,}")
+    print(f"✅ Bitti ({time.perf_counter() - started:.1f} sn). Kullanıcılar: {USER_PREFIX}dealer_000.. / {BENCH_PASSWORD}")
+
+
+if __name__ == '__main__':
+    main()